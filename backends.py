@@ -0,0 +1,231 @@
+"""
+VisionAI inference backends
+Exports YOLO to ONNX Runtime / OpenVINO (optionally INT8) and caches the artifacts
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+
+import cv2
+import numpy as np
+
+from buffers import BufferPool, Letterbox
+
+# Runtimes are detected without importing them; they are imported only when used
+ONNX_AVAILABLE = importlib.util.find_spec('onnxruntime') is not None
+OPENVINO_AVAILABLE = importlib.util.find_spec('openvino') is not None
+
+BACKENDS = ('auto', 'pytorch', 'onnx', 'openvino')
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+CALIBRATION_DIR = os.path.join("models", "calibration")
+
+
+def available_backends():
+    backends = ['pytorch']
+    if ONNX_AVAILABLE:
+        backends.append('onnx')
+    if OPENVINO_AVAILABLE:
+        backends.append('openvino')
+    return backends
+
+
+def best_backend():
+    """Fastest installed CPU backend: OpenVINO, then ONNX Runtime, then PyTorch"""
+    return available_backends()[-1]
+
+
+def load_calibration_frames(source=CALIBRATION_DIR, count=100, max_side=640):
+    """BGR frames for INT8 calibration from an image directory or a video file
+
+    Frames are downscaled to max_side on load so the set stays small in memory.
+    """
+    frames = []
+    if source and os.path.isdir(source):
+        files = sorted(f for f in os.listdir(source) if f.lower().endswith(IMAGE_EXTENSIONS))
+        for file in files[:count]:
+            frame = cv2.imread(os.path.join(source, file))
+            if frame is not None:
+                frames.append(frame)
+    elif source and os.path.isfile(source):
+        # Sample evenly across the whole video
+        cap = cv2.VideoCapture(source)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or count
+        step = max(1, total // count)
+        index = 0
+        while len(frames) < count and cap.grab():
+            if index % step == 0:
+                ret, frame = cap.retrieve()
+                if ret:
+                    frames.append(frame)
+            index += 1
+        cap.release()
+
+    for i, frame in enumerate(frames):
+        scale = max_side / max(frame.shape[:2])
+        if scale < 1:
+            frames[i] = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return frames
+
+
+def to_tensor(frame, letterbox):
+    """Letterboxed RGB NCHW float32 tensor, the layout YOLO exports expect"""
+    canvas, _, _, _ = letterbox(frame)
+    tensor = canvas[..., ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return tensor[None]
+
+
+class ModelBackend:
+    """Selects, exports and caches the YOLO inference backend.
+
+    load() always returns an ultralytics YOLO object, so callers keep getting
+    the same Results/boxes format whatever runtime executes the model. Exported
+    artifacts live in cache_dir and are rebuilt when the weights change.
+    """
+
+    def __init__(self, weights='yolov8n.pt', backend='auto', int8=False, imgsz=640,
+                 cache_dir='models', calibration=CALIBRATION_DIR):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.weights = weights
+        self.backend = best_backend() if backend == 'auto' else backend
+        self.int8 = int8
+        self.imgsz = imgsz
+        self.cache_dir = cache_dir
+        self.calibration = calibration
+        self.artifact = None
+
+    def load(self):
+        # Imported here: ultralytics pulls in torch, which is slow to import
+        from ultralytics import YOLO
+
+        artifact = self.prepare()
+        if self.backend != 'pytorch':
+            try:
+                return self.warmed_up(YOLO(artifact, task='detect'))
+            except Exception as e:
+                self.fall_back(e)
+        return self.warmed_up(YOLO(self.weights))
+
+    def warmed_up(self, model):
+        """Run one dummy inference and return the model.
+
+        YOLO() only reads the artifact on the first call, so a broken export
+        surfaces here, inside load()'s fallback; the first real frame also
+        skips kernel setup.
+        """
+        model(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8), verbose=False)
+        return model
+
+    def prepare(self):
+        """Path of the model file to load, exported first if needed"""
+        if self.backend == 'pytorch':
+            self.artifact = self.weights
+            return self.artifact
+        try:
+            self.artifact = self.export()
+        except Exception as e:
+            self.fall_back(e)
+        return self.artifact
+
+    def fall_back(self, error):
+        print(f"[WARN] {self.backend} backend unavailable ({error}), using PyTorch", file=sys.stderr)
+        self.backend = 'pytorch'
+        self.artifact = self.weights
+
+    def artifact_path(self, int8=None):
+        int8 = self.int8 if int8 is None else int8
+        stem = os.path.splitext(os.path.basename(self.weights))[0]
+        if self.backend == 'openvino':
+            # ultralytics recognises OpenVINO models by this directory suffix
+            name = f"{stem}_{self.imgsz}{'_int8' if int8 else ''}_openvino_model"
+        else:
+            name = f"{stem}_{self.backend}_{self.imgsz}{'_int8' if int8 else ''}.onnx"
+        return os.path.join(self.cache_dir, name)
+
+    def is_fresh(self, path):
+        return (os.path.exists(path) and
+                (not os.path.exists(self.weights) or os.path.getmtime(path) >= os.path.getmtime(self.weights)))
+
+    def export(self):
+        """Path of an up-to-date exported artifact, exporting if needed"""
+        if self.int8:
+            int8_path = self.artifact_path(int8=True)
+            if self.is_fresh(int8_path):
+                return int8_path
+            frames = load_calibration_frames(self.calibration)
+            if frames:
+                fp32_path = self.export_fp32()
+                print(f"[BACKEND] Quantizing to INT8 with {len(frames)} calibration frames...")
+                if self.backend == 'onnx':
+                    self.quantize_onnx(fp32_path, int8_path, frames)
+                else:
+                    self.quantize_openvino(fp32_path, int8_path, frames)
+                return int8_path
+            print(f"[WARN] No calibration frames in {self.calibration}, using FP32", file=sys.stderr)
+        return self.export_fp32()
+
+    def export_fp32(self):
+        path = self.artifact_path(int8=False)
+        if self.is_fresh(path):
+            return path
+
+        from ultralytics import YOLO
+
+        print(f"[BACKEND] Exporting {self.weights} to {self.backend}...")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Dynamic batch so micro-batches and ROI crop lists go through one call
+        exported = YOLO(self.weights).export(format=self.backend, imgsz=self.imgsz, dynamic=True)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+        shutil.move(str(exported), path)
+        return path
+
+    def quantize_onnx(self, fp32_path, int8_path, frames):
+        import onnx
+        import onnxruntime
+        from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                              quantize_static)
+
+        input_name = onnxruntime.InferenceSession(fp32_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+        class FrameReader(CalibrationDataReader):
+            def __init__(self, tensors):
+                self.tensors = iter(tensors)
+
+            def get_next(self):
+                tensor = next(self.tensors, None)
+                return None if tensor is None else {input_name: tensor}
+
+        letterbox = Letterbox(BufferPool(), size=self.imgsz)
+        tensors = (to_tensor(frame, letterbox) for frame in frames)
+        quantize_static(fp32_path, int8_path, FrameReader(tensors),
+                        quant_format=QuantFormat.QDQ, per_channel=True,
+                        activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8)
+
+        # Keep the class names/stride metadata ultralytics reads back
+        source, quantized = onnx.load(fp32_path), onnx.load(int8_path)
+        del quantized.metadata_props[:]
+        quantized.metadata_props.extend(source.metadata_props)
+        onnx.save(quantized, int8_path)
+
+    def quantize_openvino(self, fp32_dir, int8_dir, frames):
+        import nncf
+        import openvino
+
+        xml_name = next(f for f in os.listdir(fp32_dir) if f.endswith('.xml'))
+        model = openvino.Core().read_model(os.path.join(fp32_dir, xml_name))
+        letterbox = Letterbox(BufferPool(), size=self.imgsz)
+        dataset = nncf.Dataset(frames, lambda frame: to_tensor(frame, letterbox))
+        quantized = nncf.quantize(model, dataset, subset_size=len(frames),
+                                  preset=nncf.QuantizationPreset.MIXED)
+
+        os.makedirs(int8_dir, exist_ok=True)
+        openvino.save_model(quantized, os.path.join(int8_dir, xml_name))
+        # metadata.yaml carries class names for ultralytics
+        for file in os.listdir(fp32_dir):
+            if file.endswith('.yaml'):
+                shutil.copy2(os.path.join(fp32_dir, file), int8_dir)
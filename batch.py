@@ -0,0 +1,212 @@
+"""
+VisionAI headless batch mode
+Runs the detection stack over archived video files without a display
+"""
+
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+import cv2
+
+from pipeline import FrameQueue, BLOCK
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.m4v', '.webm', '.mpg', '.mpeg', '.ts')
+
+END_OF_STREAM = object()
+
+
+def collect_videos(paths):
+    """Expand files and directories into a sorted list of video files"""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file in sorted(files):
+                    if file.lower().endswith(VIDEO_EXTENSIONS):
+                        videos.append(os.path.join(root, file))
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            print(f"[WARN] Skipping missing path: {path}", file=sys.stderr)
+    return videos
+
+
+class VideoDecoder(threading.Thread):
+    """Decodes videos in order and feeds (video, index, time_ms, frame) items.
+
+    The queue uses the BLOCK policy: archived footage must not lose frames, the
+    decoder simply waits when inference falls behind.
+    """
+
+    def __init__(self, videos, out_queue, stride=1):
+        super().__init__(name="VisionAI-Decoder", daemon=True)
+        self.videos = videos
+        self.out_queue = out_queue
+        self.stride = max(1, stride)
+        self.frames_decoded = 0
+        self.failed = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            for video in self.videos:
+                if self._stop_event.is_set():
+                    break
+                self.decode(video)
+        finally:
+            self.out_queue.put(END_OF_STREAM)
+
+    def decode(self, video):
+        cap = cv2.VideoCapture(video)
+        if not cap.isOpened():
+            self.failed.append(video)
+            print(f"[ERROR] Cannot open video: {video}", file=sys.stderr)
+            return
+
+        index = 0
+        try:
+            while not self._stop_event.is_set():
+                # grab() skips decoding of frames we are going to stride over
+                if not cap.grab():
+                    break
+                if index % self.stride == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        time_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+                        self.out_queue.put((video, index, time_ms, frame))
+                        self.frames_decoded += 1
+                index += 1
+        finally:
+            cap.release()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class DetectionWriter:
+    """Writes per-frame detections as JSON Lines or CSV"""
+
+    CSV_FIELDS = ['video', 'frame', 'time_ms', 'type', 'class', 'conf', 'x1', 'y1', 'x2', 'y2']
+
+    def __init__(self, path, output_format=None):
+        if output_format is None:
+            output_format = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        self.format = output_format
+        self.file = open(path, 'w', newline='')
+        self.csv_writer = None
+        if self.format == 'csv':
+            self.csv_writer = csv.writer(self.file)
+            self.csv_writer.writerow(self.CSV_FIELDS)
+
+    def write(self, video, index, time_ms, objects, faces):
+        if self.csv_writer is None:
+            record = {
+                'video': video,
+                'frame': index,
+                'time_ms': round(time_ms, 1),
+                'objects': [{'class': name, 'conf': round(conf, 3), 'box': [x1, y1, x2, y2]}
+                            for x1, y1, x2, y2, name, conf in objects],
+                'faces': [[x, y, x + w, y + h] for x, y, w, h in faces]
+            }
+            self.file.write(json.dumps(record) + '\n')
+            return
+
+        for x1, y1, x2, y2, name, conf in objects:
+            self.csv_writer.writerow([video, index, f"{time_ms:.1f}", 'object', name, f"{conf:.3f}", x1, y1, x2, y2])
+        for x, y, w, h in faces:
+            self.csv_writer.writerow([video, index, f"{time_ms:.1f}", 'face', 'face', '', x, y, x + w, y + h])
+
+    def close(self):
+        self.file.close()
+
+
+class BatchProcessor:
+    """Micro-batches decoded frames through a headless VisionAIUnified's YOLO model"""
+
+    def __init__(self, app, output, output_format=None, batch_size=8, stride=1,
+                 detect_faces=False, report_interval=5.0):
+        self.app = app
+        self.output = output
+        self.output_format = output_format
+        self.batch_size = max(1, batch_size)
+        self.stride = stride
+        self.detect_faces = detect_faces
+        self.report_interval = report_interval
+        self.frames_processed = 0
+
+    def run(self, paths):
+        """Process all videos under paths; returns a summary dict"""
+        videos = collect_videos(paths)
+        if not videos:
+            print("[ERROR] No video files found")
+            return {'videos': 0, 'frames': 0, 'seconds': 0.0, 'fps': 0.0}
+
+        print(f"[BATCH] Processing {len(videos)} video(s) -> {self.output}")
+
+        frame_queue = FrameQueue(maxsize=self.batch_size * 4, policy=BLOCK)
+        decoder = VideoDecoder(videos, frame_queue, stride=self.stride)
+        writer = DetectionWriter(self.output, self.output_format)
+
+        self.frames_processed = 0
+        start_time = time.time()
+        last_report = start_time
+        batch = []
+        decoder.start()
+        try:
+            while True:
+                item = frame_queue.get(timeout=1.0)
+                if item is None:
+                    continue
+                # Flush on end of stream and on video change so a batch never
+                # mixes frame sizes
+                if item is END_OF_STREAM or (batch and batch[0][0] != item[0]):
+                    self.process_batch(batch, writer)
+                    batch = []
+                if item is END_OF_STREAM:
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self.process_batch(batch, writer)
+                    batch = []
+
+                now = time.time()
+                if now - last_report >= self.report_interval:
+                    fps = self.frames_processed / (now - start_time)
+                    print(f"[BATCH] {self.frames_processed} frames, {fps:.1f} FPS")
+                    last_report = now
+        finally:
+            decoder.stop()
+            writer.close()
+
+        elapsed = time.time() - start_time
+        summary = {
+            'videos': len(videos) - len(decoder.failed),
+            'failed': decoder.failed,
+            'frames': self.frames_processed,
+            'seconds': round(elapsed, 2),
+            'fps': round(self.frames_processed / elapsed, 2) if elapsed > 0 else 0.0
+        }
+        print(f"[BATCH] Done: {summary['frames']} frames in {summary['seconds']}s "
+              f"({summary['fps']} FPS)")
+        return summary
+
+    def process_batch(self, batch, writer):
+        if not batch:
+            return
+
+        frames = [frame for _, _, _, frame in batch]
+        # One YOLO call for the whole micro-batch; boxes come back in frame coordinates
+        results = self.app.yolo(frames, **self.app.YOLO_PARAMS)
+
+        for (video, index, time_ms, frame), result in zip(batch, results):
+            objects = [(x1, y1, x2, y2, self.app.yolo.names[cls], conf)
+                       for x1, y1, x2, y2, cls, conf in self.app.parse_detections(result)]
+            faces = self.app.find_faces(frame) if self.detect_faces else []
+            writer.write(video, index, time_ms, objects, [tuple(int(v) for v in face) for face in faces])
+
+        self.frames_processed += len(batch)
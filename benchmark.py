@@ -0,0 +1,300 @@
+"""
+VisionAI benchmark
+Times each pipeline stage headless on synthetic scenes and local videos
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from buffers import BufferPool
+from display import DisplayRenderer
+from resources import ResourceGovernor, parse_split
+from tracker import Tracker
+
+STAGES = ('motion', 'objects', 'faces', 'tracker', 'anonymize', 'display')
+DEFAULT_RESOLUTIONS = ('640x480', '1280x720', '1920x1080')
+DEFAULT_DENSITIES = (0, 5, 20)
+
+
+class SyntheticScene:
+    """Noisy static background with `objects` bouncing shapes.
+
+    Deterministic for a given seed; centers holds the ground-truth centre of
+    every shape in the last frame (used as tracker input).
+    """
+
+    def __init__(self, width, height, objects, seed=0):
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        self.background = cv2.GaussianBlur(
+            self.rng.integers(40, 200, (height, width, 3), dtype=np.uint8), (0, 0), 3)
+        size = max(16, min(width, height) // 12)
+        self.shapes = []
+        for _ in range(objects):
+            w, h = self.rng.integers(size // 2, size * 2, 2)
+            self.shapes.append({
+                'pos': self.rng.uniform([0, 0], [width - w, height - h]),
+                'vel': self.rng.uniform(-8, 8, 2),
+                'size': (int(w), int(h)),
+                'color': tuple(int(c) for c in self.rng.integers(0, 255, 3)),
+            })
+        self.centers = []
+
+    def next_frame(self):
+        frame = self.background.copy()
+        # Light sensor noise so background subtraction has something to reject
+        noise = self.rng.integers(-6, 7, (self.height, self.width, 1), dtype=np.int16)
+        frame = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        self.centers = []
+        for shape in self.shapes:
+            w, h = shape['size']
+            shape['pos'] += shape['vel']
+            for axis, limit in ((0, self.width - w), (1, self.height - h)):
+                if not 0 <= shape['pos'][axis] <= limit:
+                    shape['vel'][axis] *= -1
+                    shape['pos'][axis] = min(max(shape['pos'][axis], 0), limit)
+            x, y = int(shape['pos'][0]), int(shape['pos'][1])
+            cv2.rectangle(frame, (x, y), (x + w, y + h), shape['color'], -1)
+            self.centers.append((x + w // 2, y + h // 2))
+        return frame
+
+
+def synthetic_frames(width, height, objects, count, seed=0):
+    scene = SyntheticScene(width, height, objects, seed)
+    for _ in range(count):
+        frame = scene.next_frame()
+        yield frame, list(scene.centers)
+
+
+def video_frames(path, count):
+    """Frames from a local video, looping short files; centers are unknown"""
+    cap = cv2.VideoCapture(path)
+    try:
+        produced = 0
+        while produced < count:
+            ret, frame = cap.read()
+            if not ret:
+                if produced == 0 or not cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                    return
+                continue
+            produced += 1
+            yield frame, None
+    finally:
+        cap.release()
+
+
+class StageRunner:
+    """Prepares the app for one stage and runs it on one frame"""
+
+    def __init__(self, app):
+        self.app = app
+        self.pool = BufferPool()
+        self.renderer = DisplayRenderer(self.pool, size=(640, 480))
+        self.tracker = Tracker()
+
+    def load(self, stage):
+        """Raise if the stage can't run in this environment"""
+        if stage == 'objects':
+            self.app.models['objects'].load()
+        elif stage == 'faces':
+            self.app.models['faces'].load()
+
+    def reset(self, stage):
+        app = self.app
+        app.options.update({'objects': stage == 'objects', 'faces': stage == 'faces',
+                            'motion': stage == 'motion', 'privacy': False, 'motion_gate': False})
+        app.scheduled = [stage] if stage in ('objects', 'faces') else []
+        app.roi_regions = None
+        app.frame_count = 0
+        app.last_objects = []
+        app.last_faces = []
+        app.object_tracker.reset()
+        app.face_tracker.reset()
+        app.face_finder.force_full_scan()
+        app.motion_engine.reset()
+        self.tracker.reset()
+        self.renderer.reset()
+
+    def run(self, stage, frame, centers, index):
+        app = self.app
+        app.frame_count = index
+        app.frame_time = index / 30.0  # Inputs are timed as a 30 fps stream
+        if stage == 'motion':
+            app.motion_engine.apply(frame, index / 30.0)
+            app.detect_motion_in_frame(frame)
+        elif stage == 'objects':
+            app.detect_objects_in_frame(frame)
+        elif stage == 'faces':
+            app.detect_faces_in_frame(frame)
+        elif stage == 'tracker':
+            self.tracker.predict(app.frame_time)
+            self.tracker.update(centers, ['object'] * len(centers), [0.9] * len(centers), app.frame_time)
+            self.tracker.cleanup(app.frame_time)
+        elif stage == 'anonymize':
+            # Face-sized boxes around the moving shapes, redacted with the default method
+            size = max(24, frame.shape[0] // 8)
+            boxes = [(x - size // 2, y - size // 2, size, size) for x, y in centers]
+            app.anonymizer.apply(frame, boxes)
+        elif stage == 'display':
+            self.renderer.convert(frame)
+
+
+def summarize(samples):
+    times = np.array(samples) * 1000
+    return {
+        'frames': len(times),
+        'mean_ms': round(float(times.mean()), 3),
+        'p50_ms': round(float(np.percentile(times, 50)), 3),
+        'p99_ms': round(float(np.percentile(times, 99)), 3),
+        'max_ms': round(float(times.max()), 3),
+        'fps': round(float(1000.0 / times.mean()), 1) if times.mean() > 0 else None,
+    }
+
+
+def benchmark_stage(runner, stage, frames, warmup):
+    runner.reset(stage)
+    samples = []
+    for index, (frame, centers) in enumerate(frames):
+        if stage in ('tracker', 'anonymize') and centers is None:
+            raise ValueError(f"{stage} needs synthetic input (ground-truth centers)")
+        start_time = time.perf_counter()
+        runner.run(stage, frame, centers, index)
+        if index >= warmup:
+            samples.append(time.perf_counter() - start_time)
+    if not samples:
+        raise ValueError("no frames measured")
+    return summarize(samples)
+
+
+def parse_resolution(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def build_inputs(args):
+    """(name, resolution, density, frames_factory) for every input configuration"""
+    inputs = []
+    if not args.no_synthetic:
+        for resolution in args.resolutions:
+            width, height = parse_resolution(resolution)
+            for density in args.densities:
+                inputs.append(('synthetic', f"{width}x{height}", density,
+                               lambda w=width, h=height, d=density: synthetic_frames(w, h, d, args.frames, args.seed)))
+    for path in args.video or []:
+        cap = cv2.VideoCapture(path)
+        width, height = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+        if not width:
+            print(f"[WARN] Skipping unreadable video: {path}", file=sys.stderr)
+            continue
+        inputs.append((os.path.basename(path), f"{width}x{height}", None,
+                       lambda p=path: video_frames(p, args.frames)))
+    return inputs
+
+
+def run_benchmark(app, args, log=sys.stdout):
+    runner = StageRunner(app)
+    results = []
+    for stage in args.stages:
+        try:
+            runner.load(stage)
+        except Exception as e:
+            print(f"[BENCH] {stage}: skipped ({e})", file=log)
+            results.append({'stage': stage, 'error': str(e)})
+            continue
+
+        for name, resolution, density, frames in build_inputs(args):
+            entry = {'stage': stage, 'input': name, 'resolution': resolution, 'density': density}
+            try:
+                entry.update(benchmark_stage(runner, stage, frames(), args.warmup))
+                print(f"[BENCH] {stage:9s} {name:12s} {resolution:>10s} density={density!s:>4s}  "
+                      f"mean {entry['mean_ms']:8.2f} ms  p50 {entry['p50_ms']:8.2f} ms  "
+                      f"p99 {entry['p99_ms']:8.2f} ms  {entry['fps']} fps", file=log)
+            except Exception as e:
+                entry['error'] = str(e)
+                print(f"[BENCH] {stage:9s} {name:12s} {resolution:>10s} skipped ({e})", file=log)
+            results.append(entry)
+    return results
+
+
+def environment(app, args):
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'opencv': cv2.__version__,
+        'opencv_threads': cv2.getNumThreads(),
+        'cpu_split': app.resources.split if app.resources else None,
+        'backend': app.model_backend.backend,
+        'int8': args.int8,
+        'yolo_workers': args.yolo_workers,
+        'frames': args.frames,
+        'warmup': args.warmup,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VisionAI - Per-stage benchmark (no camera or GUI)")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                        help="Stages to time")
+    parser.add_argument('--resolutions', nargs='+', default=list(DEFAULT_RESOLUTIONS),
+                        help="Synthetic frame sizes, WIDTHxHEIGHT")
+    parser.add_argument('--densities', nargs='+', type=int, default=list(DEFAULT_DENSITIES),
+                        help="Moving objects per synthetic frame")
+    parser.add_argument('--video', nargs='+', metavar='PATH',
+                        help="Also time stages on local video files")
+    parser.add_argument('--no-synthetic', action='store_true',
+                        help="Only use --video inputs")
+    parser.add_argument('--frames', type=int, default=100,
+                        help="Frames per configuration (including warmup)")
+    parser.add_argument('--warmup', type=int, default=10,
+                        help="Leading frames excluded from the statistics")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', default=os.environ.get('VISIONAI_BACKEND', 'auto'),
+                        help="YOLO inference backend")
+    parser.add_argument('--int8', action='store_true',
+                        help="Quantize the exported model to INT8")
+    parser.add_argument('--yolo-workers', type=int, default=0, metavar='N',
+                        help="Run YOLO in N worker processes (0 = in-process)")
+    parser.add_argument('--cpu-budget', type=int, metavar='N',
+                        help="Cores to use in total (default: all available)")
+    parser.add_argument('--cpu-split', metavar='SPEC',
+                        help="Threads per stage, e.g. yolo=4,opencv=2,ui=1")
+    parser.add_argument('--output', default='benchmark.json',
+                        help="JSON results file ('-' for stdout)")
+    args = parser.parse_args()
+
+    # Progress goes to stderr when the JSON itself is written to stdout
+    log = sys.stderr if args.output == '-' else sys.stdout
+    resources = ResourceGovernor(budget=args.cpu_budget,
+                                 split=parse_split(args.cpu_split) if args.cpu_split else ResourceGovernor.load_split())
+    resources.apply(log)
+
+    from vision_ai import VisionAIUnified
+    app = VisionAIUnified(headless=True, backend=args.backend, int8=args.int8, yolo_workers=args.yolo_workers,
+                          resources=resources)
+
+    report = {'environment': environment(app, args), 'results': run_benchmark(app, args, log)}
+    if args.yolo_workers and app.yolo_model.ready:
+        app.yolo_model.get().close()
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"[BENCH] Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
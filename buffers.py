@@ -0,0 +1,75 @@
+"""
+VisionAI frame buffers
+Reusable preallocated arrays for the per-frame OpenCV preprocessing
+"""
+
+import threading
+
+import cv2
+import numpy as np
+
+LETTERBOX_PAD = 114  # Same grey YOLO is trained with
+
+
+class BufferPool:
+    """Hands out preallocated arrays keyed by (tag, shape, dtype).
+
+    The tag separates consumers that need a buffer of the same shape at the
+    same time (e.g. the worker's grayscale frame and the UI's display image).
+    After the first frame of a given size the steady state allocates nothing.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self._lock = threading.Lock()
+        self.allocations = 0
+
+    def get(self, tag, shape, dtype=np.uint8):
+        key = (tag, tuple(shape), np.dtype(dtype).str)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            with self._lock:
+                buffer = self._buffers.get(key)
+                if buffer is None:
+                    buffer = np.empty(shape, dtype=dtype)
+                    self._buffers[key] = buffer
+                    self.allocations += 1
+        return buffer
+
+    def nbytes(self):
+        """Memory held by the pool; safe to call from another thread (metrics export)"""
+        with self._lock:
+            buffers = list(self._buffers.values())
+        return sum(buffer.nbytes for buffer in buffers)
+
+
+class Letterbox:
+    """Aspect-preserving resize of frames into a square model input.
+
+    The image is resized straight into a view of a pooled canvas, so building
+    the YOLO input costs a single resize and no allocation. Returns the canvas
+    plus the (scale, pad_x, pad_y) needed to map boxes back to the frame.
+    """
+
+    def __init__(self, pool, size=640, tag='letterbox'):
+        self.pool = pool
+        self.size = size
+        self.tag = tag
+        self._layout = None
+
+    def __call__(self, frame):
+        h, w = frame.shape[:2]
+        scale = min(self.size / w, self.size / h)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        pad_x, pad_y = (self.size - new_w) // 2, (self.size - new_h) // 2
+
+        canvas = self.pool.get(self.tag, (self.size, self.size) + frame.shape[2:], frame.dtype)
+        layout = (new_w, new_h, pad_x, pad_y)
+        if layout != self._layout:
+            # Borders only need painting when the input geometry changes
+            canvas[:] = LETTERBOX_PAD
+            self._layout = layout
+
+        cv2.resize(frame, (new_w, new_h), dst=canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w],
+                   interpolation=cv2.INTER_LINEAR)
+        return canvas, scale, pad_x, pad_y
@@ -0,0 +1,149 @@
+"""
+VisionAI event clips
+Keeps a compressed pre-roll in memory and records clips only around activity
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import cv2
+
+from pipeline import FrameQueue, DROP_OLDEST
+from recorder import Recorder
+
+IDLE = "idle"
+RECORDING = "recording"
+
+
+class ClipRecorder(threading.Thread):
+    """Event-triggered recording with a JPEG pre-roll ring buffer.
+
+    While idle, frames are JPEG-compressed into a ring holding the last
+    pre_roll seconds, capped at max_bytes. trigger() (a motion start, a new
+    face, a watched object class) starts a Recorder that first writes the
+    pre-roll and then the live frames. keep_alive() extends the clip while the
+    activity continues; the clip is closed post_roll seconds after the last
+    trigger or keep-alive, or after max_clip_seconds.
+
+    feed() only enqueues, compression and recording run on this thread.
+    """
+
+    def __init__(self, directory="recordings", pre_roll=5.0, post_roll=3.0, max_bytes=64 * 1024 * 1024,
+                 jpeg_quality=80, max_clip_seconds=300.0, metrics=None):
+        super().__init__(name="VisionAI-Clips", daemon=True)
+        self.directory = directory
+        self.pre_roll = pre_roll
+        self.post_roll = post_roll
+        self.max_bytes = max_bytes
+        self.jpeg_quality = jpeg_quality
+        self.max_clip_seconds = max_clip_seconds
+        self.metrics = metrics
+        self.queue = FrameQueue(maxsize=8, policy=DROP_OLDEST)
+
+        self.ring = deque()
+        self.ring_bytes = 0
+        self.state = IDLE
+        self.recorder = None
+        self.clip_start = None
+        self.clips = []
+        self._lock = threading.Lock()
+        self._trigger_reason = None
+        self._last_activity = None
+        self._stop_event = threading.Event()
+
+    def feed(self, frame, now=None):
+        """Queue a frame; it must not be modified afterwards"""
+        self.queue.put((now or time.time(), frame))
+
+    def trigger(self, reason, now=None):
+        with self._lock:
+            if self._trigger_reason is None:
+                self._trigger_reason = reason
+            self._last_activity = now or time.time()
+
+    def keep_alive(self, now=None):
+        """Extend a running clip; does not start one"""
+        with self._lock:
+            if self.state == RECORDING:
+                self._last_activity = now or time.time()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                item = self.queue.get(timeout=0.1)
+                if item is not None:
+                    self.process(*item)
+                elif self.state == RECORDING:
+                    self.process_idle_source()
+        finally:
+            self.close_clip()
+
+    def process(self, timestamp, frame):
+        with self._lock:
+            reason, self._trigger_reason = self._trigger_reason, None
+            last_activity = self._last_activity
+
+        if self.state == IDLE:
+            if reason is None:
+                self.add_to_ring(timestamp, frame)
+                return
+            self.open_clip(reason, timestamp)
+
+        self.recorder.write(frame, timestamp)
+        if (timestamp - last_activity > self.post_roll or
+                timestamp - self.clip_start > self.max_clip_seconds):
+            self.close_clip()
+
+    def process_idle_source(self):
+        # No frames arriving (camera stopped): close the clip once post-roll has passed
+        with self._lock:
+            last_activity = self._last_activity
+        if time.time() - last_activity > self.post_roll:
+            self.close_clip()
+
+    def add_to_ring(self, timestamp, frame):
+        ok, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            return
+        data = jpeg.tobytes()
+        self.ring.append((timestamp, data))
+        self.ring_bytes += len(data)
+        while self.ring and (timestamp - self.ring[0][0] > self.pre_roll or self.ring_bytes > self.max_bytes):
+            self.ring_bytes -= len(self.ring.popleft()[1])
+
+    def open_clip(self, reason, timestamp):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.fromtimestamp(timestamp).strftime("%Y%m%d_%H%M%S")
+        filename = os.path.join(self.directory, f"clip_{stamp}_{reason.replace(' ', '_')}.avi")
+        self.recorder = Recorder(filename, preroll=self.ring, metrics=self.metrics)
+        self.recorder.start()
+        self.ring = deque()
+        self.ring_bytes = 0
+        self.clip_start = timestamp
+        with self._lock:
+            self.state = RECORDING
+
+    def close_clip(self):
+        if self.recorder is None:
+            return
+        recorder, self.recorder = self.recorder, None
+        with self._lock:
+            self.state = IDLE
+        recorder.stop()
+        recorder.join(timeout=10.0)
+        self.clips.append(recorder.filename)
+        if recorder.last_error:
+            print(f"[CLIP] {recorder.filename} failed: {recorder.last_error}")
+        else:
+            print(f"[CLIP] {recorder.filename}: {recorder.summary()}")
+
+    def summary(self):
+        if self.state == RECORDING:
+            return f"Clip recording ({len(self.clips)} saved)"
+        return f"Pre-roll {len(self.ring)} frames / {self.ring_bytes / 1e6:.1f} MB ({len(self.clips)} clips saved)"
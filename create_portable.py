@@ -15,6 +15,29 @@ def create_portable_version():
     # Copy essential files
     files_to_copy = [
         "vision_ai.py",
+        "pipeline.py",
+        "batch.py",
+        "tracker.py",
+        "buffers.py",
+        "scheduler.py",
+        "motion.py",
+        "backends.py",
+        "loader.py",
+        "faces.py",
+        "event_store.py",
+        "ui_updates.py",
+        "display.py",
+        "recorder.py",
+        "clips.py",
+        "snapshots.py",
+        "benchmark.py",
+        "metrics.py",
+        "procpool.py",
+        "landmarks.py",
+        "anonymize.py",
+        "streams.py",
+        "sources.py",
+        "resources.py",
         "setup.py", 
         "requirements.txt",
         "README.md"
@@ -0,0 +1,66 @@
+"""
+VisionAI display
+Draws annotated frames into one reusable Tk image at display resolution
+"""
+
+import cv2
+from PIL import Image, ImageTk
+
+
+class DisplayRenderer:
+    """Shows frames through a single PhotoImage whose pixels are replaced in place.
+
+    Frames are resized to the display size before the BGR->RGB conversion, so
+    the conversion and the Tk upload only touch display pixels, and both steps
+    write into pooled buffers. A frame that was already shown is not drawn
+    again, so calling show() at the display rate costs nothing while the
+    inference worker has not produced anything new; `skipped` counts those
+    calls.
+    """
+
+    def __init__(self, pool, size=(640, 480)):
+        self.pool = pool
+        self.size = size
+        self.photo = None
+        self.label = None
+        self.last_frame_id = None
+        self.skipped = 0
+
+    def attach(self, label):
+        """Point the renderer at a (possibly rebuilt) label widget"""
+        if label is not self.label:
+            self.label = label
+            if self.photo is not None:
+                label.config(image=self.photo)
+
+    def show(self, frame, frame_id=None):
+        """Draw a BGR frame; False if it was already on screen"""
+        if frame_id is not None and frame_id == self.last_frame_id:
+            self.skipped += 1
+            return False
+        self.last_frame_id = frame_id
+
+        width, height = self.size
+        rgb = self.convert(frame)
+
+        # Shares memory with the pooled buffer, no extra copy before the upload
+        img = Image.frombuffer('RGB', (width, height), rgb, 'raw', 'RGB', 0, 1)
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(img)
+            if self.label is not None:
+                self.label.config(image=self.photo)
+        else:
+            self.photo.paste(img)
+        return True
+
+    def convert(self, frame):
+        """BGR frame -> pooled RGB buffer at display size (no Tk needed)"""
+        width, height = self.size
+        small = self.pool.get('display', (height, width, 3))
+        cv2.resize(frame, (width, height), dst=small)
+        rgb = self.pool.get('display_rgb', (height, width, 3))
+        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def reset(self):
+        self.last_frame_id = None
@@ -0,0 +1,156 @@
+"""
+VisionAI event store
+Durable detection log in SQLite (WAL) written in batches by a background thread
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import closing
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    type TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_type_ts ON events (type, ts);
+"""
+
+
+class EventStore:
+    """Append-only detection events with batched, off-thread writes.
+
+    append() only pushes onto an in-memory queue, so the frame path never
+    touches the disk. The writer thread commits whatever has accumulated in
+    one transaction every flush_interval (or as soon as batch_size events are
+    waiting). The queue is bounded by max_pending; events beyond it are
+    counted in `dropped` instead of growing memory without limit.
+    """
+
+    def __init__(self, path=os.path.join("logs", "detections.db"), batch_size=1000,
+                 flush_interval=0.5, max_pending=100000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.written = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self.connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._flushed = threading.Condition()
+        self._enqueued = 0
+        self._committed = 0
+        self._stop = False
+        self._writer = threading.Thread(target=self._run, name="VisionAI-EventStore", daemon=True)
+        self._writer.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def append(self, detection_type, details, source='cam0', ts=None):
+        """Queue one event; never blocks on I/O"""
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending.append((ts or time.time(), source, detection_type, details))
+            self._enqueued += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def _run(self):
+        conn = self.connect()
+        try:
+            while True:
+                with self._cond:
+                    if not self._stop and len(self._pending) < self.batch_size:
+                        self._cond.wait(self.flush_interval)
+                    batch = list(self._pending)
+                    self._pending.clear()
+                    stopping = self._stop
+                if batch:
+                    with conn:
+                        conn.executemany("INSERT INTO events (ts, source, type, details) VALUES (?, ?, ?, ?)", batch)
+                    self.written += len(batch)
+                with self._flushed:
+                    self._committed += len(batch)
+                    self._flushed.notify_all()
+                if stopping:
+                    break
+        finally:
+            conn.close()
+
+    def flush(self, timeout=10.0):
+        """Wait until every event queued so far is committed"""
+        with self._cond:
+            target = self._enqueued
+            self._cond.notify()
+        with self._flushed:
+            return self._flushed.wait_for(lambda: self._committed >= target, timeout)
+
+    def query(self, sql, params=()):
+        self.flush()
+        with closing(self.connect()) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def count(self, detection_type=None):
+        if detection_type is None:
+            return self.query("SELECT COUNT(*) FROM events")[0][0]
+        return self.query("SELECT COUNT(*) FROM events WHERE type = ?", (detection_type,))[0][0]
+
+    def iter_events(self, start=None, end=None, detection_type=None, chunk_size=5000):
+        """Stream (ts, source, type, details) rows in time order, chunk by chunk"""
+        self.flush()
+        query = "SELECT ts, source, type, details FROM events WHERE ts >= ? AND ts < ?"
+        params = [start if start is not None else 0, end if end is not None else float('inf')]
+        if detection_type is not None:
+            query += " AND type = ?"
+            params.append(detection_type)
+        query += " ORDER BY ts"
+
+        conn = self.connect()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def recent(self, limit=50):
+        return self.query("SELECT ts, source, type, details FROM events ORDER BY ts DESC LIMIT ?", (limit,))
+
+    def clear(self):
+        with self._cond:
+            discarded = len(self._pending)
+            self._pending.clear()
+        with self._flushed:
+            self._committed += discarded
+        self.flush()
+        with closing(self.connect()) as conn, conn:
+            conn.execute("DELETE FROM events")
+
+    def close(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._writer.join(timeout=5.0)
@@ -0,0 +1,110 @@
+"""
+VisionAI face search
+Downscaled full scans plus track-guided window searches for the Haar cascade
+"""
+
+import cv2
+
+CASCADE_WINDOW = 24  # Native window of haarcascade_frontalface_default
+
+
+class FaceFinder:
+    """Finds faces with a cost that scales with the number of faces.
+
+    Full scans run the cascade on a copy of the grayscale frame downscaled to
+    detect_width, with minSize corrected for the scale. Between full scans
+    (every full_scan_interval searches) only windows around the faces already
+    being tracked are searched, at a face-size range derived from each track.
+    New faces are therefore picked up at the next full scan. Only the path
+    taken converts to grayscale: the whole frame for a full scan, just the
+    windows for a track search.
+    """
+
+    def __init__(self, pool, scale_factor=1.2, min_neighbors=5, min_size=40,
+                 detect_width=640, full_scan_interval=10, window_margin=0.6):
+        self.pool = pool
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+        self.detect_width = detect_width
+        self.full_scan_interval = full_scan_interval
+        self.window_margin = window_margin
+        self.searches_since_full = 0
+
+    def find(self, cascade, frame, tracked=(), regions=None):
+        """Face boxes (x, y, w, h) in frame coordinates
+
+        tracked: (x, y, w, h) boxes of faces currently tracked.
+        regions: optional (x, y, w, h) areas a full scan is limited to.
+        """
+        if tracked and self.searches_since_full < self.full_scan_interval:
+            self.searches_since_full += 1
+            faces = self.search_windows(cascade, frame, tracked)
+        else:
+            self.searches_since_full = 0
+            gray = self.pool.get('gray', frame.shape[:2])
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+            faces = self.search_downscaled(cascade, gray, regions)
+        return self.dedupe(faces)
+
+    def search_downscaled(self, cascade, gray, regions=None):
+        frame_h, frame_w = gray.shape
+        scale = min(1.0, self.detect_width / frame_w)
+        if scale < 1.0:
+            small = self.pool.get('face_small', (int(frame_h * scale), int(frame_w * scale)))
+            cv2.resize(gray, (small.shape[1], small.shape[0]), dst=small, interpolation=cv2.INTER_AREA)
+        else:
+            small = gray
+        # Faces below CASCADE_WINDOW / scale full-res pixels can't be seen at this scale
+        min_size = max(CASCADE_WINDOW, int(round(self.min_size * scale)))
+
+        if regions is None:
+            regions = [(0, 0, frame_w, frame_h)]
+
+        faces = []
+        for rx, ry, rw, rh in regions:
+            sx, sy = int(rx * scale), int(ry * scale)
+            sw, sh = max(1, int(rw * scale)), max(1, int(rh * scale))
+            for (x, y, w, h) in cascade.detectMultiScale(small[sy:sy+sh, sx:sx+sw], self.scale_factor,
+                                                         self.min_neighbors, minSize=(min_size, min_size)):
+                faces.append((int((x + sx) / scale), int((y + sy) / scale), int(w / scale), int(h / scale)))
+        return faces
+
+    def search_windows(self, cascade, frame, tracked):
+        frame_h, frame_w = frame.shape[:2]
+        faces = []
+        for tx, ty, tw, th in tracked:
+            size = max(tw, th)
+            margin = int(size * self.window_margin)
+            x0, y0 = max(0, tx - margin), max(0, ty - margin)
+            x1, y1 = min(frame_w, tx + tw + margin), min(frame_h, ty + th + margin)
+            if x1 - x0 < CASCADE_WINDOW or y1 - y0 < CASCADE_WINDOW:
+                continue
+
+            # Shrink the window so the smallest face we look for is ~1.5 cascade windows
+            smallest = max(self.min_size, int(size * 0.6))
+            scale = min(1.0, 1.5 * CASCADE_WINDOW / smallest)
+            window = frame[y0:y1, x0:x1]
+            if scale < 1.0:
+                window = cv2.resize(window, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            window = cv2.cvtColor(window, cv2.COLOR_BGR2GRAY)
+            min_size = max(CASCADE_WINDOW, int(smallest * scale))
+            max_size = max(min_size + 1, int(size * 1.6 * scale))
+
+            for (x, y, w, h) in cascade.detectMultiScale(window, self.scale_factor, self.min_neighbors,
+                                                         minSize=(min_size, min_size),
+                                                         maxSize=(max_size, max_size)):
+                faces.append((int(x / scale) + x0, int(y / scale) + y0, int(w / scale), int(h / scale)))
+        return faces
+
+    def dedupe(self, faces):
+        """Drop boxes whose centre falls inside an already accepted (larger) box"""
+        kept = []
+        for x, y, w, h in sorted(faces, key=lambda f: f[2] * f[3], reverse=True):
+            cx, cy = x + w // 2, y + h // 2
+            if not any(kx <= cx < kx + kw and ky <= cy < ky + kh for kx, ky, kw, kh in kept):
+                kept.append((x, y, w, h))
+        return kept
+
+    def force_full_scan(self):
+        self.searches_since_full = self.full_scan_interval
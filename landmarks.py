@@ -0,0 +1,164 @@
+"""
+VisionAI landmarks
+Pose and hand-gesture analysis on tracked person crops, cached between runs
+"""
+
+import cv2
+
+# Subset of MediaPipe's 33-point pose skeleton: arms, torso and legs
+POSE_CONNECTIONS = ((11, 12), (11, 13), (13, 15), (12, 14), (14, 16), (11, 23), (12, 24),
+                    (23, 24), (23, 25), (25, 27), (24, 26), (26, 28))
+HAND_CONNECTIONS = ((0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8), (5, 9), (9, 10),
+                    (10, 11), (11, 12), (9, 13), (13, 14), (14, 15), (15, 16), (13, 17), (0, 17),
+                    (17, 18), (18, 19), (19, 20))
+FINGERS = ((8, 6), (12, 10), (16, 14), (20, 18))  # (tip, pip) for index..pinky
+
+
+def classify_gesture(points):
+    """Name a hand pose from 21 (x, y) landmarks by counting extended fingers"""
+    wrist = points[0]
+
+    def dist(a, b):
+        return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+
+    extended = [dist(points[tip], wrist) > dist(points[pip], wrist) * 1.1 for tip, pip in FINGERS]
+    thumb = dist(points[4], points[17]) > dist(points[3], points[17]) * 1.1
+    count = sum(extended) + thumb
+    if count == 0:
+        return "Fist"
+    if extended == [True, False, False, False]:
+        return "Point"
+    if extended == [True, True, False, False]:
+        return "Peace"
+    if thumb and not any(extended):
+        return "Thumb"
+    if count >= 4:
+        return "Open palm"
+    return f"{count} fingers"
+
+
+class PersonLandmarks:
+    """Runs MediaPipe Pose / Hands on person crops instead of whole frames.
+
+    Person boxes come from YOLO (class 0) and are tracked, so results are
+    cached per person id. Each call analyses at most one person per model,
+    the one whose cached result is oldest, on a crop downscaled to max_crop;
+    how often it is called is left to the detector scheduler. Landmarks are
+    kept in frame coordinates, with the person box they were found in, and
+    are drawn shifted along with the (predicted) box on later frames. Times
+    are capture times in seconds, like the trackers'; a person's cache entry
+    is dropped max_age seconds after they were last analysed and untracked.
+    """
+
+    def __init__(self, margin=0.1, max_crop=256, min_size=48, max_age=2.0):
+        self.margin = margin
+        self.max_crop = max_crop
+        self.min_size = min_size
+        self.max_age = max_age
+        self.cache = {}
+
+    def crop(self, frame, box):
+        """Padded RGB crop plus (x0, y0, scale) mapping it back to the frame"""
+        frame_h, frame_w = frame.shape[:2]
+        x1, y1, x2, y2 = box
+        pad_x, pad_y = int((x2 - x1) * self.margin), int((y2 - y1) * self.margin)
+        x0, y0 = max(0, x1 - pad_x), max(0, y1 - pad_y)
+        x3, y3 = min(frame_w, x2 + pad_x), min(frame_h, y2 + pad_y)
+        if x3 - x0 < self.min_size or y3 - y0 < self.min_size:
+            return None
+        region = frame[y0:y3, x0:x3]
+        scale = min(1.0, self.max_crop / max(region.shape[:2]))
+        if scale < 1.0:
+            region = cv2.resize(region, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(region, cv2.COLOR_BGR2RGB), (x0, y0, scale)
+
+    def stalest(self, people, kind, now):
+        """Tracked person whose `kind` result is oldest (never analysed first)"""
+        best = None
+        for box, person_id in people:
+            entry = self.cache.get(person_id, {})
+            age = now - entry.get(kind + '_time', float('-inf'))
+            if best is None or age > best[0]:
+                best = (age, box, person_id)
+        return best
+
+    def entry(self, person_id):
+        return self.cache.setdefault(person_id, {'pose': None, 'hands': [], 'gesture': None})
+
+    def update_pose(self, model, frame, people, now):
+        best = self.stalest(people, 'pose', now)
+        if best is None:
+            return
+        _, box, person_id = best
+        entry = self.entry(person_id)
+        entry['pose_time'] = now
+        entry['pose_box'] = box
+        crop = self.crop(frame, box)
+        if crop is None:
+            return
+        rgb, mapping = crop
+        result = model.process(rgb)
+        entry['pose'] = None
+        if result.pose_landmarks:
+            entry['pose'] = [self.to_frame(lm, rgb.shape, mapping) if lm.visibility > 0.5 else None
+                             for lm in result.pose_landmarks.landmark]
+
+    def update_hands(self, model, frame, people, now):
+        """Returns (person_id, gesture) when a person's gesture changes"""
+        best = self.stalest(people, 'hands', now)
+        if best is None:
+            return None
+        _, box, person_id = best
+        entry = self.entry(person_id)
+        entry['hands_time'] = now
+        entry['hands_box'] = box
+        crop = self.crop(frame, box)
+        if crop is None:
+            return None
+        rgb, mapping = crop
+        result = model.process(rgb)
+        entry['hands'] = [[self.to_frame(lm, rgb.shape, mapping) for lm in hand.landmark]
+                          for hand in (result.multi_hand_landmarks or [])]
+        gesture = classify_gesture(entry['hands'][0]) if entry['hands'] else None
+        changed = gesture is not None and gesture != entry['gesture']
+        entry['gesture'] = gesture
+        return (person_id, gesture) if changed else None
+
+    def to_frame(self, landmark, shape, mapping):
+        x0, y0, scale = mapping
+        return (int(x0 + landmark.x * shape[1] / scale), int(y0 + landmark.y * shape[0] / scale))
+
+    def cleanup(self, people, now):
+        """Forget people that are no longer tracked"""
+        present = {person_id for _, person_id in people}
+        for person_id in list(self.cache):
+            entry = self.cache[person_id]
+            last = max(entry.get('pose_time', float('-inf')), entry.get('hands_time', float('-inf')))
+            if person_id not in present and now - last > self.max_age:
+                del self.cache[person_id]
+
+    def draw(self, frame, people, pose=True, hands=True):
+        for (x1, y1, _, _), person_id in people:
+            entry = self.cache.get(person_id)
+            if entry is None:
+                continue
+            if pose and entry['pose']:
+                points = entry['pose']
+                dx, dy = x1 - entry['pose_box'][0], y1 - entry['pose_box'][1]
+                for a, b in POSE_CONNECTIONS:
+                    if points[a] and points[b]:
+                        cv2.line(frame, (points[a][0] + dx, points[a][1] + dy),
+                                 (points[b][0] + dx, points[b][1] + dy), (255, 0, 255), 2)
+            if hands:
+                for hand in entry['hands']:
+                    dx, dy = x1 - entry['hands_box'][0], y1 - entry['hands_box'][1]
+                    for a, b in HAND_CONNECTIONS:
+                        cv2.line(frame, (hand[a][0] + dx, hand[a][1] + dy),
+                                 (hand[b][0] + dx, hand[b][1] + dy), (0, 200, 255), 1)
+                if entry['gesture']:
+                    cv2.putText(frame, entry['gesture'], (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX,
+                                0.6, (0, 200, 255), 2)
+        return frame
+
+    def reset(self):
+        self.cache = {}
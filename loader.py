@@ -0,0 +1,91 @@
+"""
+VisionAI model loader
+Loads models on first use or in a background warmup thread, with load timings
+"""
+
+import threading
+import time
+
+IDLE = "idle"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class LazyModel:
+    """A model that is only built when it is first needed.
+
+    get() never blocks: it returns None until the model is ready, so the frame
+    loop can skip a detector that is still loading. load() blocks (batch mode
+    and other callers that cannot proceed without the model). warmup() starts
+    loading on a daemon thread.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.state = IDLE
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self._state_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    def get(self):
+        return self.model if self.state == READY else None
+
+    def warmup(self):
+        """Start loading in the background; True if this call started it"""
+        with self._state_lock:
+            if self.state != IDLE:
+                return False
+            self.state = LOADING
+        threading.Thread(target=self._load, name=f"VisionAI-Load-{self.name}", daemon=True).start()
+        return True
+
+    def load(self):
+        self._load()
+        if self.state == FAILED:
+            raise RuntimeError(f"{self.name} failed to load: {self.error}")
+        return self.model
+
+    def _load(self):
+        with self._load_lock:
+            if self.state in (READY, FAILED):
+                return
+            with self._state_lock:
+                self.state = LOADING
+            start_time = time.time()
+            try:
+                self.model = self.loader()
+                state = READY
+            except Exception as e:
+                self.error = e
+                state = FAILED
+            self.load_seconds = time.time() - start_time
+            with self._state_lock:
+                self.state = state
+
+
+class StartupTimer:
+    """Collects startup milestones and model load times for a one-line report"""
+
+    def __init__(self, start_time=None):
+        self.start_time = start_time or time.time()
+        self.milestones = {}
+
+    def mark(self, name):
+        self.milestones.setdefault(name, time.time() - self.start_time)
+
+    def report(self, models):
+        parts = [f"{name} {seconds:.2f}s" for name, seconds in self.milestones.items()]
+        for model in models:
+            if model.load_seconds is not None:
+                parts.append(f"{model.name} {model.state} in {model.load_seconds:.2f}s")
+            else:
+                parts.append(f"{model.name} {model.state}")
+        return " | ".join(parts)
@@ -0,0 +1,259 @@
+"""
+VisionAI metrics
+Counters, rate meters and latency histograms with a scrapeable text/JSON export
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 33, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """Latency distribution: cumulative buckets for scraping, a recent window for percentiles"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS, window=1000):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect_left(self.buckets, ms)] += 1
+            self.count += 1
+            self.total_ms += ms
+            self.recent.append(ms)
+
+    def summary(self):
+        with self._lock:
+            recent = np.array(self.recent) if self.recent else None
+            count, total_ms = self.count, self.total_ms
+            cumulative = list(np.cumsum(self.counts))
+        summary = {'count': count, 'sum_ms': round(total_ms, 3),
+                   'buckets': {str(bound): int(n) for bound, n in zip(self.buckets + ('+Inf',), cumulative)}}
+        if recent is not None:
+            summary.update({'mean_ms': round(float(recent.mean()), 3),
+                            'p50_ms': round(float(np.percentile(recent, 50)), 3),
+                            'p99_ms': round(float(np.percentile(recent, 99)), 3)})
+        return summary
+
+
+class Meter:
+    """Event count plus the rate over the last `window` seconds"""
+
+    def __init__(self, window=5.0):
+        self.window = window
+        self.count = 0
+        self.events = deque()
+        self._lock = threading.Lock()
+
+    def mark(self, n=1, now=None):
+        now = now or time.time()
+        with self._lock:
+            self.count += n
+            self.events.append((now, n))
+            self._trim(now)
+
+    def _trim(self, now):
+        while self.events and now - self.events[0][0] > self.window:
+            self.events.popleft()
+
+    def rate(self, now=None):
+        now = now or time.time()
+        with self._lock:
+            self._trim(now)
+            if len(self.events) < 2:
+                return 0.0
+            span = now - self.events[0][0]
+            # The first event opens the window, the rest happened inside it
+            return (sum(n for _, n in self.events) - self.events[0][1]) / span if span > 0 else 0.0
+
+
+class MetricsRegistry:
+    """Named meters, histograms and gauges shared by every pipeline stage.
+
+    Everything is created on first use, so a stage only has to call mark(),
+    observe() or time() with its name. Gauges are callables read at export
+    time (queue drop counters, model state, ...).
+    """
+
+    def __init__(self):
+        self.meters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def meter(self, name):
+        meter = self.meters.get(name)
+        if meter is None:
+            with self._lock:
+                meter = self.meters.setdefault(name, Meter())
+        return meter
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def mark(self, name, n=1):
+        self.meter(name).mark(n)
+
+    def observe(self, name, seconds):
+        self.histogram(name).observe(seconds)
+
+    def time(self, name):
+        return _Timer(self.histogram(name))
+
+    def gauge(self, name, fn):
+        self.gauges[name] = fn
+
+    def rate(self, name):
+        meter = self.meters.get(name)
+        return meter.rate() if meter else 0.0
+
+    def percentile(self, name, key='p50_ms'):
+        histogram = self.histograms.get(name)
+        return histogram.summary().get(key, 0.0) if histogram else 0.0
+
+    def snapshot(self):
+        gauges = {}
+        for name, fn in list(self.gauges.items()):
+            try:
+                gauges[name] = fn()
+            except Exception:
+                gauges[name] = None
+        return {
+            'timestamp': time.time(),
+            'uptime_s': round(time.time() - self.started, 1),
+            'counters': {name: meter.count for name, meter in list(self.meters.items())},
+            'rates_per_s': {name: round(meter.rate(), 2) for name, meter in list(self.meters.items())},
+            'latency': {name: histogram.summary() for name, histogram in list(self.histograms.items())},
+            'gauges': gauges,
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_text(self):
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, count in snapshot['counters'].items():
+            lines.append(f"visionai_{name}_total {count}")
+            lines.append(f"visionai_{name}_per_second {snapshot['rates_per_s'][name]}")
+        for name, summary in snapshot['latency'].items():
+            for bound, count in summary['buckets'].items():
+                lines.append(f'visionai_{name}_latency_ms_bucket{{le="{bound}"}} {count}')
+            lines.append(f"visionai_{name}_latency_ms_sum {summary['sum_ms']}")
+            lines.append(f"visionai_{name}_latency_ms_count {summary['count']}")
+        for name, value in snapshot['gauges'].items():
+            if isinstance(value, (int, float)):
+                lines.append(f"visionai_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def table(self, names=None):
+        """Short per-stage lines for the UI: p50 / p99 latency and call rate"""
+        rows = []
+        for name in names or sorted(self.histograms):
+            histogram = self.histograms.get(name)
+            if histogram is None or not histogram.count:
+                continue
+            summary = histogram.summary()
+            rows.append(f"{name:<11s} p50 {summary['p50_ms']:7.1f} ms   p99 {summary['p99_ms']:7.1f} ms   "
+                        f"n={summary['count']}")
+        return rows
+
+
+class _Timer:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start_time)
+        return False
+
+
+class MetricsExporter:
+    """Serves /metrics (text) and /metrics.json on localhost and/or rewrites a JSON file.
+
+    Both are off the frame path: the HTTP server runs on its own thread and
+    the file is replaced atomically every `interval` seconds.
+    """
+
+    def __init__(self, registry, port=None, path=None, interval=5.0, host='127.0.0.1'):
+        self.registry = registry
+        self.port = port
+        self.path = path
+        self.interval = interval
+        self.host = host
+        self.server = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self.port is not None:
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.startswith('/metrics.json'):
+                        body, content_type = registry.to_json().encode(), 'application/json'
+                    elif self.path.startswith('/metrics'):
+                        body, content_type = registry.to_text().encode(), 'text/plain; version=0.0.4'
+                    else:
+                        self.send_error(404)
+                        return
+                    self.send_response(200)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self.port = self.server.server_address[1]
+            threading.Thread(target=self.server.serve_forever, name="VisionAI-Metrics", daemon=True).start()
+            print(f"[METRICS] Serving http://{self.host}:{self.port}/metrics")
+        if self.path:
+            threading.Thread(target=self._write_loop, name="VisionAI-MetricsFile", daemon=True).start()
+
+    def _write_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(self.registry.to_json())
+        os.replace(temp_path, self.path)
+
+    def stop(self):
+        self._stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.path:
+            self.write()
@@ -0,0 +1,155 @@
+"""
+VisionAI motion helpers
+Turns a foreground mask into merged regions of interest for gated inference
+"""
+
+import cv2
+
+
+def merge_regions(rects, gap=0):
+    """Merge (x, y, w, h) rects that overlap or lie within gap pixels of each other"""
+    regions = [list(rect) for rect in rects]
+    merged = True
+    while merged and len(regions) > 1:
+        merged = False
+        result = []
+        while regions:
+            x, y, w, h = regions.pop()
+            i = 0
+            while i < len(regions):
+                ox, oy, ow, oh = regions[i]
+                if (x - gap < ox + ow and ox - gap < x + w and
+                        y - gap < oy + oh and oy - gap < y + h):
+                    nx, ny = min(x, ox), min(y, oy)
+                    w, h = max(x + w, ox + ow) - nx, max(y + h, oy + oh) - ny
+                    x, y = nx, ny
+                    regions.pop(i)
+                    merged = True
+                else:
+                    i += 1
+            result.append([x, y, w, h])
+        regions = result
+    return [tuple(region) for region in regions]
+
+
+def find_motion(fg_mask, min_area=1000):
+    """(rect, area) for every foreground contour larger than min_area"""
+    contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    blobs = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area > min_area:
+            blobs.append((cv2.boundingRect(contour), area))
+    return blobs
+
+
+def expand_region(rect, frame_shape, margin=32, min_size=96):
+    """Pad a region by margin, grow it to at least min_size and clamp to the frame"""
+    frame_h, frame_w = frame_shape[:2]
+    x, y, w, h = rect
+    x, y, w, h = x - margin, y - margin, w + 2 * margin, h + 2 * margin
+    if w < min_size:
+        x -= (min_size - w) // 2
+        w = min_size
+    if h < min_size:
+        y -= (min_size - h) // 2
+        h = min_size
+    x, y = max(0, x), max(0, y)
+    w, h = min(w, frame_w - x), min(h, frame_h - y)
+    return (x, y, w, h)
+
+
+def point_in_regions(x, y, regions):
+    for rx, ry, rw, rh in regions:
+        if rx <= x < rx + rw and ry <= y < ry + rh:
+            return True
+    return False
+
+
+class MotionEngine:
+    """Low-resolution motion detection reported as start/stop events.
+
+    MOG2 runs on a copy of the frame downscaled to `width`; the mask is
+    thresholded (dropping MOG2's grey shadow pixels) and cleaned with an
+    opening and a dilation before contours are merged into regions. Regions
+    are returned in full-frame coordinates every frame, but motion is only
+    reported when it starts (after start_frames consecutive moving frames)
+    and when it stops (no motion for stop_seconds), with the event's
+    duration and peak area.
+    """
+
+    def __init__(self, pool, width=320, min_area=1000, merge_gap=20, start_frames=2, stop_seconds=1.0):
+        self.pool = pool
+        self.width = width
+        self.min_area = min_area
+        self.merge_gap = merge_gap
+        self.start_frames = start_frames
+        self.stop_seconds = stop_seconds
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self.subtractor = None
+        self.input_shape = None
+
+        self.regions = []
+        self.active = False
+        self.moving_frames = 0
+        self.event = None
+        self.last_motion_time = None
+
+    def reset(self):
+        self.subtractor = None
+        self.input_shape = None
+        self.regions = []
+        self.active = False
+        self.moving_frames = 0
+        self.event = None
+
+    def apply(self, frame, now):
+        """Update with one frame; returns the list of events that fired"""
+        frame_h, frame_w = frame.shape[:2]
+        scale = min(1.0, self.width / frame_w)
+        small_shape = (int(frame_h * scale), int(frame_w * scale))
+        if small_shape != self.input_shape or self.subtractor is None:
+            # New resolution: the background model has to be relearned
+            self.subtractor = cv2.createBackgroundSubtractorMOG2()
+            self.input_shape = small_shape
+
+        if scale < 1.0:
+            small = self.pool.get('motion_small', small_shape + frame.shape[2:], frame.dtype)
+            cv2.resize(frame, (small_shape[1], small_shape[0]), dst=small, interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
+
+        mask = self.pool.get('motion_mask', small_shape)
+        self.subtractor.apply(small, fgmask=mask)
+        cv2.threshold(mask, 200, 255, cv2.THRESH_BINARY, dst=mask)
+        cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel, dst=mask)
+        cv2.dilate(mask, self.kernel, dst=mask, iterations=2)
+
+        blobs = find_motion(mask, min_area=self.min_area * scale * scale)
+        small_regions = merge_regions([rect for rect, _ in blobs], gap=int(self.merge_gap * scale))
+        self.regions = [(int(x / scale), int(y / scale), int(w / scale), int(h / scale))
+                        for x, y, w, h in small_regions]
+        area = sum(blob_area for _, blob_area in blobs) / (scale * scale)
+        return self.update_events(area, now)
+
+    def update_events(self, area, now):
+        events = []
+        if self.regions:
+            self.moving_frames += 1
+            self.last_motion_time = now
+            if not self.active and self.moving_frames >= self.start_frames:
+                self.active = True
+                self.event = {'start': now, 'peak_area': area, 'peak_regions': len(self.regions)}
+                events.append(('start', dict(self.event)))
+            elif self.active:
+                self.event['peak_area'] = max(self.event['peak_area'], area)
+                self.event['peak_regions'] = max(self.event['peak_regions'], len(self.regions))
+        else:
+            self.moving_frames = 0
+            if self.active and now - self.last_motion_time >= self.stop_seconds:
+                self.active = False
+                self.event['end'] = self.last_motion_time
+                self.event['duration'] = self.last_motion_time - self.event['start']
+                events.append(('stop', self.event))
+                self.event = None
+        return events
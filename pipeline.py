@@ -0,0 +1,204 @@
+"""
+VisionAI frame pipeline
+Capture and inference stages connected by bounded, drop-aware queues
+"""
+
+import threading
+import time
+from collections import deque
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+
+class FrameQueue:
+    """Bounded hand-off queue between two pipeline stages.
+
+    When full, DROP_OLDEST evicts the stalest item so the consumer always sees
+    the newest frame, DROP_NEWEST rejects the incoming one and BLOCK makes the
+    producer wait (lossless, for offline processing). Every eviction is counted
+    in `dropped`.
+    """
+
+    def __init__(self, maxsize=1, policy=DROP_OLDEST):
+        if policy not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+
+    def put(self, item, timeout=None):
+        """Enqueue item, returns False if it was rejected or timed out"""
+        with self._cond:
+            if self.policy == BLOCK:
+                deadline = None if timeout is None else time.time() + timeout
+                while len(self._items) >= self.maxsize:
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            elif len(self._items) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    return False
+                self._items.popleft()
+            self._items.append(item)
+            self._cond.notify()
+            return True
+
+    def get(self, timeout=None):
+        """Pop the oldest item, waiting up to timeout; None if nothing arrived"""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def get_latest(self):
+        """Non-blocking: return the newest item and discard anything older"""
+        with self._cond:
+            if not self._items:
+                return None
+            self.dropped += len(self._items) - 1
+            item = self._items.pop()
+            self._items.clear()
+            self._cond.notify_all()
+            return item
+
+    def clear(self):
+        with self._cond:
+            self._items.clear()
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class ErrorLog:
+    """Failures of a pipeline stage that keeps running past them.
+
+    Every error is counted and kept in `last_error`; at most one line per
+    `interval` seconds is printed, with the number of errors suppressed in
+    between, so a failure on every frame cannot flood the console.
+    """
+
+    def __init__(self, name, interval=5.0):
+        self.name = name
+        self.interval = interval
+        self.count = 0
+        self.last_error = None
+        self.last_time = 0.0
+        self._printed_time = 0.0
+        self._printed_count = 0
+
+    def report(self, error):
+        now = time.time()
+        self.count += 1
+        self.last_error = error
+        self.last_time = now
+        if now - self._printed_time >= self.interval:
+            suppressed = self.count - self._printed_count - 1
+            more = f" (+{suppressed} since last report)" if suppressed else ""
+            print(f"[ERROR] {self.name}: {type(error).__name__}: {error}{more}")
+            self._printed_time = now
+            self._printed_count = self.count
+
+    def recent(self, seconds=5.0):
+        """True if the last error happened within the given number of seconds"""
+        return self.count > 0 and time.time() - self.last_time < seconds
+
+
+class CaptureThread(threading.Thread):
+    """Reads frames as fast as the source delivers them.
+
+    Each frame is pushed as (frame_id, capture_time, frame); capture_time is
+    the source's own frame timestamp when it has one (CaptureSource), else
+    the time read() returned. With a DROP_OLDEST queue of size 1 the consumer
+    only ever sees the newest frame, so a slow detector never leaves stale
+    frames piling up in the camera buffer.
+
+    The thread owns the capture: it releases it when its loop exits, so the
+    capture is never released in the middle of a read. stop() only asks it
+    to finish (and interrupts a CaptureSource's reconnect wait).
+    """
+
+    def __init__(self, cap, out_queue, read_fail_delay=0.01, metrics=None):
+        super().__init__(name="VisionAI-Capture", daemon=True)
+        self.cap = cap
+        self.out_queue = out_queue
+        self.read_fail_delay = read_fail_delay
+        self.metrics = metrics
+        self.frames_read = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                start_time = time.time()
+                ret, frame = self.cap.read()
+                if not ret:
+                    time.sleep(self.read_fail_delay)
+                    continue
+                self.frames_read += 1
+                if self.metrics is not None:
+                    self.metrics.observe('capture', time.time() - start_time)
+                    self.metrics.mark('captured')
+                item = (self.frames_read, getattr(self.cap, 'last_timestamp', None) or time.time(), frame)
+                self.out_queue.put(item)
+        finally:
+            self.cap.release()
+
+    def stop(self):
+        self._stop_event.set()
+        close = getattr(self.cap, 'close', None)
+        if close is not None:
+            close()
+
+
+class InferenceWorker(threading.Thread):
+    """Runs process_fn(frame, capture_time) on captured frames off the UI thread.
+
+    Results are pushed as (frame_id, capture_time, annotated_frame,
+    processing_seconds). Frames whose processing raises are skipped and the
+    error is counted in `errors`.
+    """
+
+    def __init__(self, process_fn, in_queue, out_queue, poll_interval=0.1, metrics=None):
+        super().__init__(name="VisionAI-Inference", daemon=True)
+        self.process_fn = process_fn
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.poll_interval = poll_interval
+        self.metrics = metrics
+        self.frames_processed = 0
+        self.errors = ErrorLog("Frame processing")
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            item = self.in_queue.get(timeout=self.poll_interval)
+            if item is None:
+                continue
+            frame_id, captured_at, frame = item
+            start_time = time.time()
+            try:
+                annotated = self.process_fn(frame, captured_at)
+            except Exception as e:
+                # Keep the worker alive; a single bad frame must not stop the stream
+                self.errors.report(e)
+                continue
+            self.frames_processed += 1
+            proc_seconds = time.time() - start_time
+            if self.metrics is not None:
+                self.metrics.observe('process', proc_seconds)
+                self.metrics.mark('processed')
+            self.out_queue.put((frame_id, captured_at, annotated, proc_seconds))
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,267 @@
+"""
+VisionAI process pool
+Runs YOLO in worker processes fed through shared-memory frame slots
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from buffers import LETTERBOX_PAD
+
+BOX_COLUMNS = 6  # x1, y1, x2, y2, conf, cls
+
+
+def boxes_array(result):
+    """One YOLO result as a compact (N, 6) float32 array"""
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return np.zeros((0, BOX_COLUMNS), dtype=np.float32)
+    return np.column_stack([boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(),
+                            boxes.cls.cpu().numpy()]).astype(np.float32)
+
+
+def _worker_main(index, artifact, task, params, threads, cores, shm_name, slot_shape, slots, tasks, results):
+    """Worker process: load the model once, then run inference on ring slots"""
+    # Split the cores between the workers instead of every process using all of them
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+    cv2.setNumThreads(1)
+    if cores:
+        os.sched_setaffinity(0, cores)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        from ultralytics import YOLO
+        import torch
+        torch.set_num_threads(threads)
+        model = YOLO(artifact, task=task) if task else YOLO(artifact)
+        ring = np.ndarray((slots,) + slot_shape, dtype=np.uint8, buffer=shm.buf)
+        model(np.zeros(slot_shape, dtype=np.uint8), verbose=False)
+        results.put(('ready', index, dict(model.names)))
+    except Exception as e:
+        results.put(('error', index, repr(e)))
+        shm.close()
+        return
+
+    try:
+        while True:
+            item = tasks.get()
+            if item is None:
+                break
+            task_id, slot = item
+            try:
+                output = model(ring[slot], **params)
+                results.put((task_id, boxes_array(output[0]), None))
+            except Exception as e:
+                results.put((task_id, None, repr(e)))
+    finally:
+        del ring
+        shm.close()
+
+
+class PoolJob:
+    """Pending inference for a list of images; result() waits for all of them"""
+
+    def __init__(self, count, pool=None):
+        self.boxes = [None] * count
+        self.error = None
+        self.remaining = count
+        self.pool = pool
+        self.done = threading.Event()
+        if not count:
+            self.done.set()
+
+    def result(self, timeout=30.0, poll_interval=0.2):
+        deadline = time.time() + timeout
+        while not self.done.wait(min(poll_interval, max(0.0, deadline - time.time()))):
+            if self.pool is not None:
+                # A dead worker fails every pending job at once (and sets done)
+                self.pool.check_workers()
+                if self.done.is_set():
+                    break
+            if time.time() >= deadline:
+                if self.pool is not None:
+                    self.pool.abandon(self)
+                raise RuntimeError("YOLO worker timed out")
+        if self.error:
+            raise RuntimeError(f"YOLO worker failed: {self.error}")
+        return self.boxes
+
+
+class YoloProcessPool:
+    """YOLO inference spread over worker processes.
+
+    Images are letterboxed by the caller's thread straight into slots of a
+    shared-memory ring, so frames are never pickled; only (task_id, slot)
+    goes to the workers and (N, 6) box arrays come back. Each image is a
+    separate task, so the ROI crops of one frame (or the frames of several
+    cameras) are processed by several workers at once. The ring bounds the
+    number of images in flight: submit() waits for a free slot.
+    """
+
+    def __init__(self, artifact, task='detect', workers=2, imgsz=640, params=None, slots=None, threads=None,
+                 cores=None):
+        self.artifact = artifact
+        self.task = task
+        self.workers = max(1, workers)
+        self.imgsz = imgsz
+        self.params = dict(params or {})
+        self.slots = slots or self.workers * 4
+        self.threads = threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.cores = cores  # Optional core list per worker
+        self.slot_shape = (imgsz, imgsz, 3)
+        self.names = {}
+        self.processes = []
+        self.dead_workers = 0
+        self.shm = None
+        self.ring = None
+        self._free = queue.Queue()
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._collector = None
+
+    def start(self, timeout=300.0):
+        """Start the workers and wait until every one has loaded the model"""
+        slot_bytes = int(np.prod(self.slot_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_bytes * self.slots)
+        self.ring = np.ndarray((self.slots,) + self.slot_shape, dtype=np.uint8, buffer=self.shm.buf)
+        for slot in range(self.slots):
+            self._free.put(slot)
+
+        # spawn: forking a process that already runs Tk and torch threads is unsafe
+        context = mp.get_context('spawn')
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+        for index in range(self.workers):
+            cores = self.cores[index] if self.cores else None
+            process = context.Process(target=_worker_main, name=f"VisionAI-YOLO-{index}", daemon=True,
+                                      args=(index, self.artifact, self.task, self.params, self.threads, cores,
+                                            self.shm.name, self.slot_shape, self.slots, self.tasks, self.results))
+            process.start()
+            self.processes.append(process)
+
+        ready = 0
+        try:
+            while ready < self.workers:
+                kind, index, payload = self.results.get(timeout=timeout)
+                if kind == 'error':
+                    raise RuntimeError(f"YOLO worker {index} failed to start: {payload}")
+                self.names = payload
+                ready += 1
+        except Exception:
+            self.close()
+            raise
+
+        self._collector = threading.Thread(target=self._collect, name="VisionAI-YOLO-Results", daemon=True)
+        self._collector.start()
+        return self
+
+    def submit(self, images, timeout=10.0):
+        """Queue images (BGR, any size); returns a PoolJob whose result() is one box array per image,
+        in image coordinates"""
+        job = PoolJob(len(images), pool=self)
+        for position, image in enumerate(images):
+            try:
+                slot = self._free.get(timeout=timeout)
+            except queue.Empty:
+                raise RuntimeError("No free YOLO frame slot")
+            scale, pad_x, pad_y = self.letterbox_into(image, self.ring[slot])
+            task_id = next(self._task_ids)
+            with self._jobs_lock:
+                self._jobs[task_id] = (job, position, slot, scale, pad_x, pad_y)
+            self.tasks.put((task_id, slot))
+        return job
+
+    def __call__(self, images, timeout=30.0):
+        return self.submit(images).result(timeout)
+
+    def letterbox_into(self, image, canvas):
+        h, w = image.shape[:2]
+        scale = min(self.imgsz / w, self.imgsz / h)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        pad_x, pad_y = (self.imgsz - new_w) // 2, (self.imgsz - new_h) // 2
+        # Slots are shared by images of different sizes, so the borders are always repainted
+        canvas[:pad_y] = LETTERBOX_PAD
+        canvas[pad_y + new_h:] = LETTERBOX_PAD
+        canvas[pad_y:pad_y + new_h, :pad_x] = LETTERBOX_PAD
+        canvas[pad_y:pad_y + new_h, pad_x + new_w:] = LETTERBOX_PAD
+        cv2.resize(image, (new_w, new_h), dst=canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w],
+                   interpolation=cv2.INTER_LINEAR)
+        return scale, pad_x, pad_y
+
+    def _collect(self):
+        while True:
+            try:
+                item = self.results.get()
+            except (EOFError, OSError):
+                break
+            if item is None:
+                break
+            task_id, boxes, error = item
+            with self._jobs_lock:
+                entry = self._jobs.pop(task_id, None)
+            if entry is None:
+                continue
+            job, position, slot, scale, pad_x, pad_y = entry
+            self._free.put(slot)
+            if error:
+                job.error = error
+            else:
+                # Undo the letterbox: back to the submitted image's coordinates
+                boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad_x) / scale
+                boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad_y) / scale
+                job.boxes[position] = boxes
+            job.remaining -= 1
+            if job.remaining == 0:
+                job.done.set()
+
+    def check_workers(self):
+        """Fail all pending jobs if a worker process died: the task it held is lost"""
+        dead = [process for process in self.processes if not process.is_alive()]
+        if len(dead) > self.dead_workers:
+            self.dead_workers = len(dead)
+            codes = ", ".join(f"{process.name} exit code {process.exitcode}" for process in dead)
+            self.fail_pending(f"worker died ({codes})")
+        elif dead and len(dead) == len(self.processes):
+            self.fail_pending("no YOLO workers left")
+
+    def fail_pending(self, error):
+        with self._jobs_lock:
+            entries, self._jobs = list(self._jobs.values()), {}
+        for job, _, slot, _, _, _ in entries:
+            self._free.put(slot)
+            job.error = error
+            job.done.set()
+
+    def abandon(self, job):
+        """Forget a job's outstanding tasks and give their slots back; late results are ignored"""
+        with self._jobs_lock:
+            task_ids = [task_id for task_id, entry in self._jobs.items() if entry[0] is job]
+            entries = [self._jobs.pop(task_id) for task_id in task_ids]
+        for entry in entries:
+            self._free.put(entry[2])
+
+    def close(self):
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        if self._collector is not None:
+            self.results.put(None)
+            self._collector.join(timeout=2.0)
+            self._collector = None
+        if self.shm is not None:
+            self.ring = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
@@ -0,0 +1,134 @@
+"""
+VisionAI recorder
+Encodes video on its own thread so recording never slows the frame loop
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from pipeline import FrameQueue, DROP_NEWEST
+
+
+class Recorder(threading.Thread):
+    """Writes frames to a video file from a bounded queue.
+
+    write() only enqueues; when the encoder falls behind and the queue is
+    full, new frames are rejected and counted in `dropped` rather than
+    stalling the caller. The writer is opened once the first probe_frames
+    frames (or probe_seconds of them) have arrived, at the size of the first
+    frame and the frame rate measured from their timestamps. Encode lag is the
+    time from write() to the frame being handed to the encoder; frames held
+    back while probing are not counted.
+
+    preroll is an optional list of (timestamp, frame) written ahead of the
+    live frames; frames may be JPEG bytes, which are decoded on this thread.
+    """
+
+    def __init__(self, filename, fourcc='XVID', queue_size=60, probe_frames=30, probe_seconds=1.0,
+                 default_fps=20.0, preroll=None, metrics=None):
+        super().__init__(name="VisionAI-Recorder", daemon=True)
+        self.filename = filename
+        self.fourcc = cv2.VideoWriter_fourcc(*fourcc)
+        self.queue = FrameQueue(maxsize=queue_size, policy=DROP_NEWEST)
+        self.probe_frames = probe_frames
+        self.probe_seconds = probe_seconds
+        self.default_fps = default_fps
+        self.preroll = list(preroll or [])
+        self.metrics = metrics
+
+        self.size = None
+        self.fps = None
+        self.frames_written = 0
+        self.lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.last_error = None
+        self.writer = None
+        self._stop_event = threading.Event()
+
+    @property
+    def dropped(self):
+        return self.queue.dropped
+
+    def write(self, frame, timestamp=None):
+        """Queue a frame; False if it was dropped. The frame must not be modified afterwards"""
+        if self._stop_event.is_set():
+            return False
+        queued = self.queue.put((timestamp or time.time(), frame))
+        if not queued and self.metrics is not None:
+            self.metrics.mark('record_dropped')
+        return queued
+
+    def stop(self):
+        """Stop accepting frames; queued frames are still written before the file is closed"""
+        self._stop_event.set()
+
+    def run(self):
+        probe, self.preroll = self.preroll, []
+        try:
+            while True:
+                item = self.queue.get(timeout=0.1)
+                if item is None:
+                    if self._stop_event.is_set():
+                        break
+                    continue
+
+                if self.writer is None:
+                    probe.append(item)
+                    if len(probe) < self.probe_frames and item[0] - probe[0][0] < self.probe_seconds \
+                            and not self._stop_event.is_set():
+                        continue
+                    self.open(probe)
+                    for queued in probe:
+                        self.encode(*queued, probing=True)
+                    probe = []
+                else:
+                    self.encode(*item)
+
+            if probe:
+                self.open(probe)
+                for queued in probe:
+                    self.encode(*queued, probing=True)
+        except Exception as e:
+            self.last_error = e
+        finally:
+            if self.writer is not None:
+                self.writer.release()
+
+    def open(self, probe):
+        height, width = self.decode(probe[0][1]).shape[:2]
+        self.size = (width, height)
+        span = probe[-1][0] - probe[0][0]
+        self.fps = (len(probe) - 1) / span if len(probe) > 1 and span > 0 else self.default_fps
+        self.writer = cv2.VideoWriter(self.filename, self.fourcc, self.fps, self.size)
+        if not self.writer.isOpened():
+            raise RuntimeError(f"Cannot open video writer for {self.filename}")
+
+    def decode(self, frame):
+        if isinstance(frame, bytes):
+            return cv2.imdecode(np.frombuffer(frame, np.uint8), cv2.IMREAD_COLOR)
+        return frame
+
+    def encode(self, timestamp, frame, probing=False):
+        start_time = time.time()
+        frame = self.decode(frame)
+        if (frame.shape[1], frame.shape[0]) != self.size:
+            frame = cv2.resize(frame, self.size)
+        self.writer.write(frame)
+        self.frames_written += 1
+        if self.metrics is not None:
+            self.metrics.observe('record', time.time() - start_time)
+            self.metrics.mark('recorded')
+        if probing:
+            # Held back on purpose while the frame rate was measured
+            return
+        lag_ms = (time.time() - timestamp) * 1000
+        self.lag_ms = 0.9 * self.lag_ms + 0.1 * lag_ms if self.lag_ms else lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def summary(self):
+        fps = f"{self.fps:.1f} fps" if self.fps else "probing fps"
+        return (f"{self.frames_written} frames, {fps}, {self.dropped} dropped, "
+                f"lag {self.lag_ms:.0f} ms (max {self.max_lag_ms:.0f} ms)")
@@ -0,0 +1,256 @@
+"""
+VisionAI CPU resources
+Divides a core budget between YOLO, OpenCV and the UI, sizes their thread
+pools, optionally pins them to core sets, and calibrates a split
+"""
+
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+try:
+    from threadpoolctl import threadpool_limits
+    THREADPOOLCTL_AVAILABLE = True
+except ImportError:
+    THREADPOOLCTL_AVAILABLE = False
+
+STAGES = ('yolo', 'opencv', 'ui')  # opencv: face cascade and MOG2 share OpenCV's one thread pool
+DEFAULT_SPLIT_FILE = os.path.join('models', 'cpu_split.json')
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+
+def allowed_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def default_split(budget):
+    """Cores per stage that add up to the budget.
+
+    One core for the UI and capture, a quarter for OpenCV, the rest for YOLO.
+    Below three cores OpenCV, then the UI, get none of their own (0): they
+    run single-threaded on the YOLO cores.
+    """
+    ui = 1 if budget >= 2 else 0
+    opencv = max(1, budget // 4) if budget >= 3 else 0
+    return {'yolo': budget - ui - opencv, 'opencv': opencv, 'ui': ui}
+
+
+def fit_split(split, budget):
+    """Scale a split down proportionally until it fits the budget (YOLO keeps at least one core)"""
+    total = sum(split[stage] for stage in STAGES)
+    if total <= budget:
+        return {stage: split[stage] for stage in STAGES}
+    fitted = {stage: split[stage] * budget // total for stage in STAGES}
+    fitted['yolo'] = max(1, fitted['yolo'])
+    # Rounding leftovers go to the largest stages first
+    for stage in sorted(STAGES, key=lambda stage: -split[stage]):
+        if sum(fitted.values()) >= budget:
+            break
+        fitted[stage] += 1
+    return fitted
+
+
+def parse_split(text):
+    """'yolo=4,opencv=2,ui=1' -> dict; unknown stages are rejected, only YOLO needs a core"""
+    split = {}
+    for part in text.split(','):
+        stage, _, count = part.partition('=')
+        stage = stage.strip()
+        if stage not in STAGES or not count.strip().isdigit() or int(count) < (1 if stage == 'yolo' else 0):
+            raise ValueError(f"Bad CPU split entry: {part!r} (expected e.g. yolo=4,opencv=2,ui=1)")
+        split[stage] = int(count)
+    return {**default_split(sum(split.values())), **split}
+
+
+class ResourceGovernor:
+    """Thread pool sizes and core sets for each stage of the pipeline.
+
+    Without limits OpenCV and PyTorch each start one thread per core and
+    oversubscribe the CPU together with the pipeline threads. The governor
+    gives every stage a thread count from one budget (all allowed cores by
+    default) and, with pin=True, a disjoint core set. Stages that do not fit a
+    small budget share cores.
+
+    apply() limits this process through the runtime APIs: cv2.setNumThreads,
+    torch.set_num_threads and, when threadpoolctl is installed, the
+    OpenBLAS/MKL/OpenMP pools numpy has already loaded (without it those
+    keep one thread per core). The OMP/MKL/OPENBLAS_NUM_THREADS variables it
+    sets are read only by libraries loaded later, i.e. by the YOLO worker
+    processes.
+    """
+
+    def __init__(self, budget=None, split=None, pin=False):
+        self.cores = allowed_cores()
+        self.budget = max(1, min(budget or len(self.cores), len(self.cores)))
+        self.split = fit_split(split, self.budget) if split else default_split(self.budget)
+        if split and self.split != {stage: split[stage] for stage in STAGES}:
+            print(f"[CPU] Split {format_split(split)} exceeds the budget of {self.budget} cores, "
+                  f"using {format_split(self.split)}")
+        self.pin = pin and hasattr(os, 'sched_setaffinity')
+        self.blas_limits = None
+        # Consecutive core sets from the first `budget` cores; stages without cores share YOLO's
+        budget_cores = self.cores[:self.budget]
+        self.core_sets = {}
+        start = 0
+        for stage in STAGES:
+            count = self.split[stage]
+            self.core_sets[stage] = budget_cores[start:start + count] or self.core_sets['yolo']
+            start += count
+
+    def apply(self, log=sys.stdout):
+        threads = self.split['yolo']
+        # Inherited by worker processes; too late for the libraries already loaded here
+        for name in THREAD_ENV_VARS:
+            os.environ.setdefault(name, str(threads))
+        if THREADPOOLCTL_AVAILABLE:
+            self.blas_limits = threadpool_limits(limits=threads)
+        cv2.setNumThreads(max(1, self.split['opencv']))
+        if 'torch' in sys.modules:
+            self.configure_torch()
+        if self.pin:
+            # Main thread: Tk and the display; threads started from it inherit this set
+            os.sched_setaffinity(0, self.core_sets['ui'])
+        print(f"[CPU] {self.summary()}", file=log)
+
+    def configure_torch(self):
+        """Intra-op threads for YOLO, a single inter-op thread (one model call at a time)"""
+        try:
+            import torch
+        except ImportError:
+            return
+        torch.set_num_threads(self.split['yolo'])
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # Only settable before torch has run parallel work
+
+    def pin_thread(self, thread, stages):
+        """Restrict a started thread to the cores of one or more stages (Linux)"""
+        if not self.pin or thread is None or thread.native_id is None:
+            return
+        cores = sorted({core for stage in stages for core in self.core_sets[stage]})
+        try:
+            os.sched_setaffinity(thread.native_id, cores)
+        except OSError as e:
+            print(f"[CPU] Cannot pin {thread.name}: {e}")
+
+    def worker_cores(self, workers):
+        """YOLO core set divided between worker processes, None when not pinning"""
+        if not self.pin:
+            return None
+        cores = self.core_sets['yolo']
+        return [cores[i::workers] or cores for i in range(workers)]
+
+    def summary(self):
+        parts = []
+        for stage in STAGES:
+            text = f"{stage} {self.split[stage] or 'shared'}"
+            if self.pin:
+                text += f" (cores {','.join(str(core) for core in self.core_sets[stage])})"
+            parts.append(text)
+        return f"budget {self.budget} of {len(self.cores)} cores: " + ", ".join(parts)
+
+    def save(self, path=DEFAULT_SPLIT_FILE):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'budget': self.budget, 'split': self.split}, f, indent=2)
+
+    @staticmethod
+    def load_split(path=DEFAULT_SPLIT_FILE):
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)['split']
+
+
+def format_split(split):
+    return ",".join(f"{stage}={split[stage]}" for stage in STAGES)
+
+
+def knee(timings, tolerance=0.1):
+    """Fewest threads whose latency is within tolerance of the best"""
+    best = min(timings.values())
+    return min(threads for threads, seconds in timings.items() if seconds <= best * (1 + tolerance))
+
+
+def thread_counts(limit):
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+    return counts
+
+
+def time_calls(fn, repeats):
+    fn()  # Warm up (pool start-up, first-call allocations)
+    samples = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start_time)
+    return float(np.median(samples))
+
+
+def calibrate(app, budget=None, repeats=10, log=sys.stdout):
+    """Time YOLO and the OpenCV stages at several thread counts and suggest a split.
+
+    Each stage gets the smallest thread count that is within 10% of its best
+    latency; cores beyond that only add contention. Runs in-process on a
+    synthetic 1280x720 scene.
+    """
+    from benchmark import SyntheticScene
+
+    cores = allowed_cores()
+    budget = max(1, min(budget or len(cores), len(cores)))
+    scene = SyntheticScene(1280, 720, objects=5)
+    frame = scene.next_frame()
+
+    def opencv_stages():
+        app.motion_engine.apply(scene.next_frame(), time.time())
+        if faces:
+            app.face_finder.force_full_scan()
+            app.find_faces(frame)
+
+    try:
+        app.face_cascade
+        faces = True
+    except Exception as e:
+        faces = False
+        print(f"[CPU] Face cascade not calibrated ({e})", file=log)
+
+    opencv_times = {}
+    for threads in thread_counts(max(1, budget - 1)):
+        cv2.setNumThreads(threads)
+        opencv_times[threads] = time_calls(opencv_stages, repeats)
+        print(f"[CPU] opencv {threads:2d} threads: {opencv_times[threads] * 1000:7.1f} ms", file=log)
+
+    yolo_times = {}
+    try:
+        import torch
+        model = app.yolo
+        for threads in thread_counts(max(1, budget - 1)):
+            torch.set_num_threads(threads)
+            yolo_times[threads] = time_calls(lambda: model(frame, **app.YOLO_PARAMS), repeats)
+            print(f"[CPU] yolo   {threads:2d} threads: {yolo_times[threads] * 1000:7.1f} ms", file=log)
+    except Exception as e:
+        print(f"[CPU] YOLO not calibrated ({e})", file=log)
+
+    ui = default_split(budget)['ui']
+    opencv = min(knee(opencv_times), budget - 1 - ui)
+    yolo = budget - ui - opencv
+    if yolo_times:
+        yolo = min(knee(yolo_times), yolo)
+    governor = ResourceGovernor(budget=budget, split={'yolo': yolo, 'opencv': opencv, 'ui': ui})
+    spare = budget - yolo - opencv - ui
+    print(f"[CPU] Suggested split: {governor.summary()}" + (f" ({spare} core(s) spare)" if spare > 0 else ""),
+          file=log)
+    return governor
@@ -0,0 +1,86 @@
+"""
+VisionAI detector scheduler
+Decides per frame which detectors run, based on measured cost and a latency budget
+"""
+
+import math
+
+
+class DetectorScheduler:
+    """Latency-budgeted, staggered detector cadence.
+
+    Every detector keeps an exponential moving average of its run time. Each
+    detector gets an equal share of the per-frame budget, and its interval
+    (run every N frames) is the smallest N that keeps its amortized cost inside
+    that share. On each frame the due detectors are taken most-overdue first
+    until the budget is spent, so two expensive detectors are pushed onto
+    different frames instead of stacking up on the same one.
+    """
+
+    def __init__(self, target_ms=40.0, smoothing=0.2, max_interval=15):
+        self.target_ms = target_ms
+        self.smoothing = smoothing
+        self.max_interval = max_interval
+        self.detectors = {}
+        self.frame_index = 0
+        self.frame_ms = 0.0
+        self.active = []
+
+    def register(self, name, min_interval=1, initial_cost_ms=10.0):
+        self.detectors[name] = {
+            'cost_ms': initial_cost_ms,
+            'min_interval': min_interval,
+            'interval': min_interval,
+            'last_run': None
+        }
+
+    def plan(self, enabled):
+        """Names of the enabled detectors that should run on the next frame"""
+        self.frame_index += 1
+        active = [name for name in enabled if name in self.detectors]
+        self.active = active
+        if not active:
+            return []
+
+        share_ms = self.target_ms / len(active)
+        due = []
+        for name in active:
+            det = self.detectors[name]
+            det['interval'] = min(self.max_interval,
+                                  max(det['min_interval'], math.ceil(det['cost_ms'] / share_ms)))
+            if det['last_run'] is None:
+                overdue = float('inf')
+            else:
+                overdue = (self.frame_index - det['last_run']) / det['interval']
+            if overdue >= 1.0:
+                due.append((overdue, name))
+
+        planned = []
+        spent_ms = 0.0
+        for overdue, name in sorted(due, reverse=True):
+            cost_ms = self.detectors[name]['cost_ms']
+            # Always run at least one due detector, otherwise respect the budget
+            if planned and spent_ms + cost_ms > self.target_ms:
+                continue
+            planned.append(name)
+            spent_ms += cost_ms
+
+        for name in planned:
+            self.detectors[name]['last_run'] = self.frame_index
+        return planned
+
+    def record(self, name, seconds):
+        """Feed back the measured run time of a detector"""
+        det = self.detectors[name]
+        det['cost_ms'] += self.smoothing * (seconds * 1000 - det['cost_ms'])
+
+    def end_frame(self, seconds):
+        """Feed back the total detection time spent on the frame"""
+        self.frame_ms += self.smoothing * (seconds * 1000 - self.frame_ms)
+
+    def summary(self):
+        """One-line human readable view of the enabled detectors for the status bar"""
+        parts = [f"{name} 1/{self.detectors[name]['interval']} {self.detectors[name]['cost_ms']:.0f}ms"
+                 for name in self.active]
+        parts.append(f"{self.frame_ms:.0f}/{self.target_ms:.0f} ms")
+        return " | ".join(parts)
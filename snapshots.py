@@ -0,0 +1,96 @@
+"""
+VisionAI snapshots
+Single, burst and interval snapshots encoded and written off the frame loop
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import cv2
+
+from pipeline import FrameQueue, DROP_NEWEST
+
+
+class SnapshotService(threading.Thread):
+    """Saves frames offered by the inference worker as JPEG files.
+
+    request() only records a job (count frames, at least interval seconds
+    apart, annotated or raw). The worker calls offer() once per processed
+    frame; a frame a job is waiting for is queued by reference and encoded
+    and written on this thread, so nothing is copied or encoded on the frame
+    loop unless a raw snapshot is pending (wants(raw=True)).
+    """
+
+    def __init__(self, directory="screenshots", jpeg_quality=95, max_pending=32):
+        super().__init__(name="VisionAI-Snapshots", daemon=True)
+        self.directory = directory
+        self.jpeg_quality = jpeg_quality
+        self.queue = FrameQueue(maxsize=max_pending, policy=DROP_NEWEST)
+        self.jobs = []
+        self.saved = 0
+        self.last_saved = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    @property
+    def dropped(self):
+        return self.queue.dropped
+
+    @property
+    def pending(self):
+        return sum(job['remaining'] for job in self.jobs)
+
+    def request(self, count=1, interval=0.0, raw=False):
+        """Queue a snapshot job: one shot, a burst (interval 0) or a timed series"""
+        # Millisecond stamp so quick successive shots don't overwrite each other
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        prefix = f"shot_{stamp}" + ("_raw" if raw else "")
+        with self._lock:
+            self.jobs.append({'prefix': prefix, 'count': count, 'remaining': count, 'interval': interval,
+                              'raw': raw, 'next_due': 0.0, 'last_frame': None})
+
+    def cancel(self):
+        with self._lock:
+            self.jobs = []
+
+    def wants(self, raw=False):
+        jobs = self.jobs
+        return any(job['raw'] == raw for job in jobs)
+
+    def offer(self, frame, frame_id, raw=False, now=None):
+        """Hand a frame to any job waiting for one; the frame must not be modified afterwards"""
+        if not self.jobs:
+            return
+        now = now or time.time()
+        with self._lock:
+            for job in self.jobs:
+                if job['raw'] != raw or now < job['next_due'] or frame_id == job['last_frame']:
+                    continue
+                index = job['count'] - job['remaining']
+                name = job['prefix'] if job['count'] == 1 else f"{job['prefix']}_{index:03d}"
+                self.queue.put((os.path.join(self.directory, f"{name}.jpg"), frame))
+                job['remaining'] -= 1
+                job['next_due'] = now + job['interval']
+                job['last_frame'] = frame_id
+            self.jobs = [job for job in self.jobs if job['remaining'] > 0]
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not (self._stop_event.is_set() and not len(self.queue)):
+            item = self.queue.get(timeout=0.1)
+            if item is None:
+                continue
+            filename, frame = item
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                if not cv2.imwrite(filename, frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]):
+                    raise RuntimeError(f"Cannot write {filename}")
+                self.saved += 1
+                self.last_saved = filename
+            except Exception as e:
+                self.last_error = e
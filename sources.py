@@ -0,0 +1,217 @@
+"""
+VisionAI capture sources
+Camera devices, network streams (RTSP/HTTP/MJPEG) and video files behind one
+reader with low-latency buffering, timeouts and automatic reconnect
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import cv2
+
+DEVICE = 'device'
+NETWORK = 'network'
+FILE = 'file'
+
+NETWORK_SCHEMES = ('rtsp', 'rtsps', 'rtmp', 'http', 'https', 'udp', 'tcp')
+
+# FFmpeg demuxer/decoder options: no input buffering, low-delay decoding, RTSP over TCP
+# (no smeared frames from lost UDP packets). Only applied when the user set none.
+LOW_LATENCY_FFMPEG = "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|max_delay;0"
+
+
+def parse_source(text):
+    """Device index for digit strings, otherwise a path or URL"""
+    return int(text) if str(text).isdigit() else text
+
+
+def source_kind(source):
+    if isinstance(source, int):
+        return DEVICE
+    scheme = urlsplit(source).scheme.lower()
+    return NETWORK if scheme in NETWORK_SCHEMES else FILE
+
+
+def source_label(source):
+    """Short name for logs and the UI, without URL credentials"""
+    if isinstance(source, int):
+        return f"cam{source}"
+    if source_kind(source) == FILE:
+        return os.path.basename(source)
+    parts = urlsplit(source)
+    host = parts.hostname or ''
+    if parts.port:
+        host += f":{parts.port}"
+    return urlunsplit((parts.scheme, host, parts.path, '', ''))
+
+
+class CaptureSource:
+    """cv2.VideoCapture replacement that always hands out the newest frame.
+
+    read() keeps the (ret, frame) contract of VideoCapture so CaptureThread
+    can use either; the frame's timestamp is left in `last_timestamp`
+    (arrival time for devices and streams, media time mapped to wall clock
+    for files). Network frames that were already buffered when read() ran
+    are grabbed and skipped without conversion, so a slow consumer never
+    works through a decoder backlog. Files play at their own frame rate and
+    loop, like a camera.
+
+    A grab counts as buffered when it returns in less than backlog_fraction
+    of the source's frame interval (frame_interval seconds, else 1 / the
+    stream's reported FPS, else 1/25): a frame that was already waiting only
+    costs its decode, a live one waits for the network. Raise the fraction
+    for sources whose decode takes more than half a frame interval.
+
+    Failures never raise: when a source fails to open, stops delivering for
+    read_timeout seconds or ends, it is released and reopened with
+    exponential backoff (backoff_min .. backoff_max seconds). Meanwhile read()
+    returns (False, None) after waiting at most 0.1 s, so the caller stays
+    responsive to stop requests.
+    """
+
+    def __init__(self, source, open_timeout=10.0, read_timeout=5.0, backoff_min=0.5, backoff_max=30.0,
+                 max_skip=30, backlog_fraction=0.5, frame_interval=None, loop=True):
+        self.source = source
+        self.kind = source_kind(source)
+        self.label = source_label(source)
+        self.open_timeout = open_timeout
+        self.read_timeout = read_timeout
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.max_skip = max_skip
+        self.backlog_fraction = backlog_fraction
+        self.frame_interval = frame_interval
+        self.loop = loop
+
+        self.cap = None
+        self.state = 'closed'
+        self.last_timestamp = None
+        self.last_frame_time = 0.0
+        self.reconnects = 0
+        self.skipped = 0
+        self.last_error = None
+        self._interval = frame_interval or 1 / 25
+        self._backoff = backoff_min
+        self._next_attempt = 0.0
+        self._file_start = None
+        self._closed = threading.Event()
+
+    def open(self):
+        """Try to open the source once; on failure the next read() retries after a backoff"""
+        self.state = 'connecting'
+        if self.kind == NETWORK:
+            os.environ.setdefault('OPENCV_FFMPEG_CAPTURE_OPTIONS', LOW_LATENCY_FFMPEG)
+            cap = cv2.VideoCapture(self.source, cv2.CAP_FFMPEG,
+                                   [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(self.open_timeout * 1000),
+                                    cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(self.read_timeout * 1000)])
+        else:
+            cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            cap.release()
+            self.fail("cannot open")
+            return False
+
+        # Devices and most streams honour this; the grab-ahead in read() covers the rest
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        self._interval = self.frame_interval or (1 / fps if 1 <= fps <= 120 else 1 / 25)
+        self.cap = cap
+        self.state = 'live'
+        self.last_frame_time = time.time()
+        self._file_start = None
+        return True
+
+    def isOpened(self):
+        return self.cap is not None
+
+    def fail(self, reason):
+        """Drop the capture and schedule a reconnect"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.last_error = reason
+        self._next_attempt = time.time() + self._backoff
+        self.state = f"reconnecting in {self._backoff:.1f}s ({reason})"
+        print(f"[SOURCE] {self.label}: {reason}, retrying in {self._backoff:.1f}s")
+        self._backoff = min(self._backoff * 2, self.backoff_max)
+
+    def read(self):
+        if self._closed.is_set():
+            return False, None
+        if self.cap is None:
+            wait = self._next_attempt - time.time()
+            if wait > 0:
+                self._closed.wait(min(wait, 0.1))
+                return False, None
+            self.reconnects += 1
+            if not self.open():
+                return False, None
+            print(f"[SOURCE] {self.label}: reconnected")
+
+        if self.kind == NETWORK:
+            ret = self.grab_newest()
+            frame = self.cap.retrieve()[1] if ret else None
+        else:
+            ret, frame = self.cap.read()
+
+        now = time.time()
+        if not ret or frame is None:
+            if self.kind == FILE:
+                if self.loop and self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0):
+                    self._file_start = None
+                    return False, None
+                self.fail("end of file")
+            elif now - self.last_frame_time > self.read_timeout:
+                self.fail(f"no frame for {self.read_timeout:.0f}s")
+            return False, None
+
+        self.last_frame_time = now
+        self._backoff = self.backoff_min
+        self.state = 'live'
+        self.last_timestamp = self.pace_file(now) if self.kind == FILE else now
+        return True, frame
+
+    def grab_newest(self):
+        """Grab until a grab has to wait for the network, i.e. up to the newest frame"""
+        threshold = self.backlog_fraction * self._interval
+        start_time = time.perf_counter()
+        if not self.cap.grab():
+            return False
+        # A grab well under a frame interval came from the buffer: there may be a newer frame behind it
+        skipped = 0
+        while time.perf_counter() - start_time < threshold and skipped < self.max_skip:
+            start_time = time.perf_counter()
+            if not self.cap.grab():
+                break
+            skipped += 1
+        self.skipped += skipped
+        return True
+
+    def pace_file(self, now):
+        """Hold file frames until their media time so playback runs at the recorded rate"""
+        media_time = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if self._file_start is None:
+            self._file_start = now - media_time
+        timestamp = self._file_start + media_time
+        if timestamp > now:
+            self._closed.wait(timestamp - now)
+        return timestamp
+
+    def get(self, prop):
+        return self.cap.get(prop) if self.cap is not None else 0.0
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value) if self.cap is not None else False
+
+    def close(self):
+        """Make read() return at once from now on; the reading thread still releases the capture"""
+        self._closed.set()
+
+    def release(self):
+        self._closed.set()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        self.state = 'closed'
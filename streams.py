@@ -0,0 +1,259 @@
+"""
+VisionAI multi-camera streams
+Several sources at once, one shared model, batched detection and a grid view
+"""
+
+import math
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from buffers import BufferPool
+from faces import FaceFinder
+from metrics import MetricsRegistry
+from pipeline import FrameQueue, CaptureThread, ErrorLog, DROP_OLDEST
+from sources import CaptureSource, NETWORK
+from tracker import Tracker, TRACKING_DISTANCES
+
+
+class CameraStream:
+    """One camera of a multi-camera session.
+
+    Owns its capture thread and newest-frame queue, its object and face
+    trackers and its own (small) metrics registry for the per-stream rates.
+    Detection results are kept in source coordinates.
+    """
+
+    def __init__(self, index, source):
+        self.index = index
+        self.source = source
+        self.name = f"cam{index}"
+        self.cap = None
+        self.capture = None
+        self.queue = FrameQueue(maxsize=1, policy=DROP_OLDEST)
+        self.metrics = MetricsRegistry()
+        self.pool = BufferPool()
+        self.face_finder = FaceFinder(self.pool)
+        self.object_tracker = Tracker(gates=TRACKING_DISTANCES, default_gate=80, max_age=1.0,
+                                      min_avg_confidence=0.4, new_track_confidence=0.6, max_tracks=30)
+        self.face_tracker = Tracker(default_gate=80, max_age=1.5)
+        self.objects = []  # (x1, y1, x2, y2, label, conf, obj_id)
+        self.faces = []    # (x, y, w, h, face_id)
+        self.latest = None
+        self.last_detect = 0.0
+
+    def open(self):
+        """Start capturing; network sources keep retrying in the background even if this fails"""
+        self.cap = CaptureSource(self.source)
+        opened = self.cap.open()
+        if not opened and self.cap.kind != NETWORK:
+            self.cap = None
+            return False
+        self.capture = CaptureThread(self.cap, self.queue, metrics=self.metrics)
+        self.capture.name = f"VisionAI-Capture-{self.name}"
+        self.capture.start()
+        return opened
+
+    def close(self):
+        if self.capture is not None:
+            # The capture thread releases the source once its current read returns
+            self.capture.stop()
+            self.capture.join(timeout=1.0)
+            self.capture = None
+        self.cap = None
+
+    def predict(self, now):
+        """Move the cached boxes to where their tracks are now"""
+        self.object_tracker.predict(now)
+        self.face_tracker.predict(now)
+        self.objects = [self.object_tracker.move_box(obj_id, x1, y1, x2, y2) + (label, conf, obj_id)
+                        for x1, y1, x2, y2, label, conf, obj_id in self.objects]
+        faces = []
+        for x, y, w, h, face_id in self.faces:
+            x, y, _, _ = self.face_tracker.move_box(face_id, x, y, x + w, y + h)
+            faces.append((x, y, w, h, face_id))
+        self.faces = faces
+
+    def fps(self):
+        """(captured, detected) frames per second"""
+        return self.metrics.rate('captured'), self.metrics.rate('detected')
+
+
+class StreamManager(threading.Thread):
+    """Runs detection for all open streams and publishes a grid of them.
+
+    Each pass takes the newest frame of every stream that has one. Streams
+    due for detection (at most every detect_interval seconds each) go to the
+    app's model in a single batched call, so one model instance serves every
+    camera; the other streams only advance their tracks. The annotated
+    tiles are composed into one grid frame and pushed to out_queue as
+    (grid_id, capture_time, grid, processing_seconds), like the single-camera
+    inference worker, and failed passes are counted in `errors` the same way.
+    """
+
+    def __init__(self, app, sources, out_queue, grid_size=(1280, 720), detect_interval=0.0,
+                 poll_interval=0.005, on_grid=None):
+        super().__init__(name="VisionAI-Streams", daemon=True)
+        self.app = app
+        self.streams = [CameraStream(index, source) for index, source in enumerate(sources)]
+        self.out_queue = out_queue
+        self.grid_size = grid_size
+        self.detect_interval = detect_interval
+        self.poll_interval = poll_interval
+        self.on_grid = on_grid
+        self.grids = 0
+        self.errors = ErrorLog("Multi-camera processing")
+        self._stop_event = threading.Event()
+
+    def open(self):
+        """Open every source; returns the ones that failed"""
+        failed = [stream.source for stream in self.streams if not stream.open()]
+        for stream in self.streams:
+            self.app.metrics.gauge(f"{stream.name}_fps", lambda s=stream: round(s.fps()[0], 2))
+        return failed
+
+    def run(self):
+        while not self._stop_event.is_set():
+            fresh = []
+            for stream in self.streams:
+                item = stream.queue.get_latest()
+                if item is not None:
+                    stream.latest = item
+                    fresh.append(stream)
+            if not fresh:
+                time.sleep(self.poll_interval)
+                continue
+
+            start_time = time.time()
+            try:
+                self.process(fresh, start_time)
+                grid = self.compose()
+            except Exception as e:
+                # One bad pass must not stop every camera
+                self.errors.report(e)
+                continue
+            self.grids += 1
+            proc_seconds = time.time() - start_time
+            self.app.metrics.observe('process', proc_seconds)
+            self.app.metrics.mark('processed')
+            captured_at = min(stream.latest[1] for stream in fresh)
+            if self.on_grid is not None:
+                self.on_grid(grid, self.grids)
+            self.out_queue.put((self.grids, captured_at, grid, proc_seconds))
+
+    def process(self, fresh, now):
+        app = self.app
+        options = app.options
+        for stream in fresh:
+            if not options['objects']:
+                stream.objects = []
+            if not options['faces'] and stream.faces:
+                stream.faces = []
+                stream.face_tracker.reset()
+            stream.predict(stream.latest[1])
+
+        due = [stream for stream in fresh if now - stream.last_detect >= self.detect_interval]
+        if options['objects'] and app.models['objects'].ready and due:
+            start_time = time.time()
+            batch = app.detect_object_batch([stream.latest[2] for stream in due])
+            app.metrics.observe('objects', time.time() - start_time)
+            for stream, detections in zip(due, batch):
+                self.update_objects(stream, detections)
+        if options['faces'] and app.models['faces'].ready:
+            for stream in due:
+                start_time = time.time()
+                faces = stream.face_finder.find(app.face_cascade, stream.latest[2],
+                                                [face[:4] for face in stream.faces])
+                app.metrics.observe('faces', time.time() - start_time)
+                self.update_faces(stream, faces)
+        for stream in due:
+            stream.last_detect = now
+            stream.metrics.mark('detected')
+
+    def update_objects(self, stream, detections):
+        app = self.app
+        now = stream.latest[1]
+        names = app.yolo.names
+        centers = [((x1 + x2) // 2, (y1 + y2) // 2) for x1, y1, x2, y2, _, _ in detections]
+        classes = [names[cls] for _, _, _, _, cls, _ in detections]
+        ids = stream.object_tracker.update(centers, classes, [conf for *_, conf in detections], now)
+        app.stats['objects'] += len(stream.object_tracker.new_ids)
+        stream.objects = []
+        for (x1, y1, x2, y2, _, conf), obj_class, obj_id in zip(detections, classes, ids):
+            if obj_id is None:
+                continue
+            stream.objects.append((x1, y1, x2, y2, f"{obj_class}_{obj_id}: {conf:.2f}", conf, obj_id))
+            if obj_id in stream.object_tracker.new_ids:
+                app.log_detection('Object', f"{stream.name}: {obj_class}_{obj_id} (conf: {conf:.2f})",
+                                  source=stream.name)
+        stream.object_tracker.cleanup(now)
+
+    def update_faces(self, stream, faces):
+        app = self.app
+        now = stream.latest[1]
+        centers = [(x + w // 2, y + h // 2) for (x, y, w, h) in faces]
+        ids = stream.face_tracker.update(centers, ['face'] * len(centers), [1.0] * len(centers), now)
+        app.stats['faces'] += len(stream.face_tracker.new_ids)
+        stream.faces = [(x, y, w, h, face_id) for (x, y, w, h), face_id in zip(faces, ids)]
+        for face_id in stream.face_tracker.new_ids:
+            app.log_detection('Face', f"{stream.name}: Face_{face_id} detected", source=stream.name)
+        stream.face_tracker.cleanup(now)
+
+    def layout(self):
+        count = len(self.streams)
+        cols = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / cols)
+        return cols, rows, self.grid_size[0] // cols, self.grid_size[1] // rows
+
+    def compose(self):
+        """Grid of annotated tiles; boxes are drawn at tile resolution, not on the source frames"""
+        cols, rows, tile_w, tile_h = self.layout()
+        # A new array per grid: the display, recorder and snapshots may still hold the previous one
+        grid = np.zeros((rows * tile_h, cols * tile_w, 3), dtype=np.uint8)
+        for position, stream in enumerate(self.streams):
+            x0, y0 = (position % cols) * tile_w, (position // cols) * tile_h
+            self.draw_tile(grid[y0:y0 + tile_h, x0:x0 + tile_w], stream)
+        return grid
+
+    def draw_tile(self, tile, stream):
+        tile_h, tile_w = tile.shape[:2]
+        if stream.latest is None:
+            cv2.putText(tile, f"{stream.name}: no signal", (10, tile_h // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.7, (0, 0, 255), 2)
+            return
+        frame = stream.latest[2]
+        frame_h, frame_w = frame.shape[:2]
+        scale = min(tile_w / frame_w, tile_h / frame_h)
+        new_w, new_h = int(frame_w * scale), int(frame_h * scale)
+        off_x, off_y = (tile_w - new_w) // 2, (tile_h - new_h) // 2
+        view = tile[off_y:off_y + new_h, off_x:off_x + new_w]
+        cv2.resize(frame, (new_w, new_h), dst=view, interpolation=cv2.INTER_AREA)
+
+        options = self.app.options
+        faces = [(int(x * scale), int(y * scale), int(w * scale), int(h * scale), face_id)
+                 for x, y, w, h, face_id in stream.faces]
+        if options['privacy']:
+            # The grid is both preview and output, so faces are always redacted
+            self.app.anonymizer.apply(view, [face[:4] for face in faces], options['privacy_method'])
+        else:
+            for x, y, w, h, face_id in faces:
+                cv2.rectangle(view, (x, y), (x + w, y + h), (255, 0, 0), 2)
+        for x1, y1, x2, y2, label, conf, _ in stream.objects:
+            x1, y1, x2, y2 = int(x1 * scale), int(y1 * scale), int(x2 * scale), int(y2 * scale)
+            cv2.rectangle(view, (x1, y1), (x2, y2), (0, int(conf * 255), 0), 2 if conf > 0.7 else 1)
+            cv2.putText(view, label, (x1 + 2, y1 - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+
+        captured, detected = stream.fps()
+        header = f"{stream.name}  {captured:.1f} fps  det {detected:.1f}"
+        if stream.cap is not None and stream.cap.state != 'live':
+            header += "  (reconnecting)"
+        cv2.putText(tile, header, (8, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 255, 255), 1)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def close(self):
+        for stream in self.streams:
+            stream.close()
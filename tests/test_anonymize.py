@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from anonymize import Anonymizer, METHODS
+
+
+def gradient_frame():
+    y, x = np.mgrid[0:120, 0:160]
+    frame = np.dstack([(x * 1.5) % 256, (y * 2) % 256, (x + y) % 256]).astype(np.uint8)
+    return frame
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_only_the_padded_region_changes(method):
+    anonymizer = Anonymizer(method=method, margin=0.1)
+    frame = gradient_frame()
+    original = frame.copy()
+    result = anonymizer.apply(frame, [(40, 30, 50, 40)])
+
+    assert result is frame  # In place
+    changed = np.any(frame != original, axis=2)
+    ys, xs = np.nonzero(changed)
+    # Box (40, 30, 50, 40) padded by 10% of its size: x 35..95, y 26..74
+    assert xs.min() >= 35 and xs.max() < 95
+    assert ys.min() >= 26 and ys.max() < 74
+    assert changed[30:70, 40:90].mean() > 0.5
+
+
+def test_mask_fills_with_colour():
+    anonymizer = Anonymizer(method='mask', color=(1, 2, 3), margin=0.0)
+    frame = gradient_frame()
+    anonymizer.apply(frame, [(10, 10, 20, 20)])
+    assert (frame[10:30, 10:30] == (1, 2, 3)).all()
+
+
+def test_pixelate_produces_blocks():
+    anonymizer = Anonymizer(method='pixelate', blocks=4, margin=0.0)
+    frame = gradient_frame()
+    anonymizer.apply(frame, [(0, 0, 80, 80)])
+    region = frame[:80, :80].reshape(-1, 3)
+    assert len(np.unique(region, axis=0)) <= 16
+
+
+def test_overlapping_boxes_are_merged_and_clipped():
+    anonymizer = Anonymizer(margin=0.0)
+    regions = anonymizer.regions([(0, 0, 50, 50), (40, 40, 50, 50), (150, 100, 40, 40)], (120, 160, 3))
+    assert (150, 100, 10, 20) in regions
+    assert len(regions) == 2
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        Anonymizer(method='swirl')
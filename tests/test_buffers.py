@@ -0,0 +1,40 @@
+import numpy as np
+
+from buffers import BufferPool, Letterbox, LETTERBOX_PAD
+
+
+def test_letterbox_reuses_one_canvas():
+    letterbox = Letterbox(BufferPool(), size=64)
+    frame = np.full((48, 32, 3), 200, dtype=np.uint8)
+    canvas, scale, pad_x, pad_y = letterbox(frame)
+    again, _, _, _ = letterbox(np.full((48, 32, 3), 10, dtype=np.uint8))
+    assert again is canvas
+    assert canvas.shape == (64, 64, 3)
+    assert (scale, pad_x, pad_y) == (64 / 48, (64 - 43) // 2, 0)
+
+
+def test_letterbox_places_image_between_padding():
+    letterbox = Letterbox(BufferPool(), size=64)
+    canvas, scale, pad_x, pad_y = letterbox(np.full((32, 64, 3), 200, dtype=np.uint8))
+    assert (scale, pad_x, pad_y) == (1.0, 0, 16)
+    assert (canvas[pad_y:pad_y + 32] == 200).all()
+    assert (canvas[:pad_y] == LETTERBOX_PAD).all()
+    assert (canvas[pad_y + 32:] == LETTERBOX_PAD).all()
+
+
+def test_letterbox_repaints_borders_when_geometry_changes():
+    letterbox = Letterbox(BufferPool(), size=64)
+    letterbox(np.full((32, 64, 3), 200, dtype=np.uint8))
+    canvas, _, pad_x, _ = letterbox(np.full((64, 32, 3), 100, dtype=np.uint8))
+    assert (canvas[:, :pad_x] == LETTERBOX_PAD).all()
+    assert (canvas[:, pad_x:pad_x + 32] == 100).all()
+
+
+def test_pool_allocates_once_per_tag_and_shape():
+    pool = BufferPool()
+    first = pool.get('gray', (48, 64))
+    assert pool.get('gray', (48, 64)) is first
+    pool.get('gray', (48, 64), np.float32)
+    pool.get('display', (48, 64))
+    assert pool.allocations == 3
+    assert pool.nbytes() == 48 * 64 * (1 + 4 + 1)
@@ -0,0 +1,54 @@
+import cv2
+import numpy as np
+import pytest
+
+from clips import ClipRecorder, IDLE, RECORDING
+
+
+def frame(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def count_frames(path):
+    cap = cv2.VideoCapture(path)
+    frames = 0
+    while cap.grab():
+        frames += 1
+    cap.release()
+    return frames
+
+
+def test_ring_keeps_only_the_pre_roll(tmp_path):
+    clips = ClipRecorder(directory=str(tmp_path), pre_roll=1.0)
+    for i in range(40):
+        clips.process(i * 0.1, frame(i))
+    assert clips.state == IDLE
+    assert len(clips.ring) == 11  # 2.9 .. 3.9 s
+    assert clips.ring[0][0] == pytest.approx(2.9)
+    assert isinstance(clips.ring[0][1], bytes)
+    assert not list(tmp_path.iterdir())
+
+
+def test_ring_is_capped_in_bytes(tmp_path):
+    clips = ClipRecorder(directory=str(tmp_path), pre_roll=100.0, max_bytes=1)
+    for i in range(5):
+        clips.process(i * 0.1, frame(i))
+    assert len(clips.ring) <= 1
+
+
+def test_clip_starts_with_the_pre_roll_and_closes_after_post_roll(tmp_path):
+    clips = ClipRecorder(directory=str(tmp_path), pre_roll=1.0, post_roll=0.5)
+    timestamp = 1000.0
+    for i in range(20):
+        clips.process(timestamp + i * 0.1, frame(i))
+    clips.trigger('motion', now=timestamp + 2.0)
+    for i in range(20, 40):
+        clips.process(timestamp + i * 0.1, frame(i))
+        if i == 20:
+            assert clips.state == RECORDING
+    assert clips.state == IDLE
+
+    assert len(clips.clips) == 1
+    assert "_motion.avi" in clips.clips[0]
+    # 11 pre-roll frames, then live frames until 0.5 s after the trigger (2.0 .. 2.6 s)
+    assert count_frames(clips.clips[0]) == 11 + 7
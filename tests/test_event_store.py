@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from event_store import EventStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(os.path.join(tmp_path, "events.db"), flush_interval=0.05)
+    yield store
+    store.close()
+
+
+def test_count_includes_pending_events(store):
+    for i in range(10):
+        store.append('Face' if i % 2 else 'Object', f"event {i}", ts=1000.0 + i)
+    assert store.count() == 10
+    assert store.count('Face') == 5
+
+
+def test_iter_events_in_time_order_with_filters(store):
+    for ts in (3.0, 1.0, 2.0, 4.0):
+        store.append('Object', f"at {ts}", source='cam1', ts=ts)
+    store.append('Face', "face", ts=2.5)
+
+    rows = list(store.iter_events(chunk_size=2))
+    assert [row[0] for row in rows] == [1.0, 2.0, 2.5, 3.0, 4.0]
+    assert rows[0] == (1.0, 'cam1', 'Object', "at 1.0")
+    assert [row[0] for row in store.iter_events(start=2.0, end=4.0, detection_type='Object')] == [2.0, 3.0]
+
+
+def test_clear_removes_committed_and_pending_events(store):
+    for i in range(5):
+        store.append('Object', str(i), ts=float(i + 1))
+    store.flush()
+    store.append('Object', "pending", ts=10.0)
+    store.clear()
+    assert store.count() == 0
+    store.append('Face', "after clear", ts=20.0)
+    assert store.count() == 1
+
+
+def test_events_persist_across_stores(tmp_path):
+    path = os.path.join(tmp_path, "events.db")
+    first = EventStore(path)
+    first.append('Motion', "started", ts=5.0)
+    first.close()
+    second = EventStore(path)
+    try:
+        assert second.recent() == [(5.0, 'cam0', 'Motion', "started")]
+    finally:
+        second.close()
@@ -0,0 +1,47 @@
+import numpy as np
+
+from buffers import BufferPool
+from faces import FaceFinder
+
+
+class RecordingCascade:
+    """Stands in for a Haar cascade: records the images it is given, finds nothing"""
+
+    def __init__(self):
+        self.images = []
+
+    def detectMultiScale(self, image, *args, **kwargs):
+        self.images.append(image.shape)
+        return []
+
+
+def test_track_search_only_converts_the_windows():
+    finder = FaceFinder(BufferPool(), detect_width=640, full_scan_interval=10)
+    cascade = RecordingCascade()
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    finder.find(cascade, frame, tracked=[(600, 300, 80, 80)])
+
+    assert len(cascade.images) == 1
+    height, width = cascade.images[0]
+    assert width < 200 and height < 200  # A window around the face, in grayscale
+    assert finder.pool.allocations == 0  # No full-frame grayscale buffer
+
+
+def test_full_scan_every_interval_on_the_downscaled_frame():
+    finder = FaceFinder(BufferPool(), detect_width=640, full_scan_interval=2)
+    cascade = RecordingCascade()
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+    tracked = [(600, 300, 80, 80)]
+    for _ in range(3):
+        finder.find(cascade, frame, tracked=tracked)
+    assert cascade.images[-1] == (360, 640)
+
+    finder.force_full_scan()
+    finder.find(cascade, frame, tracked=tracked)
+    assert cascade.images[-1] == (360, 640)
+
+
+def test_dedupe_keeps_the_larger_box():
+    finder = FaceFinder(BufferPool())
+    assert finder.dedupe([(110, 110, 20, 20), (100, 100, 60, 60), (300, 300, 40, 40)]) == \
+        [(100, 100, 60, 60), (300, 300, 40, 40)]
@@ -0,0 +1,55 @@
+import types
+
+import numpy as np
+
+from landmarks import PersonLandmarks, classify_gesture
+
+
+def hand(fingers=(False, False, False, False), thumb=False):
+    """21 hand landmarks, wrist at the origin, fingers pointing up"""
+    points = [(0, -10)] * 21
+    points[0] = (0, 0)
+    for extended, (tip, pip) in zip(fingers, ((8, 6), (12, 10), (16, 14), (20, 18))):
+        points[pip] = (0, -10)
+        points[tip] = (0, -20) if extended else (0, -5)
+    points[17] = (10, -10)
+    points[3] = (-5, -10)
+    points[4] = (-15, -10) if thumb else (5, -10)
+    return points
+
+
+def test_classify_gesture():
+    assert classify_gesture(hand()) == "Fist"
+    assert classify_gesture(hand((True, False, False, False))) == "Point"
+    assert classify_gesture(hand((True, True, False, False))) == "Peace"
+    assert classify_gesture(hand(thumb=True)) == "Thumb"
+    assert classify_gesture(hand((True, True, True, True), thumb=True)) == "Open palm"
+    assert classify_gesture(hand((True, True, True, False))) == "3 fingers"
+
+
+class NoPose:
+    def process(self, rgb):
+        return types.SimpleNamespace(pose_landmarks=None)
+
+
+def test_stalest_person_is_analysed_first():
+    landmarks = PersonLandmarks()
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    people = [((10, 10, 110, 210), 1), ((150, 10, 250, 210), 2)]
+    landmarks.update_pose(NoPose(), frame, people, 1.0)
+    landmarks.update_pose(NoPose(), frame, people, 1.1)
+    assert landmarks.cache[1]['pose_time'] == 1.0
+    assert landmarks.cache[2]['pose_time'] == 1.1
+    assert landmarks.stalest(people, 'pose', 1.2)[2] == 1
+
+
+def test_cache_expires_in_seconds():
+    landmarks = PersonLandmarks(max_age=2.0)
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    landmarks.update_pose(NoPose(), frame, [((10, 10, 110, 210), 1)], 10.0)
+    landmarks.cleanup([], 11.5)
+    assert 1 in landmarks.cache
+    landmarks.cleanup([((10, 10, 110, 210), 1)], 20.0)
+    assert 1 in landmarks.cache  # Still tracked
+    landmarks.cleanup([], 12.5)
+    assert 1 not in landmarks.cache
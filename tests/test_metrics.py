@@ -0,0 +1,76 @@
+import json
+import urllib.request
+
+from metrics import Histogram, Meter, MetricsExporter, MetricsRegistry
+
+
+def registry_with_data():
+    registry = MetricsRegistry()
+    for ms in (3, 8, 15, 40):
+        registry.observe('yolo', ms / 1000)
+    registry.mark('frames', 5)
+    registry.gauge('queue_dropped', lambda: 7)
+    registry.gauge('model', lambda: 'yolov8n')
+    registry.gauge('broken', lambda: 1 / 0)
+    return registry
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(5, 10, 20))
+    for ms in (1, 6, 7, 30):
+        histogram.observe(ms / 1000)
+    summary = histogram.summary()
+    assert summary['buckets'] == {'5': 1, '10': 3, '20': 3, '+Inf': 4}
+    assert summary['count'] == 4
+    assert summary['sum_ms'] == 44.0
+    assert summary['p50_ms'] == 6.5
+
+
+def test_meter_rate_covers_the_window():
+    meter = Meter(window=5.0)
+    for second in range(11):
+        meter.mark(2, now=100.0 + second)
+    # Events at 105..110: the first opens the window, 5 x 2 events in 5 s
+    assert meter.rate(now=110.0) == 2.0
+    assert meter.count == 22
+    assert meter.rate(now=200.0) == 0.0
+
+
+def test_snapshot_and_json():
+    snapshot = json.loads(registry_with_data().to_json())
+    assert snapshot['counters'] == {'frames': 5}
+    assert snapshot['latency']['yolo']['count'] == 4
+    assert snapshot['gauges'] == {'queue_dropped': 7, 'model': 'yolov8n', 'broken': None}
+
+
+def test_text_export_has_numeric_series_only():
+    lines = registry_with_data().to_text().splitlines()
+    assert "visionai_frames_total 5" in lines
+    assert 'visionai_yolo_latency_ms_bucket{le="10"} 2' in lines
+    assert 'visionai_yolo_latency_ms_bucket{le="+Inf"} 4' in lines
+    assert "visionai_yolo_latency_ms_count 4" in lines
+    assert "visionai_queue_dropped 7" in lines
+    assert not any('model' in line or 'broken' in line for line in lines)
+
+
+def test_table_skips_unused_stages():
+    registry = registry_with_data()
+    registry.histogram('faces')
+    rows = registry.table()
+    assert len(rows) == 1 and rows[0].startswith('yolo') and 'n=4' in rows[0]
+
+
+def test_exporter_writes_file_and_serves_http(tmp_path):
+    path = tmp_path / 'out' / 'metrics.json'
+    exporter = MetricsExporter(registry_with_data(), port=0, path=str(path), interval=60.0)
+    exporter.start()
+    try:
+        base = f"http://127.0.0.1:{exporter.port}"
+        with urllib.request.urlopen(base + '/metrics') as response:
+            assert b"visionai_frames_total 5" in response.read()
+        with urllib.request.urlopen(base + '/metrics.json') as response:
+            assert json.loads(response.read())['counters'] == {'frames': 5}
+    finally:
+        exporter.stop()
+    assert json.loads(path.read_text())['latency']['yolo']['count'] == 4
+    assert not (tmp_path / 'out' / 'metrics.json.tmp').exists()
@@ -0,0 +1,66 @@
+import numpy as np
+
+from buffers import BufferPool
+from motion import MotionEngine, expand_region, merge_regions, point_in_regions
+
+
+def test_merge_regions_joins_overlapping_and_close_rects():
+    assert merge_regions([(0, 0, 10, 10), (5, 5, 10, 10)]) == [(0, 0, 15, 15)]
+    assert sorted(merge_regions([(0, 0, 10, 10), (15, 0, 10, 10)])) == [(0, 0, 10, 10), (15, 0, 10, 10)]
+    assert merge_regions([(0, 0, 10, 10), (15, 0, 10, 10)], gap=6) == [(0, 0, 25, 10)]
+
+
+def test_merge_regions_repeats_until_stable():
+    # The middle rect bridges the outer two, which do not touch each other
+    rects = [(0, 0, 10, 10), (40, 0, 10, 10), (8, 0, 34, 10), (100, 100, 5, 5)]
+    assert sorted(merge_regions(rects)) == [(0, 0, 50, 10), (100, 100, 5, 5)]
+
+
+def test_expand_region_pads_and_clamps():
+    assert expand_region((100, 100, 10, 10), (480, 640), margin=10, min_size=50) == (80, 80, 50, 50)
+    assert expand_region((0, 0, 200, 200), (150, 150), margin=10) == (0, 0, 150, 150)
+    assert point_in_regions(90, 90, [(80, 80, 50, 50)])
+    assert not point_in_regions(135, 90, [(80, 80, 50, 50)])
+
+
+def test_events_start_after_start_frames_and_stop_after_quiet_period():
+    engine = MotionEngine(BufferPool(), start_frames=2, stop_seconds=1.0)
+    engine.regions = [(0, 0, 10, 10)]
+    assert engine.update_events(100, 0.0) == []
+    [(kind, event)] = engine.update_events(300, 0.1)
+    assert kind == 'start' and event['start'] == 0.1
+    engine.regions = [(0, 0, 10, 10), (50, 50, 10, 10)]
+    assert engine.update_events(500, 0.2) == []
+
+    engine.regions = []
+    assert engine.update_events(0, 1.0) == []
+    [(kind, event)] = engine.update_events(0, 1.2)
+    assert kind == 'stop'
+    assert event['end'] == 0.2 and event['duration'] == 0.2 - 0.1
+    assert event['peak_area'] == 500 and event['peak_regions'] == 2
+    assert not engine.active
+
+
+def test_single_moving_frame_does_not_start_an_event():
+    engine = MotionEngine(BufferPool(), start_frames=2)
+    engine.regions = [(0, 0, 10, 10)]
+    engine.update_events(100, 0.0)
+    engine.regions = []
+    engine.update_events(0, 0.1)
+    engine.regions = [(0, 0, 10, 10)]
+    assert engine.update_events(100, 0.2) == []
+
+
+def test_apply_finds_a_moving_block_in_full_frame_coordinates():
+    engine = MotionEngine(BufferPool(), width=320, min_area=200)
+    background = np.full((480, 640, 3), 60, dtype=np.uint8)
+    for i in range(30):
+        assert engine.apply(background, i * 0.04) == []
+    events = []
+    for i in range(3):
+        frame = background.copy()
+        frame[200:300, 100 + i * 10:200 + i * 10] = 255
+        events += engine.apply(frame, 1.2 + i * 0.04)
+    assert [kind for kind, _ in events] == ['start']
+    [(x, y, w, h)] = engine.regions
+    assert x <= 120 and x + w >= 220 and y <= 200 and y + h >= 300
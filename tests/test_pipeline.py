@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import FrameQueue, ErrorLog, BLOCK, DROP_NEWEST, DROP_OLDEST
+
+
+def test_drop_oldest_keeps_newest_items():
+    queue = FrameQueue(maxsize=2, policy=DROP_OLDEST)
+    for item in range(5):
+        assert queue.put(item)
+    assert queue.dropped == 3
+    assert queue.get(timeout=0) == 3
+    assert queue.get(timeout=0) == 4
+    assert queue.get(timeout=0) is None
+
+
+def test_drop_newest_rejects_incoming_items():
+    queue = FrameQueue(maxsize=2, policy=DROP_NEWEST)
+    assert queue.put(0) and queue.put(1)
+    assert not queue.put(2)
+    assert queue.dropped == 1
+    assert [queue.get(timeout=0), queue.get(timeout=0)] == [0, 1]
+
+
+def test_block_waits_for_space_and_times_out():
+    queue = FrameQueue(maxsize=1, policy=BLOCK)
+    assert queue.put(0)
+    start_time = time.time()
+    assert not queue.put(1, timeout=0.05)
+    assert time.time() - start_time >= 0.05
+
+    consumer = threading.Timer(0.05, queue.get)
+    consumer.start()
+    assert queue.put(1, timeout=2.0)
+    consumer.join()
+    assert queue.dropped == 0
+    assert queue.get(timeout=0) == 1
+
+
+def test_get_latest_discards_older_items():
+    queue = FrameQueue(maxsize=4, policy=DROP_OLDEST)
+    for item in range(3):
+        queue.put(item)
+    assert queue.get_latest() == 2
+    assert len(queue) == 0
+    assert queue.dropped == 2
+    assert queue.get_latest() is None
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        FrameQueue(policy="drop_random")
+
+
+def test_error_log_counts_every_error_and_prints_once_per_interval(capsys):
+    errors = ErrorLog("Stage", interval=60.0)
+    for _ in range(3):
+        errors.report(RuntimeError("boom"))
+    assert errors.count == 3
+    assert str(errors.last_error) == "boom"
+    assert errors.recent()
+    assert capsys.readouterr().out.count("[ERROR] Stage") == 1
@@ -0,0 +1,88 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from procpool import YoloProcessPool
+
+
+def make_pool(slots=2, imgsz=64):
+    """A pool whose queues and ring are in-process; workers are played by the test"""
+    pool = YoloProcessPool('model.pt', workers=1, imgsz=imgsz, slots=slots)
+    pool.ring = np.zeros((slots, imgsz, imgsz, 3), dtype=np.uint8)
+    for slot in range(slots):
+        pool._free.put(slot)
+    pool.tasks = queue.Queue()
+    pool.results = queue.Queue()
+    pool._collector = threading.Thread(target=pool._collect, daemon=True)
+    pool._collector.start()
+    return pool
+
+
+def stop(pool):
+    pool.results.put(None)
+    pool._collector.join(timeout=2.0)
+
+
+def dead_process():
+    process = mp.get_context('fork').Process(target=time.sleep, args=(0,))
+    process.start()
+    process.join()
+    return process
+
+
+def test_boxes_are_mapped_back_from_the_letterbox():
+    pool = make_pool(imgsz=64)
+    image = np.zeros((32, 128, 3), dtype=np.uint8)  # scale 0.5, padded 24 px top and bottom
+    job = pool.submit([image])
+    task_id, slot = pool.tasks.get(timeout=1.0)
+    canvas = pool.ring[slot]
+    assert canvas.shape == (64, 64, 3)
+
+    # A box found at (10, 28)-(30, 36) on the model input
+    pool.results.put((task_id, np.array([[10, 28, 30, 36, 0.9, 2]], dtype=np.float32), None))
+    boxes = job.result(timeout=2.0)[0]
+    stop(pool)
+    np.testing.assert_allclose(boxes[0, :4], [20, 8, 60, 24])
+    assert boxes[0, 4] == pytest.approx(0.9)
+    assert pool._free.qsize() == 2
+
+
+def test_worker_error_fails_the_job_and_frees_the_slot():
+    pool = make_pool()
+    job = pool.submit([np.zeros((64, 64, 3), dtype=np.uint8)])
+    task_id, _ = pool.tasks.get(timeout=1.0)
+    pool.results.put((task_id, None, "RuntimeError('bad input')"))
+    with pytest.raises(RuntimeError, match="bad input"):
+        job.result(timeout=2.0)
+    stop(pool)
+    assert pool._free.qsize() == 2
+
+
+def test_dead_worker_fails_the_job_at_once():
+    pool = make_pool()
+    pool.processes = [dead_process()]
+    job = pool.submit([np.zeros((64, 64, 3), dtype=np.uint8)] * 2)
+    start_time = time.time()
+    with pytest.raises(RuntimeError, match="died"):
+        job.result(timeout=30.0)
+    assert time.time() - start_time < 1.0
+    stop(pool)
+    assert pool._free.qsize() == 2
+    pool.processes = []
+
+
+def test_timeout_returns_the_slots():
+    pool = make_pool()
+    job = pool.submit([np.zeros((64, 64, 3), dtype=np.uint8)])
+    task_id, _ = pool.tasks.get(timeout=1.0)
+    with pytest.raises(RuntimeError, match="timed out"):
+        job.result(timeout=0.1)
+    assert pool._free.qsize() == 2
+    # A late result for the abandoned task is ignored
+    pool.results.put((task_id, np.zeros((0, 6), dtype=np.float32), None))
+    stop(pool)
+    assert pool._free.qsize() == 2
@@ -0,0 +1,62 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from recorder import Recorder
+
+
+def frame(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def count_frames(path):
+    cap = cv2.VideoCapture(path)
+    frames = 0
+    while cap.grab():
+        frames += 1
+    cap.release()
+    return frames
+
+
+@pytest.fixture
+def filename(tmp_path):
+    if not cv2.VideoWriter(os.path.join(tmp_path, "probe.avi"), cv2.VideoWriter_fourcc(*'MJPG'), 20,
+                           (64, 48)).isOpened():
+        pytest.skip("No MJPG encoder in this OpenCV build")
+    return os.path.join(tmp_path, "video.avi")
+
+
+def test_preroll_is_written_before_live_frames(filename):
+    preroll = [(i * 0.05, cv2.imencode('.jpg', frame(10 * i))[1].tobytes()) for i in range(5)]
+    recorder = Recorder(filename, fourcc='MJPG', probe_frames=5, preroll=preroll)
+    recorder.start()
+    for i in range(5, 15):
+        assert recorder.write(frame(10 * i), timestamp=i * 0.05)
+    recorder.stop()
+    recorder.join(timeout=5.0)
+
+    assert recorder.last_error is None
+    assert recorder.frames_written == 15
+    assert recorder.size == (64, 48)
+    assert recorder.fps == pytest.approx(20.0)
+    assert count_frames(filename) == 15
+
+
+def test_frames_written_after_stop_are_rejected(filename):
+    recorder = Recorder(filename, fourcc='MJPG')
+    recorder.stop()
+    assert not recorder.write(frame(0))
+    recorder.start()
+    recorder.join(timeout=5.0)
+    assert recorder.frames_written == 0
+    assert not os.path.exists(filename)
+
+
+def test_full_queue_drops_new_frames(filename):
+    recorder = Recorder(filename, fourcc='MJPG', queue_size=3)
+    # Not started: nothing drains the queue
+    results = [recorder.write(frame(i), timestamp=float(i)) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert recorder.dropped == 2
@@ -0,0 +1,46 @@
+import pytest
+
+from resources import STAGES, ResourceGovernor, default_split, fit_split, knee, parse_split, thread_counts
+
+
+@pytest.mark.parametrize("budget", range(1, 17))
+def test_default_split_fits_the_budget(budget):
+    split = default_split(budget)
+    assert sum(split.values()) == budget
+    assert split['yolo'] >= 1
+    assert split['ui'] == (1 if budget >= 2 else 0)
+
+
+def test_parse_split_fills_missing_stages():
+    assert parse_split("yolo=4,opencv=2,ui=1") == {'yolo': 4, 'opencv': 2, 'ui': 1}
+    assert parse_split("yolo=2,opencv=0,ui=0") == {'yolo': 2, 'opencv': 0, 'ui': 0}
+    assert set(parse_split("yolo=3")) == set(STAGES)
+
+
+@pytest.mark.parametrize("text", ["gpu=2", "yolo=0", "yolo=two", "opencv=-1"])
+def test_parse_split_rejects_bad_entries(text):
+    with pytest.raises(ValueError):
+        parse_split(text)
+
+
+@pytest.mark.parametrize("budget", range(1, 8))
+def test_fit_split_scales_down_to_the_budget(budget):
+    fitted = fit_split({'yolo': 10, 'opencv': 4, 'ui': 1}, budget)
+    assert sum(fitted.values()) <= budget
+    assert fitted['yolo'] >= 1
+    assert fit_split({'yolo': 1, 'opencv': 1, 'ui': 1}, 8) == {'yolo': 1, 'opencv': 1, 'ui': 1}
+
+
+def test_governor_keeps_split_and_cores_within_budget():
+    governor = ResourceGovernor(budget=2, split={'yolo': 10, 'opencv': 4, 'ui': 1})
+    assert sum(governor.split.values()) <= governor.budget
+    budget_cores = set(governor.cores[:governor.budget])
+    for stage in STAGES:
+        assert governor.core_sets[stage]
+        assert set(governor.core_sets[stage]) <= budget_cores
+
+
+def test_knee_picks_fewest_threads_near_the_best():
+    assert knee({1: 100.0, 2: 55.0, 4: 50.0, 8: 49.0}) == 4
+    assert thread_counts(6) == [1, 2, 4, 6]
+    assert thread_counts(1) == [1]
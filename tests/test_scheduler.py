@@ -0,0 +1,53 @@
+from scheduler import DetectorScheduler
+
+
+def run_frames(scheduler, enabled, frames, costs):
+    plans = []
+    for _ in range(frames):
+        plan = scheduler.plan(enabled)
+        for name in plan:
+            scheduler.record(name, costs[name] / 1000)
+        plans.append(plan)
+    return plans
+
+
+def test_cheap_detectors_run_every_frame():
+    scheduler = DetectorScheduler(target_ms=40.0)
+    scheduler.register('objects', initial_cost_ms=10.0)
+    scheduler.register('faces', initial_cost_ms=5.0)
+    plans = run_frames(scheduler, ['objects', 'faces'], 10, {'objects': 10.0, 'faces': 5.0})
+    assert all(sorted(plan) == ['faces', 'objects'] for plan in plans)
+
+
+def test_expensive_detectors_are_staggered():
+    scheduler = DetectorScheduler(target_ms=40.0, smoothing=1.0)
+    scheduler.register('objects', initial_cost_ms=35.0)
+    scheduler.register('faces', initial_cost_ms=35.0)
+    plans = run_frames(scheduler, ['objects', 'faces'], 20, {'objects': 35.0, 'faces': 35.0})
+    # Each needs two frames of its 20 ms share; never both on one frame
+    assert all(len(plan) <= 1 for plan in plans)
+    assert sum('objects' in plan for plan in plans) == 10
+    assert scheduler.detectors['objects']['interval'] == 2
+
+
+def test_interval_follows_measured_cost_and_is_capped():
+    scheduler = DetectorScheduler(target_ms=40.0, smoothing=1.0, max_interval=5)
+    scheduler.register('objects', initial_cost_ms=10.0)
+    run_frames(scheduler, ['objects'], 3, {'objects': 400.0})
+    assert scheduler.detectors['objects']['interval'] == 5
+
+
+def test_min_interval_is_respected():
+    scheduler = DetectorScheduler(target_ms=40.0)
+    scheduler.register('pose', min_interval=3, initial_cost_ms=1.0)
+    plans = run_frames(scheduler, ['pose'], 9, {'pose': 1.0})
+    assert [bool(plan) for plan in plans] == [True, False, False] * 3
+
+
+def test_summary_lists_only_enabled_detectors():
+    scheduler = DetectorScheduler()
+    scheduler.register('objects')
+    scheduler.register('faces')
+    scheduler.plan(['objects'])
+    assert 'objects' in scheduler.summary()
+    assert 'faces' not in scheduler.summary()
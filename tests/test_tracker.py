@@ -0,0 +1,59 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from tracker import Tracker, _hungarian
+
+
+def brute_force_cost(cost):
+    n, m = cost.shape
+    if n <= m:
+        return min(sum(cost[i, cols[i]] for i in range(n)) for cols in itertools.permutations(range(m), n))
+    return min(sum(cost[rows[j], j] for j in range(m)) for rows in itertools.permutations(range(n), m))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 3), (4, 6), (6, 4), (5, 5)])
+def test_hungarian_matches_brute_force(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(20):
+        cost = rng.uniform(0, 100, size=shape)
+        rows, cols = _hungarian(cost)
+        assert len(rows) == min(shape)
+        assert len(set(rows.tolist())) == len(rows) and len(set(cols.tolist())) == len(cols)
+        assert cost[rows, cols].sum() == pytest.approx(brute_force_cost(cost))
+
+
+def test_prediction_follows_constant_velocity():
+    tracker = Tracker(default_gate=80, max_age=5.0, coast=10.0)
+    # An object moving at (100, -50) px/s, detected every 0.1 s
+    for step in range(20):
+        now = step * 0.1
+        ids = tracker.update([(100 + 100 * now, 300 - 50 * now)], ['car'], [1.0], now)
+    assert ids == [1]
+
+    tracker.predict(2.4)
+    x, y = tracker.position(1)
+    assert x == pytest.approx(100 + 100 * 2.4, abs=2)
+    assert y == pytest.approx(300 - 50 * 2.4, abs=2)
+    assert tracker.move_box(1, 0, 0, 20, 10) == (x - 10, y - 5, x + 10, y + 5)
+
+
+def test_prediction_stops_after_coast_time():
+    tracker = Tracker(default_gate=80, max_age=5.0, coast=0.5)
+    for step in range(10):
+        now = step * 0.1
+        tracker.update([(100 * now, 0)], ['car'], [1.0], now)
+    tracker.predict(0.9 + 0.5)
+    coasted = tracker.position(1)
+    tracker.predict(3.0)
+    assert tracker.position(1) == coasted
+
+
+def test_tracks_expire_after_max_age():
+    tracker = Tracker(max_age=1.0)
+    tracker.update([(10, 10)], ['face'], [1.0], 0.0)
+    tracker.cleanup(0.5)
+    assert 1 in tracker.tracks
+    tracker.cleanup(1.5)
+    assert not tracker.tracks
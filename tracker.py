@@ -0,0 +1,286 @@
+"""
+VisionAI tracker
+Whole-frame detection-to-track association with per-class gating and
+constant-velocity motion prediction
+"""
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Dynamic tracking distance based on object class
+TRACKING_DISTANCES = {
+    'car': 150, 'truck': 150, 'bus': 150, 'motorcycle': 100,
+    'bottle': 50, 'cup': 50, 'bowl': 50, 'wine glass': 50,
+    'laptop': 80, 'mouse': 40, 'keyboard': 80, 'cell phone': 60,
+    'book': 60, 'clock': 60, 'vase': 60
+}
+
+# Cost used for gated-out pairs; large but finite so the solver stays stable
+INVALID_COST = 1e9
+
+
+def _hungarian(cost):
+    """Minimum-cost assignment (rows, cols) for a rectangular cost matrix.
+
+    NumPy port of the classic O(n^2 m) potentials algorithm, used when SciPy
+    is not installed. The inner column scan is vectorized.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.intp)      # p[j]: row (1-based) assigned to column j
+    way = np.zeros(m + 1, dtype=np.intp)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used
+            free[0] = False
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+
+            used_cols = np.flatnonzero(used)
+            u[p[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[free] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(p[1:])
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def solve_assignment(cost):
+    """Optimal (rows, cols) assignment, SciPy when available"""
+    if cost.size == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    if SCIPY_AVAILABLE:
+        return linear_sum_assignment(cost)
+    return _hungarian(cost)
+
+
+def associate(det_xy, det_labels, track_xy, track_labels, det_gates, track_slack=None):
+    """Match a whole frame of detections to tracks in one pass.
+
+    Distances are built as a single (detections x tracks) matrix; pairs with a
+    different label or beyond the detection's gate distance (plus the track's
+    optional slack) are excluded.
+    Returns (matches, unmatched_detections) where matches is a list of
+    (detection_index, track_index).
+    """
+    num_dets, num_tracks = len(det_xy), len(track_xy)
+    if num_dets == 0 or num_tracks == 0:
+        return [], list(range(num_dets))
+
+    det_xy = np.asarray(det_xy, dtype=np.float64).reshape(num_dets, 2)
+    track_xy = np.asarray(track_xy, dtype=np.float64).reshape(num_tracks, 2)
+    dist = np.linalg.norm(det_xy[:, None, :] - track_xy[None, :, :], axis=2)
+
+    valid = np.asarray(det_labels)[:, None] == np.asarray(track_labels)[None, :]
+    gates = np.asarray(det_gates, dtype=np.float64)[:, None]
+    if track_slack is not None:
+        gates = gates + np.asarray(track_slack, dtype=np.float64)[None, :]
+    valid &= dist < gates
+
+    if not valid.any():
+        return [], list(range(num_dets))
+
+    cost = np.where(valid, dist, INVALID_COST)
+    rows, cols = solve_assignment(cost)
+    keep = valid[rows, cols]
+
+    matches = list(zip(rows[keep].tolist(), cols[keep].tolist()))
+    matched = set(rows[keep].tolist())
+    unmatched = [i for i in range(num_dets) if i not in matched]
+    return matches, unmatched
+
+
+class Tracker:
+    """Centroid tracker with optimal whole-frame assignment.
+
+    Each track keeps a constant-velocity Kalman state for its centre (the x
+    and y axes share one 2x2 position/velocity covariance), its label, the
+    time it was last seen and a short confidence history. predict() moves
+    every track to a given time, so boxes follow their objects on frames
+    without detections and new detections are gated against the predicted
+    centre. Times are in seconds; tracks expire after max_age seconds unseen
+    and stop extrapolating after `coast` seconds.
+
+    update() returns one id per detection (None when an unmatched detection is
+    too weak to open a track) and records the ids it created in `new_ids`.
+    """
+
+    def __init__(self, gates=None, default_gate=80, max_age=1.0, min_avg_confidence=0.0,
+                 new_track_confidence=0.0, history=5, max_tracks=None, evict_count=5,
+                 measurement_noise=8.0, acceleration_noise=400.0, initial_speed=300.0, coast=0.5):
+        self.gates = gates or {}
+        self.default_gate = default_gate
+        self.max_age = max_age
+        self.min_avg_confidence = min_avg_confidence
+        self.new_track_confidence = new_track_confidence
+        self.history = history
+        self.max_tracks = max_tracks
+        self.evict_count = evict_count
+        self.measurement_var = measurement_noise ** 2
+        self.acceleration_var = acceleration_noise ** 2
+        self.initial_speed_var = initial_speed ** 2
+        self.coast = coast
+
+        self.tracks = {}
+        self.next_id = 0
+        self.new_ids = set()
+
+    def predict(self, now):
+        """Advance every track's centre to time `now` (constant velocity)"""
+        q = self.acceleration_var
+        for track in self.tracks.values():
+            # No extrapolation past `coast` seconds without a detection
+            until = min(now, track['time_seen'] + self.coast)
+            dt = until - track['time']
+            if dt <= 0:
+                continue
+            track['time'] = until
+            track['x'] += track['vx'] * dt
+            track['y'] += track['vy'] * dt
+            (p00, p01), (p10, p11) = track['cov']
+            p00 += dt * (p01 + p10) + dt * dt * p11 + q * dt ** 3 / 3
+            p01 += dt * p11 + q * dt * dt / 2
+            p10 += dt * p11 + q * dt * dt / 2
+            p11 += q * dt
+            track['cov'] = ((p00, p01), (p10, p11))
+
+    def correct(self, track, x, y):
+        """Kalman measurement update with a detected centre"""
+        (p00, p01), (p10, p11) = track['cov']
+        s = p00 + self.measurement_var
+        k0, k1 = p00 / s, p10 / s
+        dx, dy = x - track['x'], y - track['y']
+        track['x'] += k0 * dx
+        track['y'] += k0 * dy
+        track['vx'] += k1 * dx
+        track['vy'] += k1 * dy
+        track['cov'] = (((1 - k0) * p00, (1 - k0) * p01), (p10 - k1 * p00, p11 - k1 * p01))
+
+    def position(self, track_id):
+        """Current (x, y) estimate of a track's centre, None if it is gone"""
+        track = self.tracks.get(track_id)
+        if track is None:
+            return None
+        return int(round(track['x'])), int(round(track['y']))
+
+    def move_box(self, track_id, x1, y1, x2, y2):
+        """Shift an (x1, y1, x2, y2) box so its centre is the track's current estimate"""
+        position = self.position(track_id)
+        if position is None:
+            return x1, y1, x2, y2
+        dx, dy = position[0] - (x1 + x2) // 2, position[1] - (y1 + y2) // 2
+        return x1 + dx, y1 + dy, x2 + dx, y2 + dy
+
+    def update(self, centers, labels, confidences, now):
+        self.new_ids = set()
+        if not centers:
+            return []
+
+        self.predict(now)
+        track_ids = list(self.tracks)
+        track_xy = [(self.tracks[t]['x'], self.tracks[t]['y']) for t in track_ids]
+        track_labels = [self.tracks[t]['label'] for t in track_ids]
+        det_gates = [self.gates.get(label, self.default_gate) for label in labels]
+        # Uncertain predictions (young or coasting tracks) get a wider gate, at most double
+        slack = [min(2 * self.tracks[t]['cov'][0][0] ** 0.5, self.gates.get(self.tracks[t]['label'], self.default_gate))
+                 for t in track_ids]
+
+        matches, unmatched = associate(centers, labels, track_xy, track_labels, det_gates, slack)
+
+        ids = [None] * len(centers)
+        for det_index, track_index in matches:
+            track_id = track_ids[track_index]
+            track = self.tracks[track_id]
+            self.correct(track, *centers[det_index])
+            track['time'] = track['time_seen'] = now
+            track['conf_history'].append(confidences[det_index])
+            if len(track['conf_history']) > self.history:
+                track['conf_history'].pop(0)
+            ids[det_index] = track_id
+
+        for det_index in unmatched:
+            # Only create new track if confidence is high enough
+            if confidences[det_index] <= self.new_track_confidence:
+                continue
+            self.next_id += 1
+            x, y = centers[det_index]
+            self.tracks[self.next_id] = {
+                'x': float(x), 'y': float(y), 'vx': 0.0, 'vy': 0.0,
+                'cov': ((self.measurement_var, 0.0), (0.0, self.initial_speed_var)),
+                'label': labels[det_index], 'time': now, 'time_seen': now,
+                'conf_history': [confidences[det_index]]
+            }
+            self.new_ids.add(self.next_id)
+            ids[det_index] = self.next_id
+
+        return ids
+
+    def touch(self, track_ids, now):
+        """Mark tracks as seen without new evidence (e.g. outside the inspected region)"""
+        for track_id in track_ids:
+            track = self.tracks.get(track_id)
+            if track is not None:
+                # Outside the moving regions means standing still
+                track['vx'] = track['vy'] = 0.0
+                track['time'] = track['time_seen'] = now
+
+    def cleanup(self, now):
+        """Drop stale or low-confidence tracks and enforce max_tracks"""
+        to_remove = []
+        for track_id, track in self.tracks.items():
+            history = track['conf_history']
+            avg_confidence = sum(history) / len(history) if history else 0
+            if now - track['time_seen'] > self.max_age or avg_confidence < self.min_avg_confidence:
+                to_remove.append(track_id)
+
+        for track_id in to_remove:
+            del self.tracks[track_id]
+
+        # Limit total tracks to prevent memory issues
+        if self.max_tracks is not None and len(self.tracks) > self.max_tracks:
+            # Remove lowest confidence tracks
+            ranked = sorted(self.tracks.items(),
+                            key=lambda item: sum(item[1]['conf_history']) / len(item[1]['conf_history']))
+            for track_id, _ in ranked[:self.evict_count]:
+                del self.tracks[track_id]
+
+    def reset(self):
+        self.tracks.clear()
+        self.new_ids = set()
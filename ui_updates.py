@@ -0,0 +1,100 @@
+"""
+VisionAI UI updates
+Coalesces detection-log rows and stat label changes into fixed-rate Tk batches
+"""
+
+from collections import deque
+
+
+class UIUpdater:
+    """Applies UI changes in one batch per tick (default 5 Hz) on the Tk thread.
+
+    Events from any thread go into a buffer capped at the number of rows the
+    tree shows, so a burst of detections costs at most one tree refresh of
+    max_rows inserts. Labels are only reconfigured when their text actually
+    changes. The tree is left alone while it is not visible and catches up
+    with the buffered rows when it is shown again. Background jobs hand
+    their completion back with post().
+    """
+
+    def __init__(self, root, interval_ms=200, max_rows=50):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_rows = max_rows
+        self.events = deque(maxlen=max_rows)
+        self.tree = None
+        self.tree_visible = None
+        self.on_tick = None
+        self.calls = deque()
+        self._label_text = {}
+        self._running = False
+
+    def start(self, on_tick=None):
+        self.on_tick = on_tick
+        if not self._running:
+            self._running = True
+            self.root.after(self.interval_ms, self.tick)
+
+    def stop(self):
+        self._running = False
+
+    def bind_tree(self, tree, visible_fn=None):
+        self.tree = tree
+        self.tree_visible = visible_fn
+
+    def reset_widgets(self):
+        """Forget destroyed widgets (mode switch rebuilds the interface)"""
+        self.tree = None
+        self.tree_visible = None
+        self._label_text.clear()
+
+    def push_event(self, values):
+        """Queue a (time, type, details) row; safe from any thread"""
+        self.events.append(values)
+
+    def post(self, fn, *args):
+        """Run fn(*args) on the Tk thread at the next tick; safe from any thread"""
+        self.calls.append((fn, args))
+
+    def clear_events(self):
+        self.events.clear()
+        if self.tree is not None:
+            self.tree.delete(*self.tree.get_children())
+
+    def set_label(self, widget, text):
+        """Configure a label only if its text changed since the last tick"""
+        if self._label_text.get(widget) != text:
+            widget.config(text=text)
+            self._label_text[widget] = text
+
+    def tick(self):
+        if not self._running:
+            return
+        try:
+            while self.calls:
+                fn, args = self.calls.popleft()
+                fn(*args)
+            # Nothing to draw for a minimized window
+            if self.root.state() != 'iconic':
+                if self.on_tick is not None:
+                    self.on_tick()
+                self.flush_tree()
+        finally:
+            self.root.after(self.interval_ms, self.tick)
+
+    def flush_tree(self):
+        if self.tree is None or not self.events:
+            return
+        if self.tree_visible is not None and not self.tree_visible():
+            return
+
+        rows = []
+        while self.events:
+            rows.append(self.events.popleft())
+        for values in rows:
+            self.tree.insert('', 0, values=values)
+
+        # Keep only the newest max_rows entries, trimmed in one call
+        items = self.tree.get_children()
+        if len(items) > self.max_rows:
+            self.tree.delete(*items[self.max_rows:])
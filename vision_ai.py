@@ -1,67 +1,283 @@
-import cv2
-import numpy as np
-import os
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from PIL import Image, ImageTk
-from ultralytics import YOLO
-import threading
 import time
-from datetime import datetime
+STARTUP_TIME = time.time()  # Taken before the slow imports below, hence the E402 exemptions
 
-try:
+import cv2  # noqa: E402
+import os  # noqa: E402
+import importlib.util  # noqa: E402
+import tkinter as tk  # noqa: E402
+from tkinter import ttk, filedialog, messagebox  # noqa: E402
+import threading  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+from pipeline import FrameQueue, CaptureThread, InferenceWorker, DROP_OLDEST  # noqa: E402
+from tracker import Tracker, TRACKING_DISTANCES  # noqa: E402
+from buffers import BufferPool, Letterbox  # noqa: E402
+from scheduler import DetectorScheduler  # noqa: E402
+from backends import ModelBackend, BACKENDS  # noqa: E402
+from faces import FaceFinder  # noqa: E402
+from event_store import EventStore  # noqa: E402
+from ui_updates import UIUpdater  # noqa: E402
+from display import DisplayRenderer  # noqa: E402
+from recorder import Recorder  # noqa: E402
+from clips import ClipRecorder  # noqa: E402
+from snapshots import SnapshotService  # noqa: E402
+from metrics import MetricsRegistry, MetricsExporter  # noqa: E402
+from procpool import YoloProcessPool, boxes_array  # noqa: E402
+from landmarks import PersonLandmarks  # noqa: E402
+from streams import StreamManager  # noqa: E402
+from sources import CaptureSource, parse_source, source_label  # noqa: E402
+from resources import ResourceGovernor, parse_split, calibrate as calibrate_cpu  # noqa: E402
+from anonymize import Anonymizer, METHODS as ANONYMIZE_METHODS, TARGETS as ANONYMIZE_TARGETS  # noqa: E402
+from motion import MotionEngine, merge_regions, expand_region, point_in_regions  # noqa: E402
+from loader import LazyModel, StartupTimer, LOADING  # noqa: E402
+
+# Checked without importing: mediapipe & co. are only imported when a feature needs them
+ADVANCED_FEATURES = all(importlib.util.find_spec(name) is not None
+                        for name in ('mediapipe', 'speech_recognition', 'pyttsx3'))
+
+
+def load_hands():
+    import mediapipe as mp
+    # Static mode: consecutive calls get crops of different people
+    return mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=2, min_detection_confidence=0.7)
+
+
+def load_pose():
     import mediapipe as mp
+    return mp.solutions.pose.Pose(static_image_mode=True, model_complexity=0, min_detection_confidence=0.7)
+
+
+def load_voice():
     import speech_recognition as sr
     import pyttsx3
-    ADVANCED_FEATURES = True
-except ImportError:
-    ADVANCED_FEATURES = False
+    return sr.Recognizer(), pyttsx3.init()
+
 
 class VisionAIUnified:
-    def __init__(self):
-        # Core models
-        self.yolo = YOLO('yolov8n.pt')
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        
-        # Advanced features
-        if ADVANCED_FEATURES:
-            self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(min_detection_confidence=0.7)
-            self.mp_pose = mp.solutions.pose
-            self.pose = self.mp_pose.Pose(min_detection_confidence=0.7)
-            self.mp_draw = mp.solutions.drawing_utils
-            self.recognizer = sr.Recognizer()
-            self.tts = pyttsx3.init()
+    # Enhanced YOLO parameters for accuracy
+    YOLO_PARAMS = {
+        'conf': 0.4,            # Lower confidence for more detections
+        'iou': 0.5,             # Higher IoU for better filtering
+        'max_det': 50,          # Limit detections
+        'verbose': False,
+        'agnostic_nms': True    # Better NMS
+    }
+    
+    def __init__(self, headless=False, backend='auto', int8=False, calibration=None,
+                 metrics_port=None, metrics_file=None, yolo_workers=0, cameras=None, resources=None,
+                 clip_classes=None):
+        self.headless = headless
+        self.yolo_workers = yolo_workers  # >0: YOLO runs in that many worker processes
+        self.resources = resources  # ResourceGovernor: thread counts and core sets per stage
+        
+        self.startup = StartupTimer(STARTUP_TIME)
+        
+        # Core models (backend: pytorch, onnx, openvino or auto = fastest installed).
+        # Nothing is loaded here: models load on first use or in a warmup thread.
+        self.model_backend = ModelBackend('yolov8n.pt', backend=backend, int8=int8,
+                                          calibration=calibration or 'models/calibration')
+        self.yolo_model = LazyModel('YOLO', self.load_yolo_pool if yolo_workers else self.load_yolo)
+        self.face_model = LazyModel('Face cascade', lambda: cv2.CascadeClassifier(
+            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'))
+        self.models = {'objects': self.yolo_model, 'faces': self.face_model}
+        
+        # Advanced features (GUI only: voice and landmarks need a live feed)
+        if ADVANCED_FEATURES and not headless:
+            self.models['gesture'] = LazyModel('Hands', load_hands)
+            self.models['pose'] = LazyModel('Pose', load_pose)
+            self.models['voice'] = LazyModel('Voice', load_voice)
+        self.startup_reported = False
+        self.polling_models = False
         
         # Camera state
         self.cap = None
         self.running = False
-        self.recording = False
-        self.out = None
+        self.recorder = None
+        self.finishing = []  # Threads still closing recordings and clips
+        
+        # Event clips: pre-roll ring buffer, recording only around activity
+        self.clip_recorder = None
+        self.clip_labels = set(clip_classes) if clip_classes else None  # Object classes that start a clip, None for any
         self.current_camera = 0
         
+        # Multi-camera: with several sources every one is shown at once in a grid
+        self.camera_sources = list(cameras or [])
+        self.stream_manager = None
+        if len(self.camera_sources) == 1:
+            self.current_camera = self.camera_sources[0]
+        # Motion, clips, landmarks and raw snapshots work on one camera's frames only
+        self.single_camera_state = 'normal' if len(self.camera_sources) <= 1 else 'disabled'
+        self.last_source_state = None
+        self.error_shown = False
+        
+        # Pipeline: capture thread -> inference worker -> Tk render loop
+        self.capture_thread = None
+        self.inference_worker = None
+        self.frame_queue = None
+        self.result_queue = None
+        self.display_rate = 30  # Hz, display pace independent of inference
+        self.render_interval = int(1000 / self.display_rate)
+        
+        # Per-stage latency histograms and frame rates, scrapeable from outside
+        self.metrics = MetricsRegistry()
+        self.metrics.gauge('capture_queue_dropped', lambda: self.frame_queue.dropped if self.frame_queue else 0)
+        self.metrics.gauge('result_queue_dropped', lambda: self.result_queue.dropped if self.result_queue else 0)
+        self.metrics.gauge('gated_frames', lambda: self.gated_frames)
+        self.metrics.gauge('delivered_fps', lambda: round(self.metrics.rate('displayed'), 2))
+        self.metrics.gauge('processed_fps', lambda: round(self.metrics.rate('processed'), 2))
+        self.metrics.gauge('captured_fps', lambda: round(self.metrics.rate('captured'), 2))
+        self.metrics.gauge('process_errors', lambda: sum(stage.errors.count for stage in self.processing_stages()))
+        self.metrics.gauge('buffer_pool_bytes', lambda: self.buffer_pool.nbytes())
+        self.metrics.gauge('buffer_allocations', lambda: self.buffer_pool.allocations)
+        self.metrics.gauge('display_skipped', lambda: self.display.skipped)
+        self.metrics_exporter = None
+        if metrics_port is not None or metrics_file:
+            self.metrics_exporter = MetricsExporter(self.metrics, port=metrics_port, path=metrics_file)
+            self.metrics_exporter.start()
+        self.draw_seconds = 0.0
+        
         # Mode selection
         self.current_mode = "optimized"  # "optimized" or "pro"
+        self.notebook = None
+        self.pro_tabs = {}
         
         # Performance
+        self.buffer_pool = BufferPool()
+        self.letterbox = Letterbox(self.buffer_pool, size=640)
+        self.display = DisplayRenderer(self.buffer_pool, size=(640, 480))
+        self.face_finder = FaceFinder(self.buffer_pool, detect_width=640, full_scan_interval=10)
         self.frame_count = 0
+        self.frame_time = 0.0  # Capture time of the frame being analysed
+        self.scheduler = DetectorScheduler(target_ms=40.0)
+        self.scheduler.register('objects', initial_cost_ms=60.0)
+        self.scheduler.register('faces', initial_cost_ms=20.0)
+        if ADVANCED_FEATURES and not headless:
+            # One person crop per run, results cached in between
+            self.scheduler.register('pose', min_interval=3, initial_cost_ms=25.0)
+            self.scheduler.register('gesture', min_interval=3, initial_cost_ms=20.0)
+        self.scheduled = []
         self.stats = {'objects': 0, 'faces': 0, 'gestures': 0, 'motion': 0}
         self.last_objects = []
         self.last_faces = []
         
         # Tracking
-        self.tracked_objects = {}
-        self.tracked_faces = {}
-        self.object_id = 0
-        self.face_id = 0
+        # Constant-velocity tracks keep boxes moving on frames without detection;
+        # ages are in seconds of capture time
+        self.object_tracker = Tracker(gates=TRACKING_DISTANCES, default_gate=80, max_age=1.0,
+                                      min_avg_confidence=0.4, new_track_confidence=0.6,
+                                      max_tracks=30)
+        self.face_tracker = Tracker(default_gate=80, max_age=1.5)
         
-        # Motion detection
-        self.bg_subtractor = cv2.createBackgroundSubtractorMOG2()
+        # Privacy: faces are redacted once per frame, on the preview and/or the saved outputs
+        self.anonymizer = Anonymizer()
+        
+        # People (YOLO class 0) are only tracked for the pose / gesture stages
+        self.person_tracker = Tracker(default_gate=120, max_age=1.0)
+        self.last_people = []  # ((x1, y1, x2, y2), person_id)
+        self.landmarks = PersonLandmarks()
         
-        # Data logging
-        self.detection_log = []
+        # Motion detection
+        self.motion_engine = MotionEngine(self.buffer_pool, width=320, min_area=1000)
+        self.roi_regions = None  # None: run detectors on the full frame
+        self.gated_frames = 0
+        
+        # Data logging: durable store, written off the frame path (GUI sessions only)
+        self.event_store = None if headless else EventStore(os.path.join("logs", "detections.db"))
+        
+        # Snapshots are taken from processed frames and written on their own thread
+        self.snapshots = None
+        self.last_snapshot_shown = None
+        if not headless:
+            self.snapshots = SnapshotService(directory="screenshots")
+            self.snapshots.start()
+        
+        # Detector toggles as plain values, readable from worker threads
+        self.options = {'objects': True, 'faces': True, 'motion': False, 'privacy': False,
+                        'privacy_method': 'pixelate', 'privacy_target': 'all', 'motion_gate': False,
+                        'clips': False, 'gesture': False, 'pose': False, 'voice': False}
+        
+        # Headless mode (batch processing) never creates a Tk window
+        self.root = None
+        if not headless:
+            self.setup_gui()
+            self.startup.mark('GUI built')
+            self.refresh_options()
+    
+    @property
+    def yolo(self):
+        """YOLO model, loaded on first use (blocks until ready)"""
+        return self.yolo_model.load()
+    
+    @property
+    def face_cascade(self):
+        return self.face_model.load()
+    
+    def load_yolo(self):
+        if self.resources is not None:
+            self.resources.configure_torch()
+        # Validated with one dummy inference; a broken export falls back to PyTorch
+        model = self.model_backend.load()
+        self.check_clip_labels(model.names)
+        return model
+    
+    def load_yolo_pool(self):
+        """YOLO in worker processes; exported and validated once here so the workers only load the artifact"""
+        self.model_backend.load()  # Falls back to PyTorch here rather than in every worker
+        artifact = self.model_backend.artifact
+        task = None if self.model_backend.backend == 'pytorch' else 'detect'
+        threads = cores = None
+        if self.resources is not None:
+            threads = max(1, self.resources.split['yolo'] // self.yolo_workers)
+            cores = self.resources.worker_cores(self.yolo_workers)
+        pool = YoloProcessPool(artifact, task=task, workers=self.yolo_workers, imgsz=self.model_backend.imgsz,
+                               params=self.YOLO_PARAMS, threads=threads, cores=cores).start()
+        self.check_clip_labels(pool.names)
+        return pool
+    
+    def check_clip_labels(self, names):
+        """Drop clip trigger classes the model cannot detect (class names are known once it is loaded)"""
+        if self.clip_labels is None:
+            return
+        known = set(names.values())
+        unknown = self.clip_labels - known
+        if unknown:
+            print(f"[WARN] Unknown clip classes ignored: {', '.join(sorted(unknown))} "
+                  f"(model classes: {', '.join(sorted(known))})")
+            self.clip_labels = self.clip_labels & known
+    
+    def warmup_models(self):
+        """Start background loading for every enabled feature"""
+        started = False
+        for name, model in self.models.items():
+            if self.options.get(name) and model.warmup():
+                started = True
+        
+        if started and self.root is not None and not self.polling_models:
+            self.polling_models = True
+            self.root.after(250, self.poll_models)
+    
+    def model_status(self):
+        """Per-detector loading state for enabled features"""
+        return {model.name: model.state for name, model in self.models.items() if self.options.get(name)}
+    
+    def update_model_label(self):
+        states = self.model_status()
+        if hasattr(self, 'model_label'):
+            text = " | ".join(f"{name}: {state}" for name, state in states.items()) or "no models needed"
+            self.model_label.config(text=f"🧠 {text}")
+        return states
+    
+    def poll_models(self):
+        """Show loading progress until the enabled models have settled (main thread)"""
+        states = self.update_model_label()
+        if LOADING in states.values():
+            self.root.after(250, self.poll_models)
+            return
         
-        self.setup_gui()
+        self.polling_models = False
+        if not self.startup_reported:
+            self.startup_reported = True
+            print(f"[STARTUP] {self.startup.report(self.models.values())}")
     
     def setup_gui(self):
         self.root = tk.Tk()
@@ -105,16 +321,50 @@ class VisionAIUnified:
         self.detect_faces = tk.BooleanVar(value=True)
         self.detect_motion = tk.BooleanVar()
         self.privacy_mode = tk.BooleanVar()
+        self.privacy_method = tk.StringVar(value='pixelate')
+        self.privacy_target = tk.StringVar(value='all')
+        self.motion_gate = tk.BooleanVar()
+        self.event_clips = tk.BooleanVar()
+        self.snapshot_raw = tk.BooleanVar()
         self.gesture_var = tk.BooleanVar()
         self.pose_var = tk.BooleanVar()
         self.voice_var = tk.BooleanVar()
         
         self.setup_optimized_mode()
+        
+        # Labels and the detection log are refreshed in coalesced 5 Hz batches
+        self.ui_updater = UIUpdater(self.root, interval_ms=200, max_rows=50)
+        self.ui_updater.start(on_tick=self.update_ui)
+    
+    def refresh_options(self):
+        """Snapshot Tk toggles on the main thread for the inference worker"""
+        self.options = {
+            'objects': self.detect_objects.get(),
+            # Privacy redacts detected faces, so it keeps the face detector running
+            'faces': self.detect_faces.get() or self.privacy_mode.get(),
+            'motion': self.detect_motion.get(),
+            'privacy': self.privacy_mode.get(),
+            'privacy_method': self.privacy_method.get(),
+            'privacy_target': self.privacy_target.get(),
+            'motion_gate': self.motion_gate.get(),
+            'clips': self.event_clips.get(),
+            'gesture': self.gesture_var.get(),
+            'pose': self.pose_var.get(),
+            'voice': self.voice_var.get()
+        }
+        if len(self.camera_sources) > 1:
+            self.options.update({'motion': False, 'motion_gate': False, 'clips': False, 'gesture': False,
+                                 'pose': False, 'privacy_target': 'all'})
+        # Newly enabled features start loading their models in the background
+        self.warmup_models()
+        self.update_clip_recorder()
     
     def switch_mode(self):
         # Clear current interface
         for widget in self.main_container.winfo_children():
             widget.destroy()
+        self.ui_updater.reset_widgets()
+        self.notebook = None
         
         self.current_mode = self.mode_var.get()
         
@@ -122,6 +372,7 @@ class VisionAIUnified:
             self.setup_optimized_mode()
         else:
             self.setup_pro_mode()
+        self.update_model_label()
     
     def setup_optimized_mode(self):
         # Controls
@@ -148,6 +399,10 @@ class VisionAIUnified:
                  bg='#9b59b6', fg='white', font=('Arial', 10, 'bold'),
                  padx=15, pady=5, relief='flat').pack(side=tk.LEFT, padx=5)
         
+        tk.Button(btn_frame, text="🎞 Burst", command=self.snapshot_burst,
+                 bg='#8e44ad', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief='flat').pack(side=tk.LEFT, padx=5)
+        
         # Detection options
         det_frame = tk.LabelFrame(self.main_container, text="🔍 Detection Options",
                                  font=('Arial', 10, 'bold'), fg='#3498db', bg='#34495e')
@@ -162,12 +417,18 @@ class VisionAIUnified:
         tk.Checkbutton(opt_frame, text="👤 Faces", variable=self.detect_faces,
                       bg='#34495e', fg='#ecf0f1', font=('Arial', 9),
                       selectcolor='#2c3e50').pack(side=tk.LEFT, padx=15)
-        tk.Checkbutton(opt_frame, text="🏃 Motion", variable=self.detect_motion,
+        tk.Checkbutton(opt_frame, text="🏃 Motion", variable=self.detect_motion, state=self.single_camera_state,
                       bg='#34495e', fg='#ecf0f1', font=('Arial', 9),
                       selectcolor='#2c3e50').pack(side=tk.LEFT, padx=15)
         tk.Checkbutton(opt_frame, text="🔒 Privacy", variable=self.privacy_mode,
                       bg='#34495e', fg='#ecf0f1', font=('Arial', 9),
                       selectcolor='#2c3e50').pack(side=tk.LEFT, padx=15)
+        tk.Checkbutton(opt_frame, text="⚡ Motion Gate", variable=self.motion_gate, state=self.single_camera_state,
+                      bg='#34495e', fg='#ecf0f1', font=('Arial', 9),
+                      selectcolor='#2c3e50').pack(side=tk.LEFT, padx=15)
+        tk.Checkbutton(opt_frame, text="🎬 Event Clips", variable=self.event_clips, state=self.single_camera_state,
+                      bg='#34495e', fg='#ecf0f1', font=('Arial', 9),
+                      selectcolor='#2c3e50').pack(side=tk.LEFT, padx=15)
         
         # Video display
         video_frame = tk.LabelFrame(self.main_container, text="📹 Live Feed",
@@ -196,6 +457,14 @@ class VisionAIUnified:
         self.fps_label = tk.Label(status_inner, text="⚡ FPS: 0", bg='#34495e', fg='#ecf0f1', font=('Arial', 9))
         self.fps_label.pack(side=tk.RIGHT)
         
+        self.sched_label = tk.Label(status_frame, text="⏱ Scheduler: idle", bg='#34495e', fg='#bdc3c7',
+                                    font=('Arial', 8))
+        self.sched_label.pack(pady=(0, 5))
+        
+        self.model_label = tk.Label(status_frame, text="🧠 Models: idle", bg='#34495e', fg='#bdc3c7',
+                                    font=('Arial', 8))
+        self.model_label.pack(pady=(0, 5))
+        
         # Stats
         stats_frame = tk.LabelFrame(bottom_frame, text="📈 Stats",
                                    font=('Arial', 9, 'bold'), fg='#3498db', bg='#34495e')
@@ -224,6 +493,7 @@ class VisionAIUnified:
         # Notebook
         notebook = ttk.Notebook(self.main_container, style='Pro.TNotebook')
         notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = notebook
         
         # Camera tab
         camera_tab = tk.Frame(notebook, bg='#2c3e50')
@@ -236,6 +506,7 @@ class VisionAIUnified:
         # Analytics tab
         analytics_tab = tk.Frame(notebook, bg='#2c3e50')
         notebook.add(analytics_tab, text="📊 Analytics")
+        self.pro_tabs = {str(camera_tab): 'camera', str(settings_tab): 'settings', str(analytics_tab): 'analytics'}
         
         self.setup_camera_tab(camera_tab)
         self.setup_settings_tab(settings_tab)
@@ -266,6 +537,10 @@ class VisionAIUnified:
                  bg='#9b59b6', fg='white', font=('Arial', 10, 'bold'),
                  padx=20, pady=8, relief='flat').pack(side=tk.LEFT, padx=8)
         
+        tk.Button(btn_container, text="🎞 Burst", command=self.snapshot_burst,
+                 bg='#8e44ad', fg='white', font=('Arial', 10, 'bold'),
+                 padx=20, pady=8, relief='flat').pack(side=tk.LEFT, padx=8)
+        
         tk.Button(btn_container, text="🔄 Switch Cam", command=self.switch_camera,
                  bg='#34495e', fg='white', font=('Arial', 10, 'bold'),
                  padx=20, pady=8, relief='flat').pack(side=tk.LEFT, padx=8)
@@ -290,7 +565,11 @@ class VisionAIUnified:
         
         self.status = tk.Label(status_left, text="🟢 Professional Mode Ready", 
                               bg='#34495e', fg='#ecf0f1', font=('Arial', 10))
-        self.status.pack(pady=8)
+        self.status.pack(pady=(8, 0))
+        
+        self.model_label = tk.Label(status_left, text="🧠 Models: idle",
+                                   bg='#34495e', fg='#bdc3c7', font=('Arial', 8))
+        self.model_label.pack(pady=(0, 8))
         
         status_right = tk.LabelFrame(status_frame, text="⚡ Performance",
                                     font=('Arial', 9, 'bold'), fg='#3498db', bg='#34495e')
@@ -298,7 +577,11 @@ class VisionAIUnified:
         
         self.fps_label = tk.Label(status_right, text="FPS: 0", 
                                  bg='#34495e', fg='#ecf0f1', font=('Arial', 10))
-        self.fps_label.pack(pady=8, padx=15)
+        self.fps_label.pack(pady=(8, 0), padx=15)
+        
+        self.sched_label = tk.Label(status_right, text="Scheduler: idle",
+                                   bg='#34495e', fg='#bdc3c7', font=('Arial', 8))
+        self.sched_label.pack(pady=(0, 8), padx=15)
     
     def setup_settings_tab(self, parent):
         # Detection settings
@@ -313,25 +596,48 @@ class VisionAIUnified:
         tk.Label(settings_grid, text="Core Detection:", font=('Arial', 11, 'bold'),
                 fg='#ecf0f1', bg='#34495e').grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
         
-        tk.Checkbutton(settings_grid, text="🎯 Object Detection", variable=self.detect_objects,
-                      bg='#34495e', fg='#ecf0f1', font=('Arial', 10), selectcolor='#2c3e50').grid(row=1, column=0, sticky=tk.W, padx=(20, 40), pady=5)
-        tk.Checkbutton(settings_grid, text="👤 Face Detection", variable=self.detect_faces,
-                      bg='#34495e', fg='#ecf0f1', font=('Arial', 10), selectcolor='#2c3e50').grid(row=1, column=1, sticky=tk.W, pady=5)
-        tk.Checkbutton(settings_grid, text="🏃 Motion Detection", variable=self.detect_motion,
-                      bg='#34495e', fg='#ecf0f1', font=('Arial', 10), selectcolor='#2c3e50').grid(row=2, column=0, sticky=tk.W, padx=(20, 40), pady=5)
-        tk.Checkbutton(settings_grid, text="🔒 Privacy Mode", variable=self.privacy_mode,
-                      bg='#34495e', fg='#ecf0f1', font=('Arial', 10), selectcolor='#2c3e50').grid(row=2, column=1, sticky=tk.W, pady=5)
+        def checkbox(text, variable, row, column, state=tk.NORMAL):
+            tk.Checkbutton(settings_grid, text=text, variable=variable, state=state, bg='#34495e', fg='#ecf0f1',
+                           font=('Arial', 10), selectcolor='#2c3e50').grid(
+                row=row, column=column, sticky=tk.W, padx=(20, 40) if column == 0 else 0, pady=5)
+        
+        checkbox("🎯 Object Detection", self.detect_objects, 1, 0)
+        checkbox("👤 Face Detection", self.detect_faces, 1, 1)
+        checkbox("🏃 Motion Detection", self.detect_motion, 2, 0, state=self.single_camera_state)
+        checkbox("🔒 Privacy Mode", self.privacy_mode, 2, 1)
+        checkbox("⚡ Motion-Gated Inference", self.motion_gate, 3, 0, state=self.single_camera_state)
+        checkbox("🎬 Event Clips (pre-roll)", self.event_clips, 3, 1, state=self.single_camera_state)
+        checkbox("🖼️ Raw Snapshots (no overlays)", self.snapshot_raw, 4, 0, state=self.single_camera_state)
         
         if ADVANCED_FEATURES:
             tk.Label(settings_grid, text="Advanced Features:", font=('Arial', 11, 'bold'),
-                    fg='#ecf0f1', bg='#34495e').grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(20, 10))
+                    fg='#ecf0f1', bg='#34495e').grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(20, 10))
             
-            tk.Checkbutton(settings_grid, text="👋 Gesture Recognition", variable=self.gesture_var,
-                          bg='#34495e', fg='#ecf0f1', font=('Arial', 10), selectcolor='#2c3e50').grid(row=4, column=0, sticky=tk.W, padx=(20, 40), pady=5)
-            tk.Checkbutton(settings_grid, text="🧘 Pose Estimation", variable=self.pose_var,
-                          bg='#34495e', fg='#ecf0f1', font=('Arial', 10), selectcolor='#2c3e50').grid(row=4, column=1, sticky=tk.W, pady=5)
-            tk.Checkbutton(settings_grid, text="🎤 Voice Control", variable=self.voice_var,
-                          bg='#34495e', fg='#ecf0f1', font=('Arial', 10), selectcolor='#2c3e50').grid(row=5, column=0, sticky=tk.W, padx=(20, 40), pady=5)
+            checkbox("👋 Gesture Recognition", self.gesture_var, 6, 0, state=self.single_camera_state)
+            checkbox("🧘 Pose Estimation", self.pose_var, 6, 1, state=self.single_camera_state)
+            checkbox("🎤 Voice Control", self.voice_var, 7, 0)
+        
+        # Privacy options
+        privacy_frame = tk.LabelFrame(parent, text="🔒 Privacy",
+                                     font=('Arial', 12, 'bold'), fg='#3498db', bg='#34495e')
+        privacy_frame.pack(fill=tk.X, padx=15, pady=(0, 15))
+        
+        privacy_grid = tk.Frame(privacy_frame, bg='#34495e')
+        privacy_grid.pack(pady=15, padx=20)
+        
+        tk.Label(privacy_grid, text="Method:", font=('Arial', 10),
+                fg='#ecf0f1', bg='#34495e').grid(row=0, column=0, sticky=tk.W, padx=(0, 10))
+        ttk.Combobox(privacy_grid, textvariable=self.privacy_method, values=ANONYMIZE_METHODS,
+                     state='readonly', width=10).grid(row=0, column=1, sticky=tk.W, padx=(0, 30))
+        tk.Label(privacy_grid, text="Apply to:", font=('Arial', 10),
+                fg='#ecf0f1', bg='#34495e').grid(row=0, column=2, sticky=tk.W, padx=(0, 10))
+        # A multi-camera grid is preview and output at once: redaction always applies to all
+        ttk.Combobox(privacy_grid, textvariable=self.privacy_target, values=ANONYMIZE_TARGETS,
+                     state='readonly' if len(self.camera_sources) <= 1 else 'disabled',
+                     width=10).grid(row=0, column=3, sticky=tk.W)
+        tk.Label(privacy_grid, text="Face detection stays on while Privacy Mode is enabled",
+                font=('Arial', 9), fg='#bdc3c7', bg='#34495e').grid(row=1, column=0, columnspan=4, sticky=tk.W,
+                                                                    pady=(10, 0))
         
         # Data management
         export_frame = tk.LabelFrame(parent, text="📁 Data Management",
@@ -383,6 +689,15 @@ class VisionAIUnified:
                                     bg='#f39c12', fg='white')
         self.motion_label.pack(pady=(0, 10), padx=20)
         
+        # Pipeline performance (same numbers as the metrics endpoint)
+        perf_frame = tk.LabelFrame(parent, text="⏱️ Pipeline Performance",
+                                  font=('Arial', 12, 'bold'), fg='#3498db', bg='#34495e')
+        perf_frame.pack(fill=tk.X, padx=15, pady=(0, 15))
+        
+        self.perf_label = tk.Label(perf_frame, text="Start the camera to collect metrics", font=('Courier', 10),
+                                  bg='#34495e', fg='#ecf0f1', justify=tk.LEFT, anchor=tk.W)
+        self.perf_label.pack(fill=tk.X, padx=15, pady=10)
+        
         # Detection log
         recent_frame = tk.LabelFrame(parent, text="🕰️ Detection Log",
                                     font=('Arial', 12, 'bold'), fg='#3498db', bg='#34495e')
@@ -401,62 +716,105 @@ class VisionAIUnified:
         
         self.detection_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.ui_updater.bind_tree(self.detection_tree, lambda: self.visible_tab() == 'analytics')
     
-    def detect_objects_in_frame(self, frame):
-        if not self.detect_objects.get():
+    def submit_objects(self, frame):
+        """Start object inference on a frame before anything is drawn on it
+        
+        In-process YOLO runs right here; with worker processes the frame is
+        only copied into a shared-memory slot and the workers run while the
+        caller does other work. detect_objects_in_frame collects the result.
+        """
+        if not self.options['objects'] or 'objects' not in self.scheduled:
+            return None
+        start_time = time.time()
+        
+        if self.roi_regions is None:
+            images, offsets = [frame], [(0, 0)]
+        else:
+            # Only the moving regions, as one batch
+            images = [frame[y:y+h, x:x+w] for (x, y, w, h) in self.roi_regions]
+            offsets = [(x, y) for (x, y, _, _) in self.roi_regions]
+        
+        if self.yolo_workers:
+            return {'pending': self.yolo.submit(images), 'offsets': offsets, 'cost': time.time() - start_time}
+        
+        # (boxes, scale, pad, offset) per image, mapped to the frame when collected
+        if self.roi_regions is None:
+            # Letterboxed 640x640 input, built in place in a pooled buffer
+            model_input, scale, pad_x, pad_y = self.letterbox(frame)
+            
+            results = self.yolo(model_input, **self.YOLO_PARAMS)
+            boxes = [(boxes_array(result), 1.0 / scale, (pad_x, pad_y), (0, 0)) for result in results]
+        else:
+            results = self.yolo(images, **self.YOLO_PARAMS)
+            boxes = [(boxes_array(result), 1.0, (0, 0), offset) for offset, result in zip(offsets, results)]
+        return {'boxes': boxes, 'cost': time.time() - start_time}
+    
+    def detect_objects_in_frame(self, frame, job=None):
+        if not self.options['objects']:
+            self.last_people = []
             return frame
         
-        if self.frame_count % 2 == 0:
-            # Use higher resolution for better accuracy
-            small = cv2.resize(frame, (640, 640))
+        if 'objects' in self.scheduled:
+            if job is None:
+                job = self.submit_objects(frame)
+            start_time = time.time()
+            
+            if 'pending' in job:
+                boxes = [(array, 1.0, (0, 0), offset) for offset, array in zip(job['offsets'], job['pending'].result())]
+            else:
+                boxes = job['boxes']
             
-            # Enhanced YOLO parameters for accuracy
-            results = self.yolo(small, 
-                              conf=0.4,        # Lower confidence for more detections
-                              iou=0.5,         # Higher IoU for better filtering
-                              max_det=50,      # Limit detections
-                              verbose=False,
-                              agnostic_nms=True)  # Better NMS
+            # Person boxes are kept apart (not logged as objects) for the pose / gesture stages
+            people = [] if self.landmarks_enabled() else None
+            detections = []
+            for array, scale, pad, offset in boxes:
+                detections.extend(self.filter_detections(array, scale, pad, offset, people))
             
-            h, w = frame.shape[:2]
-            scale_x, scale_y = w / 640, h / 640
+            # Time this thread spent on inference (submitting and waiting)
+            start_time -= job['cost']
+            self.metrics.observe('objects', time.time() - start_time)
+            
+            # Associate the whole frame at once
+            centers = [((x1 + x2) // 2, (y1 + y2) // 2) for x1, y1, x2, y2, _, _ in detections]
+            classes = [self.yolo.names[cls] for _, _, _, _, cls, _ in detections]
+            confs = [conf for _, _, _, _, _, conf in detections]
+            with self.metrics.time('tracker'):
+                obj_ids = self.object_tracker.update(centers, classes, confs, self.frame_time)
+            self.stats['objects'] += len(self.object_tracker.new_ids)
             
             current_objects = []
+            for (x1, y1, x2, y2, _, conf), obj_class, obj_id in zip(detections, classes, obj_ids):
+                if obj_id is None:
+                    continue
+                label = f"{obj_class}_{obj_id}: {conf:.2f}"
+                current_objects.append((x1, y1, x2, y2, label, conf, obj_id))
+                
+                # Log new detections
+                if obj_id in self.object_tracker.new_ids:
+                    self.log_detection('Object', f"{obj_class}_{obj_id} (conf: {conf:.2f})")
+                    if self.clip_labels is None or obj_class in self.clip_labels:
+                        self.trigger_clip(obj_class)
             
-            for result in results:
-                if result.boxes is not None:
-                    for box in result.boxes:
-                        x1, y1, x2, y2 = box.xyxy[0]
-                        x1, y1, x2, y2 = int(x1*scale_x), int(y1*scale_y), int(x2*scale_x), int(y2*scale_y)
-                        conf = float(box.conf[0])
-                        cls = int(box.cls[0])
-                        
-                        # Skip person class and low confidence
-                        if cls == 0 or conf < 0.5:
-                            continue
-                        
-                        # Filter by box size (remove tiny detections)
-                        box_area = (x2 - x1) * (y2 - y1)
-                        if box_area < 400:  # Minimum 20x20 pixels
-                            continue
-                        
-                        center_x, center_y = (x1 + x2) // 2, (y1 + y2) // 2
-                        obj_class = self.yolo.names[cls]
-                        obj_id = self.get_object_id(center_x, center_y, obj_class, conf)
-                        
-                        if obj_id is not None:
-                            label = f"{obj_class}_{obj_id}: {conf:.2f}"
-                            current_objects.append((x1, y1, x2, y2, label, conf))
-                            
-                            # Log new detections
-                            if obj_id not in [item[4] for item in self.last_objects if len(item) > 4]:
-                                self.log_detection('Object', f"{obj_class}_{obj_id} (conf: {conf:.2f})")
+            if self.roi_regions is not None:
+                # Objects outside the moving regions were not re-examined; keep them alive
+                kept = [obj for obj in self.last_objects
+                        if obj[6] not in obj_ids and
+                        not point_in_regions((obj[0] + obj[2]) // 2, (obj[1] + obj[3]) // 2, self.roi_regions)]
+                self.object_tracker.touch([obj[6] for obj in kept], self.frame_time)
+                current_objects.extend(kept)
             
             self.last_objects = current_objects
-            self.cleanup_old_objects()
+            self.object_tracker.cleanup(self.frame_time)
+            if people is not None:
+                self.update_people(people)
+            self.scheduler.record('objects', time.time() - start_time)
         
         # Draw with confidence-based styling
-        for x1, y1, x2, y2, label, conf in self.last_objects:
+        draw_start = time.time()
+        for x1, y1, x2, y2, label, conf, _ in self.last_objects:
             # Color intensity based on confidence
             intensity = int(conf * 255)
             color = (0, intensity, 0)
@@ -468,170 +826,303 @@ class VisionAIUnified:
             text_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)[0]
             cv2.rectangle(frame, (x1, y1-text_size[1]-8), (x1+text_size[0]+4, y1), color, -1)
             cv2.putText(frame, label, (x1+2, y1-4), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.draw_seconds += time.time() - draw_start
+        
+        return frame
+    
+    def parse_detections(self, result, scale=1.0, pad=(0, 0)):
+        """Filtered (x1, y1, x2, y2, cls, conf) boxes from one YOLO result
+        
+        Boxes are mapped back to frame coordinates by removing the letterbox
+        padding and undoing the resize scale.
+        """
+        return self.filter_detections(boxes_array(result), scale, pad)
+    
+    def filter_detections(self, boxes, scale=1.0, pad=(0, 0), offset=(0, 0), people=None):
+        """(x1, y1, x2, y2, cls, conf) tuples from an (N, 6) box array
+        
+        Coordinates are mapped with (x - pad) * scale + offset. Person boxes
+        are dropped, or appended to `people` when a list is given.
+        """
+        detections = []
+        pad_x, pad_y = pad
+        off_x, off_y = offset
+        for x1, y1, x2, y2, conf, cls in boxes:
+            x1, x2 = int((x1 - pad_x) * scale) + off_x, int((x2 - pad_x) * scale) + off_x
+            y1, y2 = int((y1 - pad_y) * scale) + off_y, int((y2 - pad_y) * scale) + off_y
+            conf = float(conf)
+            cls = int(cls)
+            
+            # Skip low confidence
+            if conf < 0.5:
+                continue
+            
+            # Filter by box size (remove tiny detections)
+            box_area = (x2 - x1) * (y2 - y1)
+            if box_area < 400:  # Minimum 20x20 pixels
+                continue
+            
+            if cls == 0:
+                if people is not None:
+                    people.append((x1, y1, x2, y2, conf))
+                continue
+            
+            detections.append((x1, y1, x2, y2, cls, conf))
         
+        return detections
+    
+    def landmarks_enabled(self):
+        return any(self.options[name] and name in self.models and self.models[name].ready
+                   for name in ('pose', 'gesture'))
+    
+    def update_people(self, people):
+        """Track the person boxes YOLO found so landmark results can be cached per person"""
+        centers = [((x1 + x2) // 2, (y1 + y2) // 2) for x1, y1, x2, y2, _ in people]
+        person_ids = self.person_tracker.update(centers, ['person'] * len(people),
+                                                [conf for *_, conf in people], self.frame_time)
+        current = [((x1, y1, x2, y2), person_id)
+                   for (x1, y1, x2, y2, _), person_id in zip(people, person_ids) if person_id is not None]
+        
+        if self.roi_regions is not None:
+            kept = [(box, person_id) for box, person_id in self.last_people
+                    if person_id not in person_ids and
+                    not point_in_regions((box[0] + box[2]) // 2, (box[1] + box[3]) // 2, self.roi_regions)]
+            self.person_tracker.touch([person_id for _, person_id in kept], self.frame_time)
+            current.extend(kept)
+        
+        self.last_people = current
+        self.person_tracker.cleanup(self.frame_time)
+    
+    def update_landmarks(self, frame):
+        """Pose / gesture on one tracked person crop each, when scheduled (clean frame, nothing drawn yet)"""
+        if 'pose' in self.scheduled:
+            start_time = time.time()
+            self.landmarks.update_pose(self.models['pose'].get(), frame, self.last_people, self.frame_time)
+            self.scheduler.record('pose', time.time() - start_time)
+            self.metrics.observe('pose', time.time() - start_time)
+        
+        if 'gesture' in self.scheduled:
+            start_time = time.time()
+            event = self.landmarks.update_hands(self.models['gesture'].get(), frame, self.last_people,
+                                                self.frame_time)
+            self.scheduler.record('gesture', time.time() - start_time)
+            self.metrics.observe('gesture', time.time() - start_time)
+            if event:
+                person_id, gesture = event
+                self.stats['gestures'] += 1
+                self.log_detection('Gesture', f"Person_{person_id}: {gesture}")
+        
+        self.landmarks.cleanup(self.last_people, self.frame_time)
+    
+    def draw_landmarks(self, frame):
+        if not self.landmarks_enabled() or not self.last_people:
+            return frame
+        draw_start = time.time()
+        self.landmarks.draw(frame, self.last_people, pose=self.options['pose'], hands=self.options['gesture'])
+        self.draw_seconds += time.time() - draw_start
         return frame
     
+    def find_faces(self, frame, regions=None, tracked=()):
+        """Haar cascade face boxes (x, y, w, h)
+        
+        Full scans run downscaled (optionally only inside regions); while faces
+        are tracked, most searches only look around them.
+        """
+        return self.face_finder.find(self.face_cascade, frame, tracked, regions)
+    
     def detect_faces_in_frame(self, frame):
-        if not self.detect_faces.get():
+        if not self.options['faces']:
+            # Stale boxes would keep being redacted (or drawn) where no face is any more
+            if self.last_faces:
+                self.last_faces = []
+                self.face_tracker.reset()
             return frame
         
-        if self.frame_count % 2 == 0:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(gray, 1.2, 5, minSize=(40, 40))
+        if 'faces' in self.scheduled:
+            start_time = time.time()
+            faces = self.find_faces(frame, self.roi_regions, [face[:4] for face in self.last_faces])
+            self.metrics.observe('faces', time.time() - start_time)
             
-            current_faces = []
+            centers = [(x + w//2, y + h//2) for (x, y, w, h) in faces]
+            with self.metrics.time('tracker'):
+                face_ids = self.face_tracker.update(centers, ['face'] * len(centers),
+                                                    [1.0] * len(centers), self.frame_time)
+            self.stats['faces'] += len(self.face_tracker.new_ids)
             
-            for (x, y, w, h) in faces:
-                center_x, center_y = x + w//2, y + h//2
-                face_id = self.get_face_id(center_x, center_y)
-                
+            current_faces = []
+            for (x, y, w, h), face_id in zip(faces, face_ids):
                 current_faces.append((x, y, w, h, face_id))
                 
                 # Log new face detections
-                if face_id not in [item[4] for item in self.last_faces if len(item) > 4]:
+                if face_id in self.face_tracker.new_ids:
                     self.log_detection('Face', f"Face_{face_id} detected")
+                    self.trigger_clip('face')
+            
+            if self.roi_regions is not None:
+                kept = [face for face in self.last_faces
+                        if face[4] not in face_ids and
+                        not point_in_regions(face[0] + face[2] // 2, face[1] + face[3] // 2, self.roi_regions)]
+                self.face_tracker.touch([face[4] for face in kept], self.frame_time)
+                current_faces.extend(kept)
             
             self.last_faces = current_faces
-            self.cleanup_old_faces()
+            self.face_tracker.cleanup(self.frame_time)
+            self.scheduler.record('faces', time.time() - start_time)
         
+        # In privacy mode faces are redacted by anonymize_outputs() after all drawing
+        if self.options['privacy']:
+            return frame
+        
+        draw_start = time.time()
         for (x, y, w, h, face_id) in self.last_faces:
-            if self.privacy_mode.get():
-                face_region = frame[y:y+h, x:x+w]
-                face_region = cv2.GaussianBlur(face_region, (51, 51), 30)
-                frame[y:y+h, x:x+w] = face_region
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
-                cv2.putText(frame, "PRIVATE", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
-            else:
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
-                cv2.putText(frame, f"Face_{face_id}", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 1)
+            cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
+            cv2.putText(frame, f"Face_{face_id}", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 1)
+        self.draw_seconds += time.time() - draw_start
         
         return frame
     
     def detect_motion_in_frame(self, frame):
-        if not self.detect_motion.get():
+        if not self.options['motion']:
             return frame
         
-        fg_mask = self.bg_subtractor.apply(frame)
-        contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            if cv2.contourArea(contour) > 1000:
-                x, y, w, h = cv2.boundingRect(contour)
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 255), 2)
-                cv2.putText(frame, "MOTION", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-                self.stats['motion'] += 1
-                self.log_detection('Motion', f"Area: {cv2.contourArea(contour):.0f} pixels")
+        draw_start = time.time()
+        for (x, y, w, h) in self.motion_engine.regions:
+            cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 255), 2)
+            cv2.putText(frame, "MOTION", (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        self.draw_seconds += time.time() - draw_start
         
         return frame
     
-    def get_object_id(self, x, y, obj_class, confidence):
-        min_dist = float('inf')
-        closest_id = None
+    def update_motion(self, frame):
+        """Feed the motion engine and return merged motion regions (before anything is drawn)"""
+        now = time.time()
+        events = self.motion_engine.apply(frame, now)
+        self.metrics.observe('motion', time.time() - now)
+        
+        clips = self.clip_recorder
+        if clips is not None:
+            if any(kind == 'start' for kind, _ in events):
+                clips.trigger('motion', now)
+            elif self.motion_engine.active:
+                clips.keep_alive(now)
+        
+        # Motion is logged once per event, not per contour per frame
+        if self.options['motion']:
+            for kind, event in events:
+                if kind == 'start':
+                    self.stats['motion'] += 1
+                    self.log_detection('Motion', f"Started ({event['peak_regions']} region(s))")
+                else:
+                    self.log_detection('Motion', f"Ended after {event['duration']:.1f}s, "
+                                                 f"peak area: {event['peak_area']:.0f} pixels")
         
-        # Dynamic tracking distance based on object class
-        tracking_distances = {
-            'car': 150, 'truck': 150, 'bus': 150, 'motorcycle': 100,
-            'bottle': 50, 'cup': 50, 'bowl': 50, 'wine glass': 50,
-            'laptop': 80, 'mouse': 40, 'keyboard': 80, 'cell phone': 60,
-            'book': 60, 'clock': 60, 'vase': 60
-        }
-        max_distance = tracking_distances.get(obj_class, 80)
-        
-        for obj_id, (ox, oy, oclass, frame_seen, conf_history) in self.tracked_objects.items():
-            if oclass == obj_class:
-                dist = ((x - ox) ** 2 + (y - oy) ** 2) ** 0.5
-                if dist < max_distance and dist < min_dist:
-                    min_dist = dist
-                    closest_id = obj_id
-        
-        if closest_id is not None:
-            # Update existing object with confidence tracking
-            _, _, oclass, _, conf_history = self.tracked_objects[closest_id]
-            conf_history.append(confidence)
-            if len(conf_history) > 5:  # Keep last 5 confidence scores
-                conf_history.pop(0)
-            
-            self.tracked_objects[closest_id] = (x, y, obj_class, self.frame_count, conf_history)
-            return closest_id
-        else:
-            # Only create new object if confidence is high enough
-            if confidence > 0.6:
-                self.object_id += 1
-                self.tracked_objects[self.object_id] = (x, y, obj_class, self.frame_count, [confidence])
-                self.stats['objects'] += 1
-                return self.object_id
-            return None
+        return self.motion_engine.regions
     
-    def get_face_id(self, x, y):
-        min_dist = float('inf')
-        closest_id = None
-        
-        for face_id, (fx, fy, frame_seen) in self.tracked_faces.items():
-            dist = ((x - fx) ** 2 + (y - fy) ** 2) ** 0.5
-            if dist < 80 and dist < min_dist:
-                min_dist = dist
-                closest_id = face_id
-        
-        if closest_id is not None:
-            self.tracked_faces[closest_id] = (x, y, self.frame_count)
-            return closest_id
-        else:
-            self.face_id += 1
-            self.tracked_faces[self.face_id] = (x, y, self.frame_count)
-            self.stats['faces'] += 1
-            return self.face_id
-    
-    def cleanup_old_objects(self):
-        to_remove = []
-        for obj_id, (x, y, obj_class, frame_seen, conf_history) in self.tracked_objects.items():
-            age = self.frame_count - frame_seen
-            avg_confidence = sum(conf_history) / len(conf_history) if conf_history else 0
-            
-            # Remove objects based on age and confidence
-            if age > 20 or avg_confidence < 0.4:
-                to_remove.append(obj_id)
-        
-        for obj_id in to_remove:
-            del self.tracked_objects[obj_id]
-        
-        # Limit total objects to prevent memory issues
-        if len(self.tracked_objects) > 30:
-            # Remove lowest confidence objects
-            sorted_objects = sorted(self.tracked_objects.items(), 
-                                  key=lambda x: sum(x[1][4])/len(x[1][4]))
-            for obj_id, _ in sorted_objects[:5]:
-                if obj_id in self.tracked_objects:
-                    del self.tracked_objects[obj_id]
-    
-    def cleanup_old_faces(self):
-        to_remove = []
-        for face_id, (x, y, frame_seen) in self.tracked_faces.items():
-            if self.frame_count - frame_seen > 30:
-                to_remove.append(face_id)
-        
-        for face_id in to_remove:
-            del self.tracked_faces[face_id]
+    def plan_roi_regions(self, frame, regions):
+        """Detector regions for a moving scene, None when cropping would not pay off"""
+        frame_h, frame_w = frame.shape[:2]
+        rois = merge_regions([expand_region(region, frame.shape) for region in regions])
+        
+        # Large or scattered motion: one full-frame pass is cheaper than many crops
+        covered = sum(w * h for _, _, w, h in rois)
+        if covered > 0.5 * frame_w * frame_h or len(rois) > 4:
+            return None
+        return rois
     
     def start(self):
-        if not self.running:
-            self.cap = cv2.VideoCapture(self.current_camera)
-            if self.cap.isOpened():
+        if not self.running and len(self.camera_sources) > 1:
+            self.start_streams()
+        elif not self.running:
+            # Devices, files and network streams; reconnects on its own when the feed drops
+            self.cap = CaptureSource(self.current_camera)
+            if self.cap.open():
                 self.running = True
+                self.refresh_options()
+                
+                self.frame_queue = FrameQueue(maxsize=1, policy=DROP_OLDEST)
+                self.result_queue = FrameQueue(maxsize=2, policy=DROP_OLDEST)
+                self.capture_thread = CaptureThread(self.cap, self.frame_queue, metrics=self.metrics)
+                self.inference_worker = InferenceWorker(self.analyze_frame, self.frame_queue, self.result_queue,
+                                                        metrics=self.metrics)
+                self.capture_thread.start()
+                self.inference_worker.start()
+                if self.resources is not None:
+                    self.resources.pin_thread(self.capture_thread, ('ui',))
+                    self.resources.pin_thread(self.inference_worker, ('yolo', 'opencv'))
+                
                 mode_text = "Optimized" if self.current_mode == "optimized" else "Professional"
-                self.status.config(text=f"🔴 {mode_text} Mode Active")
-                self.process_frame()
+                self.ui_updater.set_label(self.status, f"🔴 {mode_text} Mode Active")
+                self.display.reset()
+                self.render_frame()
             else:
-                messagebox.showerror("Error", "Cannot open camera")
+                self.cap.release()
+                messagebox.showerror("Error", f"Cannot open camera: {self.cap.label}")
+    
+    def start_streams(self):
+        """Open all camera sources at once, detection batched across them"""
+        self.refresh_options()
+        self.result_queue = FrameQueue(maxsize=2, policy=DROP_OLDEST)
+        manager = StreamManager(self, self.camera_sources, self.result_queue, on_grid=self.publish_grid)
+        failed = manager.open()
+        if len(failed) == len(self.camera_sources):
+            manager.close()
+            messagebox.showerror("Error", "Cannot open any camera")
+            return
+        if failed:
+            print(f"[STREAMS] Cannot open: {', '.join(str(source) for source in failed)}")
+        
+        self.stream_manager = manager
+        self.running = True
+        manager.start()
+        if self.resources is not None:
+            self.resources.pin_thread(manager, ('yolo', 'opencv'))
+        streams = len(self.camera_sources) - len(failed)
+        self.ui_updater.set_label(self.status, f"🔴 Multi-Camera Active ({streams} streams)"
+                                               " | objects, faces and privacy only")
+        self.display.reset()
+        self.render_frame()
+    
+    def publish_grid(self, grid, grid_id):
+        """Recording and snapshots of the multi-camera grid (stream manager thread)"""
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.write(grid)
+        if self.snapshots is not None:
+            self.snapshots.offer(grid, grid_id)
+    
+    def detect_object_batch(self, frames):
+        """(x1, y1, x2, y2, cls, conf) detections for several frames in one YOLO call"""
+        if self.yolo_workers:
+            arrays = self.yolo(frames)
+        else:
+            arrays = [boxes_array(result) for result in self.yolo(frames, **self.YOLO_PARAMS)]
+        return [self.filter_detections(array) for array in arrays]
     
     def stop(self):
         self.running = False
-        if self.cap:
-            self.cap.release()
-        if self.out:
-            self.out.release()
-        self.status.config(text="🟡 Stopped - Ready to Start")
+        manager, self.stream_manager = self.stream_manager, None
+        if manager is not None:
+            manager.stop()
+            manager.join(timeout=2.0)
+            manager.close()
+        for stage in (self.capture_thread, self.inference_worker):
+            if stage:
+                stage.stop()
+        for stage in (self.capture_thread, self.inference_worker):
+            if stage and stage.is_alive():
+                stage.join(timeout=1.0)
+        # The capture thread releases the source itself once its current read returns
+        self.capture_thread = None
+        self.inference_worker = None
+        self.stop_recording()
+        self.update_clip_recorder()
+        if self.snapshots is not None:
+            self.snapshots.cancel()
+        self.ui_updater.set_label(self.status, "🟡 Stopped - Ready to Start")
     
     def switch_camera(self):
+        if self.stream_manager is not None or not isinstance(self.current_camera, int):
+            return  # Every camera is already on screen, or a stream / file was given
         self.current_camera = (self.current_camera + 1) % 3
         if self.running:
             self.stop()
@@ -639,101 +1130,307 @@ class VisionAIUnified:
             self.start()
     
     def toggle_record(self):
-        if not self.recording and self.running:
+        if self.recorder is None and self.running:
             os.makedirs("recordings", exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"recordings/video_{timestamp}.avi"
-            fourcc = cv2.VideoWriter_fourcc(*'XVID')
-            self.out = cv2.VideoWriter(filename, fourcc, 20.0, (640, 480))
-            self.recording = True
-            self.status.config(text=f"🔴 Recording: {filename}")
+            # Size and frame rate are taken from the frames actually recorded
+            self.recorder = Recorder(filename, metrics=self.metrics)
+            self.recorder.start()
+            self.ui_updater.set_label(self.status, f"🔴 Recording: {filename}")
         else:
-            self.recording = False
-            if self.out:
-                self.out.release()
+            self.stop_recording()
             mode_text = "Optimized" if self.current_mode == "optimized" else "Professional"
-            self.status.config(text=f"🟡 {mode_text} Mode Active")
-    
-    def screenshot(self):
-        if self.running and self.cap:
-            ret, frame = self.cap.read()
-            if ret:
-                os.makedirs("screenshots", exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"screenshots/shot_{timestamp}.jpg"
-                cv2.imwrite(filename, frame)
-                messagebox.showinfo("Screenshot", f"Saved: {filename}")
-    
-    def process_frame(self):
-        if self.running and self.cap:
-            ret, frame = self.cap.read()
-            if ret:
-                self.frame_count += 1
-                start_time = time.time()
-                
-                frame = self.detect_motion_in_frame(frame)
-                frame = self.detect_objects_in_frame(frame)
-                frame = self.detect_faces_in_frame(frame)
-                
-                if self.recording and self.out:
-                    self.out.write(frame)
-                
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frame_rgb = cv2.resize(frame_rgb, (640, 480))
-                
-                img = Image.fromarray(frame_rgb)
-                photo = ImageTk.PhotoImage(img)
-                
-                self.video_label.config(image=photo)
-                self.video_label.image = photo
-                
-                fps = 1.0 / (time.time() - start_time) if time.time() - start_time > 0 else 0
-                fps_text = f"⚡ FPS: {fps:.1f}" if self.current_mode == "optimized" else f"FPS: {fps:.1f}"
-                self.fps_label.config(text=fps_text)
-                
-                # Update stats
-                if self.current_mode == "optimized":
-                    self.obj_label.config(text=f"🎯 Objects: {self.stats['objects']}")
-                    self.face_label.config(text=f"👤 Faces: {self.stats['faces']}")
-                    self.motion_label.config(text=f"🏃 Motion: {self.stats['motion']}")
-                else:
-                    self.obj_label.config(text=f"Objects: {self.stats['objects']}")
-                    self.face_label.config(text=f"Faces: {self.stats['faces']}")
-                    self.motion_label.config(text=f"Motion: {self.stats['motion']}")
-                
-            self.root.after(30, self.process_frame)
+            self.ui_updater.set_label(self.status, f"🟡 {mode_text} Mode Active")
     
-    def log_detection(self, detection_type, details):
-        """Log detection events"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.detection_log.append({
-            'timestamp': timestamp,
-            'type': detection_type,
-            'details': details
-        })
-        
-        # Update tree view if in Pro mode
-        if self.current_mode == "pro" and hasattr(self, 'detection_tree'):
-            try:
-                self.detection_tree.insert('', 0, values=(timestamp, detection_type, details))
-                
-                # Keep only last 50 entries in tree
-                items = self.detection_tree.get_children()
-                if len(items) > 50:
-                    self.detection_tree.delete(items[-1])
-            except:
-                pass
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return
+        recorder.stop()
+        # Encoding the backlog can take seconds: wait for it off the Tk thread
+        self.in_background(self.finish_recording, recorder)
+    
+    def finish_recording(self, recorder):
+        recorder.join(timeout=5.0)
+        if recorder.last_error:
+            print(f"[RECORD] {recorder.filename} failed: {recorder.last_error}")
+            text = f"⚠️ Recording failed: {recorder.last_error}"
+        else:
+            print(f"[RECORD] {recorder.filename}: {recorder.summary()}")
+            text = f"💾 Saved {os.path.basename(recorder.filename)} | {recorder.summary()}"
+        self.ui_updater.post(self.ui_updater.set_label, self.status, text)
+    
+    def in_background(self, fn, *args):
+        """Run a slow shutdown step on its own thread; on_close() waits for these"""
+        thread = threading.Thread(target=fn, args=args, daemon=True)
+        self.finishing = [t for t in self.finishing if t.is_alive()] + [thread]
+        thread.start()
+    
+    def screenshot(self, count=1, interval=0.0):
+        # Never call cap.read() here: the capture thread owns the device.
+        # The next processed frame is saved by the snapshot service.
+        if self.running:
+            self.snapshots.request(count=count, interval=interval, raw=self.snapshot_raw.get())
+            self.ui_updater.set_label(self.status, f"📸 Snapshot queued ({self.snapshots.pending} pending)")
+    
+    def snapshot_burst(self):
+        self.screenshot(count=10, interval=0.5)
+    
+    def update_clip_recorder(self):
+        """Start or stop the clip recorder to follow the Event Clips toggle (main thread)"""
+        wanted = self.running and self.options['clips']
+        if wanted and self.clip_recorder is None:
+            self.clip_recorder = ClipRecorder(directory="recordings", metrics=self.metrics)
+            self.clip_recorder.start()
+        elif not wanted and self.clip_recorder is not None:
+            clips, self.clip_recorder = self.clip_recorder, None
+            clips.stop()
+            # Closing an open clip encodes its backlog: wait for it off the Tk thread
+            self.in_background(self.finish_clips, clips)
+    
+    def finish_clips(self, clips):
+        clips.join(timeout=10.0)
+        self.ui_updater.post(self.ui_updater.set_label, self.status, f"🎬 Event clips off ({len(clips.clips)} saved)")
+    
+    def trigger_clip(self, reason):
+        clips = self.clip_recorder
+        if clips is not None:
+            clips.trigger(reason)
+    
+    def analyze_frame(self, frame, timestamp=None):
+        """Run detectors on one frame (inference worker thread)"""
+        self.frame_count += 1
+        start_time = time.time()
+        self.frame_time = timestamp or start_time
+        self.draw_seconds = 0.0
+        self.predict_tracks()
+        
+        # Raw snapshots need a copy before anything is drawn on the frame
+        snapshots = self.snapshots
+        raw_frame = None
+        if snapshots is not None and snapshots.wants(raw=True):
+            raw_frame = frame.copy()
+        
+        regions = []
+        if self.options['motion'] or self.options['motion_gate'] or self.options['clips']:
+            regions = self.update_motion(frame)
+        
+        # Adaptive cadence: the scheduler picks which detectors fit this frame.
+        # Detectors whose model is still loading are skipped, not waited for.
+        enabled = [name for name in ('objects', 'faces')
+                   if self.options[name] and self.models[name].ready]
+        # Landmarks need person boxes, which come from object detection
+        if self.options['objects'] and self.last_people:
+            enabled += [name for name in ('pose', 'gesture')
+                        if self.options[name] and name in self.models and self.models[name].ready]
+        self.roi_regions = None
+        if self.options['motion_gate'] and not regions:
+            # Static scene: skip detection, last results stay on screen
+            self.scheduled = []
+            self.gated_frames += 1
+        else:
+            self.scheduled = self.scheduler.plan(enabled)
+            if self.options['motion_gate']:
+                self.roi_regions = self.plan_roi_regions(frame, regions)
+        
+        # Objects are submitted first: with worker processes they run while faces are found here
+        object_job = self.submit_objects(frame)
+        self.update_landmarks(frame)
+        frame = self.detect_motion_in_frame(frame)
+        frame = self.detect_faces_in_frame(frame)
+        frame = self.detect_objects_in_frame(frame, object_job)
+        frame = self.draw_landmarks(frame)
+        self.metrics.observe('draw', self.draw_seconds)
+        
+        recorder = self.recorder
+        clips = self.clip_recorder
+        saving = recorder is not None or clips is not None or (snapshots is not None and snapshots.wants())
+        frame, output = self.anonymize_outputs(frame, raw_frame, saving)
+        
+        self.scheduler.end_frame(time.time() - start_time)
+        
+        # Hand off to the recorder thread; encoding never blocks this worker
+        if recorder is not None:
+            recorder.write(output)
+        if snapshots is not None:
+            if raw_frame is not None:
+                snapshots.offer(raw_frame, self.frame_count, raw=True)
+            snapshots.offer(output, self.frame_count)
+        if clips is not None:
+            if self.last_faces:
+                clips.keep_alive()
+            clips.feed(output)
         
-        # Keep only last 100 entries in log
-        if len(self.detection_log) > 100:
-            self.detection_log.pop(0)
+        return frame
     
-    def export_log(self):
-        """Export detection log to CSV"""
-        if not self.detection_log:
-            messagebox.showwarning("Export", "No detection data to export")
+    def predict_tracks(self):
+        """Move the last boxes to where their tracks predict them at this frame's time
+        
+        Detectors that run on this frame replace them with measured boxes; the
+        others (and privacy redaction) use the prediction instead of the old
+        position.
+        """
+        now = self.frame_time
+        with self.metrics.time('predict'):
+            for tracker in (self.object_tracker, self.face_tracker, self.person_tracker):
+                tracker.predict(now)
+            
+            objects = []
+            for x1, y1, x2, y2, label, conf, obj_id in self.last_objects:
+                x1, y1, x2, y2 = self.object_tracker.move_box(obj_id, x1, y1, x2, y2)
+                objects.append((x1, y1, x2, y2, label, conf, obj_id))
+            self.last_objects = objects
+            
+            faces = []
+            for x, y, w, h, face_id in self.last_faces:
+                x, y, _, _ = self.face_tracker.move_box(face_id, x, y, x + w, y + h)
+                faces.append((x, y, w, h, face_id))
+            self.last_faces = faces
+            
+            self.last_people = [(self.person_tracker.move_box(person_id, *box), person_id)
+                                for box, person_id in self.last_people]
+    
+    def anonymize_outputs(self, frame, raw_frame, saving):
+        """Redact faces on the preview and/or the saved outputs; returns (preview, output)
+        
+        Runs every frame on the latest face boxes, also when the face detector
+        was skipped. A copy is only made when the two streams differ and
+        something is actually being saved.
+        """
+        if not self.options['privacy'] or not self.last_faces:
+            return frame, frame
+        
+        start_time = time.time()
+        boxes = [face[:4] for face in self.last_faces]
+        method = self.options['privacy_method']
+        target = self.options['privacy_target']
+        output = frame
+        if target != 'all' and saving:
+            output = frame.copy()
+        if target in ('all', 'preview'):
+            self.anonymizer.apply(frame, boxes, method)
+        if target in ('all', 'outputs'):
+            if output is not frame:
+                self.anonymizer.apply(output, boxes, method)
+            if raw_frame is not None:
+                self.anonymizer.apply(raw_frame, boxes, method)
+        self.metrics.observe('anonymize', time.time() - start_time)
+        return frame, output
+    
+    def render_frame(self):
+        """Show the newest annotated frame (Tk main thread, own pace)"""
+        if not self.running:
             return
+        
+        self.refresh_options()
+        item = self.result_queue.get_latest()
+        # Nothing to draw while minimized; the newest result is picked up on restore
+        if item is not None and self.root.state() != 'iconic':
+            frame_id, captured_at, frame, proc_time = item
+            now = time.time()
             
+            self.display.attach(self.video_label)
+            if self.display.show(frame, frame_id):
+                # Delivered frames and capture-to-screen latency
+                self.metrics.observe('display', time.time() - now)
+                self.metrics.observe('end_to_end', time.time() - captured_at)
+                self.metrics.mark('displayed')
+        
+        self.root.after(self.render_interval, self.render_frame)
+    
+    def processing_stages(self):
+        """Running stages whose failures skip frames: the inference worker or the stream manager"""
+        return [stage for stage in (self.inference_worker, self.stream_manager) if stage is not None]
+    
+    def visible_tab(self):
+        """Name of the selected Pro tab, None in optimized mode"""
+        if self.current_mode != "pro" or not self.notebook:
+            return None
+        return self.pro_tabs.get(self.notebook.select())
+    
+    def update_ui(self):
+        """Refresh status and stat labels (UI updater tick, main thread)"""
+        optimized = self.current_mode == "optimized"
+        tab = self.visible_tab()
+        
+        if optimized or tab == 'camera':
+            fps_text = (f"FPS: {self.metrics.rate('displayed'):.1f} shown"
+                        f" / {self.metrics.rate('processed'):.1f} processed"
+                        f" | {self.metrics.percentile('end_to_end'):.0f} ms")
+            sched_text = self.scheduler.summary()
+            self.ui_updater.set_label(self.fps_label, f"⚡ {fps_text}" if optimized else fps_text)
+            self.ui_updater.set_label(self.sched_label, f"⏱ {sched_text}" if optimized else sched_text)
+        
+        # Dropped network feeds reconnect in the background; show it until they are back
+        cap = self.cap
+        if self.running and isinstance(cap, CaptureSource) and cap.state != self.last_source_state:
+            self.last_source_state = cap.state
+            if cap.state != 'live':
+                self.ui_updater.set_label(self.status, f"🟠 {cap.label}: {cap.state}")
+            else:
+                mode_text = "Optimized" if optimized else "Professional"
+                self.ui_updater.set_label(self.status, f"🔴 {mode_text} Mode Active")
+        
+        recorder = self.recorder
+        clips = self.clip_recorder
+        if recorder is not None:
+            self.ui_updater.set_label(self.status,
+                                      f"🔴 Recording: {os.path.basename(recorder.filename)} | {recorder.summary()}")
+        elif clips is not None:
+            self.ui_updater.set_label(self.status, f"🎬 {clips.summary()}")
+        
+        saved = self.snapshots.last_saved
+        if saved != self.last_snapshot_shown and recorder is None:
+            self.last_snapshot_shown = saved
+            self.ui_updater.set_label(self.status, f"📸 Saved: {saved} ({self.snapshots.pending} pending)")
+        
+        # Frames that fail to process are skipped; say so rather than show a frozen feed
+        stages = self.processing_stages()
+        errors = stages[0].errors if stages else None
+        failing = self.running and errors is not None and errors.recent()
+        if failing:
+            self.ui_updater.set_label(self.status,
+                                      f"⚠️ Processing error: {errors.last_error} ({errors.count} frames skipped)")
+        elif self.error_shown and recorder is None and clips is None:
+            mode_text = "Optimized" if optimized else "Professional"
+            self.ui_updater.set_label(self.status, f"🔴 {mode_text} Mode Active")
+        self.error_shown = failing
+        
+        # Update stats
+        if optimized:
+            self.ui_updater.set_label(self.obj_label, f"🎯 Objects: {self.stats['objects']}")
+            self.ui_updater.set_label(self.face_label, f"👤 Faces: {self.stats['faces']}")
+            self.ui_updater.set_label(self.motion_label, f"🏃 Motion: {self.stats['motion']}")
+        elif tab == 'analytics':
+            self.ui_updater.set_label(self.obj_label, f"Objects: {self.stats['objects']}")
+            self.ui_updater.set_label(self.face_label, f"Faces: {self.stats['faces']}")
+            self.ui_updater.set_label(self.motion_label, f"Motion: {self.stats['motion']}")
+            self.ui_updater.set_label(self.perf_label, self.performance_text())
+    
+    def performance_text(self):
+        metrics = self.metrics
+        lines = [f"Captured {metrics.rate('captured'):5.1f} fps   Processed {metrics.rate('processed'):5.1f} fps   "
+                 f"Shown {metrics.rate('displayed'):5.1f} fps",
+                 f"Dropped: capture queue {self.frame_queue.dropped if self.frame_queue else 0}, "
+                 f"results {self.result_queue.dropped if self.result_queue else 0}, "
+                 f"recording {metrics.meter('record_dropped').count}"]
+        lines.extend(metrics.table(('capture', 'motion', 'objects', 'faces', 'tracker', 'draw',
+                                    'process', 'display', 'record', 'end_to_end')))
+        return "\n".join(lines)
+    
+    def log_detection(self, detection_type, details, source=None):
+        """Log detection events"""
+        now = time.time()
+        if self.event_store is not None:
+            self.event_store.append(detection_type, details, source=source or source_label(self.current_camera), ts=now)
+        
+        # Tree view is updated in batches by the UI updater
+        if not self.headless:
+            self.ui_updater.push_event((datetime.fromtimestamp(now).strftime("%H:%M:%S"), detection_type, details))
+    
+    def export_log(self):
+        """Export the full detection history to CSV"""
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
             filetypes=[("CSV files", "*.csv")],
@@ -741,40 +1438,142 @@ class VisionAIUnified:
         )
         
         if filename:
-            try:
-                import csv
-                with open(filename, 'w', newline='') as csvfile:
-                    fieldnames = ['timestamp', 'type', 'details']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(self.detection_log)
-                messagebox.showinfo("Export", f"Detection log exported to:\n{filename}")
-            except Exception as e:
-                messagebox.showerror("Export Error", f"Failed to export log:\n{str(e)}")
+            # History can be millions of rows: stream it on a worker thread
+            self.ui_updater.set_label(self.status, "📤 Exporting detection log...")
+            threading.Thread(target=self.write_log_csv, args=(filename,), daemon=True).start()
+    
+    def write_log_csv(self, filename):
+        try:
+            import csv
+            rows = 0
+            with open(filename, 'w', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['timestamp', 'source', 'type', 'details'])
+                for ts, source, detection_type, details in self.event_store.iter_events():
+                    writer.writerow([datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+                                     source, detection_type, details])
+                    rows += 1
+            if not rows:
+                os.remove(filename)
+                self.ui_updater.post(self.ui_updater.set_label, self.status, "📤 Nothing to export")
+                self.ui_updater.post(messagebox.showwarning, "Export", "No detection data to export")
+            else:
+                self.ui_updater.post(self.ui_updater.set_label, self.status, f"📤 Exported {rows} events")
+                self.ui_updater.post(messagebox.showinfo, "Export",
+                                     f"Detection log exported to:\n{filename}\n({rows} events)")
+        except Exception as e:
+            self.ui_updater.post(messagebox.showerror, "Export Error", f"Failed to export log:\n{str(e)}")
     
     def clear_log(self):
         """Clear detection log and statistics"""
-        self.detection_log.clear()
+        self.ui_updater.clear_events()
         self.stats = {'objects': 0, 'faces': 0, 'gestures': 0, 'motion': 0}
-        
-        # Clear tree view if in Pro mode
-        if self.current_mode == "pro" and hasattr(self, 'detection_tree'):
-            try:
-                for item in self.detection_tree.get_children():
-                    self.detection_tree.delete(item)
-            except:
-                pass
-        
-        messagebox.showinfo("Clear", "Detection log and statistics cleared")
+        # Deleting a long history takes seconds: done on a worker thread
+        threading.Thread(target=self.clear_store, daemon=True).start()
+    
+    def clear_store(self):
+        try:
+            self.event_store.clear()
+            self.ui_updater.post(messagebox.showinfo, "Clear", "Detection log and statistics cleared")
+        except Exception as e:
+            self.ui_updater.post(messagebox.showerror, "Clear Error", f"Failed to clear log:\n{str(e)}")
     
     def run(self):
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(0, self.startup.mark, 'window shown')
         self.root.mainloop()
     
     def on_close(self):
+        self.ui_updater.stop()
         self.stop()
+        for thread in self.finishing:
+            thread.join(timeout=10.0)
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        if self.yolo_workers and self.yolo_model.ready:
+            self.yolo_model.get().close()
+        self.snapshots.stop()
+        self.snapshots.join(timeout=2.0)
+        self.event_store.close()
         self.root.destroy()
 
+def main():
+    import argparse
+    import multiprocessing
+    
+    # YOLO worker processes re-enter here in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    
+    parser = argparse.ArgumentParser(description="VisionAI - Unified Smart Detection")
+    parser.add_argument('--batch', nargs='+', metavar='PATH',
+                        help="Process video files/directories headless instead of opening the GUI")
+    parser.add_argument('--output', default='detections.jsonl',
+                        help="Detections output file (.jsonl or .csv)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help="Output format (default: from --output extension)")
+    parser.add_argument('--batch-size', type=int, default=8,
+                        help="Frames per YOLO call in batch mode")
+    parser.add_argument('--stride', type=int, default=1,
+                        help="Process every Nth frame in batch mode")
+    parser.add_argument('--faces', action='store_true',
+                        help="Also run face detection in batch mode")
+    parser.add_argument('--backend', choices=BACKENDS, default=os.environ.get('VISIONAI_BACKEND', 'auto'),
+                        help="YOLO inference backend (default: fastest installed, or $VISIONAI_BACKEND)")
+    parser.add_argument('--int8', action='store_true',
+                        help="Quantize the exported model to INT8")
+    parser.add_argument('--calibration', metavar='PATH',
+                        help="Image directory or video used for INT8 calibration (default: models/calibration)")
+    parser.add_argument('--yolo-workers', type=int, default=0, metavar='N',
+                        help="Run YOLO in N worker processes (live mode; 0 = in-process)")
+    parser.add_argument('--cameras', nargs='+', metavar='SOURCE',
+                        help="Camera sources: device indexes, video files or RTSP/HTTP URLs "
+                             "(several are shown in a grid)")
+    parser.add_argument('--cpu-budget', type=int, metavar='N',
+                        help="Cores to use in total (default: all available)")
+    parser.add_argument('--cpu-split', metavar='SPEC',
+                        help="Threads per stage, e.g. yolo=4,opencv=2,ui=1 (default: calibrated split "
+                             "from models/cpu_split.json, else a fixed ratio)")
+    parser.add_argument('--pin-cores', action='store_true',
+                        help="Pin each stage to its own cores (Linux)")
+    parser.add_argument('--calibrate-cpu', action='store_true',
+                        help="Time YOLO and OpenCV at several thread counts, save the suggested split and exit")
+    parser.add_argument('--clip-classes', nargs='+', metavar='CLASS',
+                        help="Object classes that start an event clip, e.g. person car (default: any object)")
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                        help="Serve live metrics on http://127.0.0.1:PORT/metrics (and /metrics.json)")
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help="Rewrite live metrics as JSON to PATH every 5 seconds")
+    args = parser.parse_args()
+    
+    if args.calibrate_cpu:
+        app = VisionAIUnified(headless=True, backend=args.backend, int8=args.int8, calibration=args.calibration)
+        governor = calibrate_cpu(app, budget=args.cpu_budget)
+        governor.save()
+        print("[CPU] Saved to models/cpu_split.json (used by default from now on)")
+        return
+    
+    # Thread pools are sized before any model runtime starts
+    split = parse_split(args.cpu_split) if args.cpu_split else ResourceGovernor.load_split()
+    resources = ResourceGovernor(budget=args.cpu_budget, split=split, pin=args.pin_cores)
+    resources.apply()
+    
+    if args.batch:
+        from batch import BatchProcessor
+        
+        app = VisionAIUnified(headless=True, backend=args.backend, int8=args.int8,
+                              calibration=args.calibration, resources=resources)
+        processor = BatchProcessor(app, args.output, output_format=args.format,
+                                   batch_size=args.batch_size, stride=args.stride,
+                                   detect_faces=args.faces)
+        processor.run(args.batch)
+        return
+    
+    app = VisionAIUnified(backend=args.backend, int8=args.int8, calibration=args.calibration,
+                          metrics_port=args.metrics_port, metrics_file=args.metrics_file,
+                          yolo_workers=args.yolo_workers,
+                          cameras=[parse_source(source) for source in args.cameras or []],
+                          resources=resources, clip_classes=args.clip_classes)
+    app.run()
+
 if __name__ == "__main__":
-    app = VisionAIUnified()
-    app.run()
\ No newline at end of file
+    main()
\ No newline at end of file